@@ -5,6 +5,7 @@ class DatabaseController():
     '''A controller that provides functions for manipulating the data within a .mouser file'''
     def __init__(self, database):
         self.db = ExperimentDatabase(database)
+        self._cage_assignments = None
         self.measurement_items = self.db.get_measurement_items()
         self.reset_attributes()
 
@@ -16,11 +17,10 @@ class DatabaseController():
     def set_animals_in_cage(self):
         '''Returns a dictionary with the keys as the cage ids and
         the values are the animal ids in each cage in the database.'''
-        cage_assignments = self.db.get_cage_assignments()
         animals_in_cage = {}
 
         # Group animals by their assigned cage
-        for animal_id, (cage_number) in cage_assignments.items():
+        for animal_id, (cage_number) in self.get_cage_assignments().items():
             cage_key = str(cage_number)
             if cage_key not in animals_in_cage:
                 animals_in_cage[cage_key] = []
@@ -28,23 +28,25 @@ class DatabaseController():
 
         return animals_in_cage
 
+    def get_cage_assignments(self):
+        '''Returns {animal_id: (group_id, cage_number)}, cached until the next cage move.'''
+        if self._cage_assignments is None:
+            self._cage_assignments = self.db.get_cage_assignments()
+        return self._cage_assignments
+
+    def invalidate_cage_assignments(self):
+        '''Drops the cached cage assignments (called after any move).'''
+        self._cage_assignments = None
+
     def reset_attributes(self):
         '''Reset's the attribute lists so configuration in ui can be saved'''
+        self.invalidate_cage_assignments()
         self.cages_in_group = self.set_cages_in_group()    # {group : [cage ids]}
         self.animals_in_cage = self.set_animals_in_cage()   # {cage : [animal ids]}
-        self.valid_ids = [str(animal[0]) for animal in self.db.get_animals()]
-
-        # Get actual measurements from the database
-        self.animal_weights = {}
-        for animal_id in self.valid_ids:
-            measurements = self.db.get_measurements_by_date(None)  # Get latest measurement
-            if measurements:
-                for measurement in measurements:
-                    if str(measurement[0]) == animal_id:
-                        self.animal_weights[int(animal_id)] = measurement[3]  # value
-                        break
-            if int(animal_id) not in self.animal_weights:
-                self.animal_weights[int(animal_id)] = 0
+        # Active animals with their latest measurement, read in one query
+        roster = self.db.get_animal_roster(active_only=True)
+        self.valid_ids = [str(row[0]) for row in roster]
+        self.animal_weights = {row[0]: row[6] if row[6] is not None else 0 for row in roster}
 
     def get_groups(self):
         '''Returns a list of all group names in the database.'''
@@ -59,9 +61,11 @@ class DatabaseController():
 
     def get_cage_max(self):
         '''Returns the maximum size of the cages in the database.'''
-        self.db._c.execute("SELECT cage_max FROM experiment")
-        result = self.db._c.fetchone()
-        return int(result[0]) if result else 0
+        return int(self.db.get_cage_max() or 0)
+
+    def get_group_assignments(self):
+        '''Returns [(group_id, name, [animal ids])] for every group in one query.'''
+        return self.db.get_group_assignments()
 
     def get_animals_in_group(self, group_name):
         '''Returns list of animals in a given group/cage'''
@@ -78,10 +82,12 @@ class DatabaseController():
     def autosort(self):
         '''Calls the Database Autosort Function'''
         self.db.autosort()
+        self.invalidate_cage_assignments()
 
     def randomize_cages(self):
         '''Calls the Database Randomize Function'''
         self.db.randomize_cages()
+        self.invalidate_cage_assignments()
 
     def get_animals_in_cage(self, cage):
         '''Returns a list of animal ids in the specified cage.'''
@@ -94,8 +100,9 @@ class DatabaseController():
         return self.animal_weights[int(animal_id)]
 
     def get_animal_current_cage(self, animal_id):
-        '''Gets the current cage (group_id) for an animal'''
-        return self.db.get_animal_current_cage(animal_id)
+        '''Gets the current cage (group_id) for an active animal, from the cached assignments'''
+        assignment = self.get_cage_assignments().get(int(animal_id))
+        return assignment[0] if assignment else None
 
     def check_valid_animal(self, animal_id):
         '''Returns true if the specified animal id is valid and false otherwise.'''
@@ -113,9 +120,18 @@ class DatabaseController():
                 return False
         return True
 
-    def update_animal_cage(self, animal_id, new_cage):
+    def update_animal_cage(self, animal_id, new_cage, commit=True):
         '''Updates an animal's cage assignment'''
-        return self.db.update_animal_cage(animal_id, new_cage)
+        self.invalidate_cage_assignments()
+        return self.db.update_animal_cage(animal_id, new_cage, commit=commit)
+
+    def move_animals(self, animal_ids, target_group):
+        '''Moves animals into target_group in one transaction, limited by the experiment's cage maximum.
+
+        Returns the database's move delta; raises ValueError if the cage would overflow.'''
+        delta = self.db.move_animals(animal_ids, target_group, capacity=self.get_cage_max())
+        self.invalidate_cage_assignments()
+        return delta
 
     def get_updated_animals(self):
         '''Returns a list of tuples for updating the database.'''
@@ -140,6 +156,11 @@ class DatabaseController():
     def commit(self):
                 self.db._conn.commit()
 
+    def rollback(self):
+        '''Discards the uncommitted changes and reloads the cage assignments.'''
+        self.db._conn.rollback()
+        self.invalidate_cage_assignments()
+
     def close(self):
         '''Closes the database file.'''
         self.db.close()
@@ -1,9 +1,152 @@
 '''SQLite Database module for Mouser.'''
+import logging
 import sqlite3
 import os
 from datetime import datetime
 import re
 
+from shared.metrics import MetricsRegistry
+
+log = logging.getLogger(__name__)
+
+def _measurement_slot_count(measurement_name):
+    '''Number of measurement slots named by the experiment's measurement string (at least 1).'''
+    if isinstance(measurement_name, (list, tuple)):
+        measurement_name = measurement_name[0] if measurement_name else None
+    parts = [p.strip() for p in re.split(r"[,\n;/|]+", str(measurement_name or "").strip()) if p and p.strip()]
+    return max(len(parts), 1)
+
+
+# Per-day completion index, kept current by triggers so completion checks are O(1):
+#   daily_progress(date, animal_id, filled_slots)   non-null slots 1..slot_count per animal and day
+#   daily_progress_summary(date, complete_animals)  active animals with every slot filled that day
+#   progress_config(slot_count, active_animals)     one row
+_PROGRESS_SCHEMA = (
+    '''CREATE TABLE IF NOT EXISTS progress_config (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        slot_count INTEGER NOT NULL,
+        active_animals INTEGER NOT NULL)''',
+    '''CREATE TABLE IF NOT EXISTS daily_progress (
+        date TEXT,
+        animal_id INTEGER,
+        filled_slots INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (date, animal_id))''',
+    '''CREATE INDEX IF NOT EXISTS daily_progress_animal ON daily_progress (animal_id)''',
+    '''CREATE TABLE IF NOT EXISTS daily_progress_summary (
+        date TEXT PRIMARY KEY,
+        complete_animals INTEGER NOT NULL DEFAULT 0)''',
+)
+
+_PROGRESS_RECOUNT = '''
+    INSERT INTO daily_progress (date, animal_id, filled_slots)
+    VALUES ({row}.timestamp, {row}.animal_id, (
+        SELECT COUNT(DISTINCT measurement_id) FROM animal_measurements
+        WHERE animal_id = {row}.animal_id AND timestamp = {row}.timestamp
+        AND value IS NOT NULL
+        AND measurement_id BETWEEN 1 AND (SELECT slot_count FROM progress_config WHERE id = 1)))
+    ON CONFLICT (date, animal_id) DO UPDATE SET filled_slots = excluded.filled_slots;'''
+
+_PROGRESS_SLOTS = "(SELECT slot_count FROM progress_config WHERE id = 1)"
+_ANIMAL_IS_ACTIVE = "EXISTS (SELECT 1 FROM animals WHERE animal_id = NEW.animal_id AND active = 1)"
+
+
+def _shift_completed_dates(animal_id, delta):
+    '''Trigger body adding delta to the summary of every day on which animal_id is complete.
+
+    The trailing "AND true" is required: in INSERT ... SELECT ... ON CONFLICT, SQLite would
+    otherwise parse ON as a join constraint of the SELECT. Do not remove it.'''
+    return f'''
+    INSERT INTO daily_progress_summary (date, complete_animals)
+    SELECT date, {delta} FROM daily_progress
+    WHERE animal_id = {animal_id} AND filled_slots >= {_PROGRESS_SLOTS} AND true
+    ON CONFLICT (date) DO UPDATE SET complete_animals = complete_animals + ({delta});'''
+
+
+_PROGRESS_TRIGGERS = (
+    f'''CREATE TRIGGER IF NOT EXISTS progress_measurement_insert
+        AFTER INSERT ON animal_measurements
+        BEGIN {_PROGRESS_RECOUNT.format(row="NEW")} END''',
+    f'''CREATE TRIGGER IF NOT EXISTS progress_measurement_update
+        AFTER UPDATE ON animal_measurements
+        BEGIN {_PROGRESS_RECOUNT.format(row="OLD")} {_PROGRESS_RECOUNT.format(row="NEW")} END''',
+    f'''CREATE TRIGGER IF NOT EXISTS progress_measurement_delete
+        AFTER DELETE ON animal_measurements
+        BEGIN {_PROGRESS_RECOUNT.format(row="OLD")} END''',
+    f'''CREATE TRIGGER IF NOT EXISTS progress_day_insert
+        AFTER INSERT ON daily_progress
+        WHEN NEW.filled_slots >= {_PROGRESS_SLOTS} AND {_ANIMAL_IS_ACTIVE}
+        BEGIN
+            INSERT INTO daily_progress_summary (date, complete_animals) VALUES (NEW.date, 1)
+            ON CONFLICT (date) DO UPDATE SET complete_animals = complete_animals + 1;
+        END''',
+    f'''CREATE TRIGGER IF NOT EXISTS progress_day_completed
+        AFTER UPDATE OF filled_slots ON daily_progress
+        WHEN NEW.filled_slots >= {_PROGRESS_SLOTS} AND OLD.filled_slots < {_PROGRESS_SLOTS}
+            AND {_ANIMAL_IS_ACTIVE}
+        BEGIN
+            INSERT INTO daily_progress_summary (date, complete_animals) VALUES (NEW.date, 1)
+            ON CONFLICT (date) DO UPDATE SET complete_animals = complete_animals + 1;
+        END''',
+    f'''CREATE TRIGGER IF NOT EXISTS progress_day_reopened
+        AFTER UPDATE OF filled_slots ON daily_progress
+        WHEN NEW.filled_slots < {_PROGRESS_SLOTS} AND OLD.filled_slots >= {_PROGRESS_SLOTS}
+            AND {_ANIMAL_IS_ACTIVE}
+        BEGIN
+            UPDATE daily_progress_summary SET complete_animals = complete_animals - 1 WHERE date = NEW.date;
+        END''',
+    f'''CREATE TRIGGER IF NOT EXISTS progress_animal_insert
+        AFTER INSERT ON animals WHEN NEW.active = 1
+        BEGIN
+            UPDATE progress_config SET active_animals = active_animals + 1;
+            {_shift_completed_dates("NEW.animal_id", 1)}
+        END''',
+    f'''CREATE TRIGGER IF NOT EXISTS progress_animal_delete
+        AFTER DELETE ON animals WHEN OLD.active = 1
+        BEGIN
+            UPDATE progress_config SET active_animals = active_animals - 1;
+            {_shift_completed_dates("OLD.animal_id", -1)}
+        END''',
+    f'''CREATE TRIGGER IF NOT EXISTS progress_animal_update
+        AFTER UPDATE OF active, animal_id ON animals
+        WHEN (OLD.active = 1) != (NEW.active = 1) OR (NEW.active = 1 AND OLD.animal_id != NEW.animal_id)
+        BEGIN
+            UPDATE progress_config SET active_animals = active_animals
+                - (CASE WHEN OLD.active = 1 THEN 1 ELSE 0 END)
+                + (CASE WHEN NEW.active = 1 THEN 1 ELSE 0 END);
+            {_shift_completed_dates("(CASE WHEN OLD.active = 1 THEN OLD.animal_id END)", -1)}
+            {_shift_completed_dates("(CASE WHEN NEW.active = 1 THEN NEW.animal_id END)", 1)}
+        END''',
+)
+
+
+# Most recent non-null value of every (animal, measurement slot); ties on timestamp keep the newest row.
+_LATEST_MEASUREMENT_VIEW = '''CREATE VIEW IF NOT EXISTS latest_measurement AS
+    SELECT animal_id, measurement_id, timestamp, value FROM (
+        SELECT animal_id, measurement_id, timestamp, value,
+            ROW_NUMBER() OVER (PARTITION BY animal_id, measurement_id
+                               ORDER BY timestamp DESC, rowid DESC) AS position
+        FROM animal_measurements
+        WHERE value IS NOT NULL)
+    WHERE position = 1'''
+
+
+class _TimedConnection(sqlite3.Connection):
+    '''Connection whose commits are recorded in the db.commit_ms histogram.'''
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._commit_ms = MetricsRegistry.instance().histogram("db.commit_ms")
+
+    def commit(self):
+        with self._commit_ms.time():
+            super().commit()
+
+
+# Columns of the experiment row kept in the settings cache.
+_EXPERIMENT_COLUMNS = ("name", "species", "uses_rfid", "num_animals", "num_groups", "cage_max",
+                       "measurement_type", "id", "investigators", "measurement")
+
+
 class ExperimentDatabase:
     '''SQLite Database Object for Experiments.'''
     _instances = {}  # Dictionary to store instances by file path
@@ -11,9 +154,7 @@ class ExperimentDatabase:
 
     def get_number_groups(self):
         '''Returns the number of groups in the experiment.'''
-        self._c.execute("SELECT COUNT(*) FROM groups")
-        result = self._c.fetchone()
-        return result[0] if result else 0
+        return len(self._settings_cache()["groups"])
 
 
     def __new__(cls, file=":memory:"):
@@ -31,9 +172,12 @@ class ExperimentDatabase:
         abs_path = file if file == ":memory:" else os.path.abspath(file)
         abs_path = os.path.abspath(abs_path) if abs_path != ":memory:" else abs_path
         instance.db_file = abs_path
-        instance._conn = sqlite3.connect(abs_path, timeout=5.0, check_same_thread=False)
+        instance._conn = sqlite3.connect(abs_path, timeout=5.0, check_same_thread=False,
+                                         factory=_TimedConnection)
         instance._c = instance._conn.cursor()
+        instance._settings = None
         instance._initialize_tables()
+        instance._initialize_progress_index()
         cls._instances[file] = instance
         return instance
 
@@ -77,6 +221,53 @@ class ExperimentDatabase:
         except sqlite3.OperationalError:
             pass
 
+    def _initialize_progress_index(self):
+        '''Creates the per-day completion index, building it for files saved before it existed.'''
+        try:
+            for statement in _PROGRESS_SCHEMA + _PROGRESS_TRIGGERS + (_LATEST_MEASUREMENT_VIEW,):
+                self._c.execute(statement)
+            self._c.execute("SELECT slot_count FROM progress_config WHERE id = 1")
+            row = self._c.fetchone()
+            slot_count = _measurement_slot_count(self.get_measurement_name())
+            if row is None or row[0] != slot_count:
+                self.rebuild_progress_index(slot_count)
+            else:
+                self._conn.commit()
+        except sqlite3.Error as e:
+            log.error("Error initializing progress index: %s", e)
+
+    def rebuild_progress_index(self, slot_count=None):
+        '''Recomputes the completion index from animal_measurements (e.g. after the slot count changes).'''
+        if slot_count is None:
+            slot_count = _measurement_slot_count(self.get_measurement_name())
+        self._c.execute('''INSERT INTO progress_config (id, slot_count, active_animals)
+                        VALUES (1, ?, (SELECT COUNT(*) FROM animals WHERE active = 1))
+                        ON CONFLICT (id) DO UPDATE SET slot_count = excluded.slot_count,
+                            active_animals = excluded.active_animals''', (slot_count,))
+        self._c.execute("DELETE FROM daily_progress")
+        self._c.execute("DELETE FROM daily_progress_summary")
+        # Summary rows are added by the daily_progress insert trigger.
+        self._c.execute('''INSERT INTO daily_progress (date, animal_id, filled_slots)
+                        SELECT timestamp, animal_id,
+                            COUNT(DISTINCT CASE WHEN value IS NOT NULL AND measurement_id BETWEEN 1 AND ?
+                                           THEN measurement_id END)
+                        FROM animal_measurements
+                        GROUP BY timestamp, animal_id''', (slot_count,))
+        self._conn.commit()
+
+    def get_measurement_slot_count(self):
+        '''Returns the number of measurement slots each animal fills per day.'''
+        self._c.execute("SELECT slot_count FROM progress_config WHERE id = 1")
+        row = self._c.fetchone()
+        return row[0] if row else _measurement_slot_count(self.get_measurement_name())
+
+    def get_daily_progress(self, date):
+        '''Returns (complete_animals, active_animals) for date from the completion index.'''
+        self._c.execute('''SELECT COALESCE((SELECT complete_animals FROM daily_progress_summary WHERE date = ?), 0),
+                               COALESCE((SELECT active_animals FROM progress_config WHERE id = 1), 0)''',
+                        (date,))
+        return tuple(self._c.fetchone())
+
     def setup_experiment(self, name, species, uses_rfid, num_animals, num_groups,
                          cage_max, measurement_type, experiment_id, investigators, measurement):
         '''Initializes Experiment'''
@@ -86,6 +277,8 @@ class ExperimentDatabase:
                         VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)''',
                         (name, species, uses_rfid, num_animals, num_groups,
                          cage_max, measurement_type, experiment_id, investigators_str, measurement))
+        self.invalidate_settings()
+        self._sync_progress_slot_count()
         self._conn.commit()
 
     def setup_groups(self, group_names, cage_capacity):
@@ -95,6 +288,30 @@ class ExperimentDatabase:
                             VALUES (?, ?, ?)''',
                             (group, 0, cage_capacity))
             self._conn.commit()
+        self.invalidate_settings()
+
+    def _settings_cache(self):
+        '''Returns the experiment row and group metadata, read once and kept until a setter changes them.
+
+        Only settings live here (not counters such as groups.num_animals), so the per-scan path
+        reads them without any SQL.'''
+        if self._settings is None:
+            self._c.execute(f"SELECT {', '.join(_EXPERIMENT_COLUMNS)} FROM experiment")
+            row = self._c.fetchone()
+            self._c.execute("SELECT group_id, name, cage_capacity FROM groups ORDER BY rowid")
+            self._settings = {
+                "experiment": dict(zip(_EXPERIMENT_COLUMNS, row)) if row else None,
+                "groups": self._c.fetchall(),
+            }
+        return self._settings
+
+    def _setting(self, column, default=None):
+        experiment = self._settings_cache()["experiment"]
+        return experiment[column] if experiment is not None else default
+
+    def invalidate_settings(self):
+        '''Drops the cached experiment settings (call after writing the experiment/groups tables directly).'''
+        self._settings = None
 
     def add_measurement(self, animal_id, value):
         '''Adds a new measurement for an animal.'''
@@ -112,8 +329,53 @@ class ExperimentDatabase:
                         WHERE DATE(m.timestamp) = ?''', (date,))
         return self._c.fetchall()
 
-    def add_animal(self, animal_id, rfid, group_id, remarks=''):
-        '''Adds animal to experiment.'''
+    def get_latest_measurements(self, measurement_id=None, active_only=True):
+        '''Returns {animal_id: (timestamp, value)} with each animal's most recent measurement.
+
+        With measurement_id only that slot is considered; otherwise the newest value of any slot
+        (the lowest slot wins a timestamp tie).'''
+        query = '''SELECT l.animal_id, l.measurement_id, l.timestamp, l.value
+                   FROM latest_measurement l'''
+        conditions, params = [], []
+        if active_only:
+            query += " JOIN animals a ON a.animal_id = l.animal_id"
+            conditions.append("a.active = 1")
+        if measurement_id is not None:
+            conditions.append("l.measurement_id = ?")
+            params.append(measurement_id)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY l.animal_id, l.timestamp DESC, l.measurement_id IS NULL, l.measurement_id"
+        latest = {}
+        for animal_id, _slot, timestamp, value in self._c.execute(query, params).fetchall():
+            if animal_id not in latest:
+                latest[animal_id] = (timestamp, value)
+        return latest
+
+    def get_animal_roster(self, active_only=False):
+        '''Returns [(animal_id, rfid, group_id, group_name, active, last_timestamp, last_value)] in one query.
+
+        last_timestamp/last_value are the animal's most recent measurement of any slot (None if
+        it has none), chosen like get_latest_measurements.'''
+        query = '''SELECT a.animal_id, a.rfid, a.group_id, g.name, a.active, l.timestamp, l.value
+                   FROM animals a
+                   LEFT JOIN groups g ON g.group_id = a.group_id
+                   LEFT JOIN (
+                       SELECT animal_id, timestamp, value,
+                           ROW_NUMBER() OVER (PARTITION BY animal_id
+                                              ORDER BY timestamp DESC, measurement_id IS NULL,
+                                                       measurement_id) AS position
+                       FROM latest_measurement) l
+                       ON l.animal_id = a.animal_id AND l.position = 1'''
+        if active_only:
+            query += " WHERE a.active = 1"
+        query += " ORDER BY a.animal_id"
+        return self._c.execute(query).fetchall()
+
+    def add_animal(self, animal_id, rfid, group_id, remarks='', commit=True):
+        '''Adds animal to experiment.
+
+        With commit=False the insert stays in the open transaction (batched callers commit later).'''
         try:
             self._c.execute('''INSERT INTO animals (animal_id, group_id, rfid, remarks, active)
                             VALUES (?, ?, ?, ?, 1)''',
@@ -124,12 +386,46 @@ class ExperimentDatabase:
                             SET num_animals = num_animals + 1
                             WHERE group_id = ?''', (group_id,))
 
-            self._conn.commit()
+            if commit:
+                self._conn.commit()
             return animal_id
         except sqlite3.Error as e:
-            print(f"Error adding animal: {e}")
+            log.error("Error adding animal: %s", e)
             return None
 
+    def add_animals(self, rows, commit=True):
+        '''Adds many animals in one transaction; rows are (animal_id, rfid, group_id, remarks).
+
+        Either every row is inserted or none is (raises sqlite3.Error after rolling back).'''
+        rows = [(int(animal_id), rfid, int(group_id), remarks or '')
+                for animal_id, rfid, group_id, remarks in rows]
+        per_group = {}
+        for _animal_id, _rfid, group_id, _remarks in rows:
+            per_group[group_id] = per_group.get(group_id, 0) + 1
+        try:
+            self._c.executemany('''INSERT INTO animals (animal_id, group_id, rfid, remarks, active)
+                                VALUES (?, ?, ?, ?, 1)''',
+                                [(animal_id, group_id, rfid, remarks)
+                                 for animal_id, rfid, group_id, remarks in rows])
+            self._c.executemany('''UPDATE groups
+                                SET num_animals = num_animals + ?
+                                WHERE group_id = ?''',
+                                [(count, group_id) for group_id, count in per_group.items()])
+        except sqlite3.Error:
+            self._conn.rollback()
+            raise
+        if commit:
+            self._conn.commit()
+        return len(rows)
+
+    def get_rfid_mappings(self):
+        '''Returns (animal_id, rfid) for every active animal with a tag, in id order.'''
+        self._c.execute('''SELECT animal_id, rfid
+                        FROM animals
+                        WHERE rfid IS NOT NULL AND active = 1
+                        ORDER BY animal_id''')
+        return self._c.fetchall()
+
     def remove_animal(self, animal_id):
         '''Removes an animal from the experiment.'''
         self._c.execute("SELECT group_id FROM animals WHERE animal_id = ?", (animal_id,))
@@ -158,36 +454,43 @@ class ExperimentDatabase:
 
     def get_experiment_id(self):
         '''Returns the experiment id from the experiment table.'''
-        self._c.execute("SELECT id FROM experiment")
-        result = self._c.fetchone()
-        return result[0] if result else None
+        return self._setting("id")
 
     def get_experiment_name(self):
         '''Returns the experiment name from the experiment table.'''
-        self._c.execute("SELECT name FROM experiment")
-        result = self._c.fetchone()
-        return result[0] if result else None
+        return self._setting("name")
+
+    def get_experiment_summary(self):
+        '''Returns the experiment settings and group names as one dict (empty if not set up).'''
+        settings = self._settings_cache()
+        if settings["experiment"] is None:
+            return {}
+        summary = dict(settings["experiment"])
+        summary["uses_rfid"] = summary["uses_rfid"] or 0
+        summary["measurement_type"] = summary["measurement_type"] or 0
+        summary["investigators"] = self.get_investigators()
+        summary["cage_capacity"] = self.get_cage_capacity(1)
+        summary["groups"] = self.get_groups()
+        return summary
 
     def get_investigators(self):
         """Return investigators as a list of names."""
-        self._c.execute("SELECT investigators FROM experiment")
-        result = self._c.fetchone()
-        if not result or result[0] is None:
+        investigators = self._setting("investigators")
+        if investigators is None:
             return []
-        return [item.strip() for item in str(result[0]).split(",") if item.strip()]
+        return [item.strip() for item in str(investigators).split(",") if item.strip()]
 
     def update_investigators(self, investigators):
         """Persist investigators list to experiment table."""
         investigators_str = ", ".join([name.strip() for name in investigators if name and name.strip()])
         self._c.execute("UPDATE experiment SET investigators = ?", (investigators_str,))
         self._conn.commit()
+        self.invalidate_settings()
 
     def get_measurement_items(self):
         '''Returns the list of measurement items for the experiment.'''
-        self._c.execute("SELECT measurement FROM experiment")
-        result = self._c.fetchone()
-
-        return result
+        experiment = self._settings_cache()["experiment"]
+        return (experiment["measurement"],) if experiment is not None else None
 
     def close(self):
         '''Closes database connection and cleans up singleton instance.'''
@@ -204,17 +507,16 @@ class ExperimentDatabase:
                 # Close the connection
                 self._conn.close()
                 self._conn = None
+                self._settings = None
 
                 return True
         except sqlite3.Error as e:
-            print(f"Error during database cleanup: {e}")
+            log.error("Error during database cleanup: %s", e)
             return False
 
     def experiment_uses_rfid(self):
         '''Returns whether the experiment uses RFID (0 or 1).'''
-        self._c.execute("SELECT uses_rfid FROM experiment")
-        result = self._c.fetchone()
-        return result[0] if result else 0
+        return self._setting("uses_rfid", 0)
 
     def get_animals(self):
         '''Returns a list of all active animals in the experiment.'''
@@ -226,12 +528,11 @@ class ExperimentDatabase:
 
     def get_total_number_animals(self):
         '''Returns the total number of animals from the experiment table.'''
-        self._c.execute("SELECT num_animals FROM experiment")
-        result = self._c.fetchone()
-        if result:
-            print("Total number of animals in Experiment: ",result[0])
-            return result[0]
-        return 0
+        return self._setting("num_animals", 0)
+
+    def get_cage_max(self):
+        '''Returns the maximum number of animals per cage from the experiment table.'''
+        return self._setting("cage_max", 0)
 
     def get_number_animals(self):
         '''Returns the number of active animals in the database.'''
@@ -249,8 +550,7 @@ class ExperimentDatabase:
         '''Returns the animal ID for a given RFID.'''
         self._c.execute('SELECT animal_id FROM animals WHERE rfid = ?', (rfid,))
         result = self._c.fetchone()
-        print("Animal RFID:", rfid)
-        print("Animal ID:", result)
+        log.debug("Animal RFID %s -> animal %s", rfid, result)
         return result[0] if result else None
 
     def get_data_for_date(self, date):
@@ -267,11 +567,7 @@ class ExperimentDatabase:
             rows = self._c.fetchall()
 
             # Determine how many measurement slots this experiment expects.
-            measurement_name = self.get_measurement_name()
-            if isinstance(measurement_name, (list, tuple)):
-                measurement_name = measurement_name[0] if measurement_name else None
-            parts = [p.strip() for p in re.split(r"[,\n;/|]+", str(measurement_name or "").strip()) if p and p.strip()]
-            expected_count = max(len(parts), 1)
+            expected_count = self.get_measurement_slot_count()
             max_id = max((mid for _aid, mid, _val in rows if mid is not None), default=1)
             measurement_count = max(expected_count, int(max_id or 1))
 
@@ -297,49 +593,18 @@ class ExperimentDatabase:
                     result.append((animal_id, tuple(values)))
             return result
         except sqlite3.Error as e:
-            print(f"Error getting data for date: {e}")
+            log.error("Error getting data for date: %s", e)
             return []
 
     def is_data_collected_for_date(self, date):
         '''Checks if all active animals have measurements for provided date as a TRUE/FALSE'''
         try:
-            # Determine how many measurement slots this experiment expects.
-            measurement_name = self.get_measurement_name()
-            if isinstance(measurement_name, (list, tuple)):
-                measurement_name = measurement_name[0] if measurement_name else None
-            parts = [p.strip() for p in re.split(r"[,\n;/|]+", str(measurement_name or "").strip()) if p and p.strip()]
-            measurement_count = max(len(parts), 1)
-
-            # First get count of active animals
-            self._c.execute('''
-                SELECT COUNT(*)
-                FROM animals
-                WHERE active = 1
-            ''')
-            total_active_animals = self._c.fetchone()[0]
-
-            if total_active_animals <= 0:
-                return True
-
-            # Count distinct measurement ids with non-null values for each active animal on the date.
-            self._c.execute('''
-                SELECT a.animal_id, COUNT(DISTINCT m.measurement_id) as cnt
-                FROM animals a
-                LEFT JOIN animal_measurements m
-                    ON a.animal_id = m.animal_id
-                    AND m.timestamp = ?
-                    AND m.value IS NOT NULL
-                    AND m.measurement_id BETWEEN 1 AND ?
-                WHERE a.active = 1
-                GROUP BY a.animal_id
-            ''', (date, measurement_count))
-            rows = self._c.fetchall() or []
-
-            complete_animals = sum(1 for _aid, cnt in rows if int(cnt or 0) >= measurement_count)
+            # Read from the completion index instead of scanning the day's measurements.
+            complete_animals, total_active_animals = self.get_daily_progress(date)
             return complete_animals >= total_active_animals
 
         except sqlite3.Error as e:
-            print(f"Error checking data collection status: {e}")
+            log.error("Error checking data collection status: %s", e)
             return False
 
 
@@ -362,7 +627,7 @@ class ExperimentDatabase:
 
             self._conn.commit()
         except sqlite3.Error as e:
-            print(f"Error adding data entry: {e}")
+            log.error("Error adding data entry: %s", e)
             self._conn.rollback()
 
     def change_data_entry(self, date, animal_id, value, measurement_id=1):
@@ -388,23 +653,25 @@ class ExperimentDatabase:
 
             self._conn.commit()
         except sqlite3.Error as e:
-            print(f"Error changing data entry: {e}")
+            log.error("Error changing data entry: %s", e)
             self._conn.rollback()
 
     def get_cages_by_group(self):
         '''Returns a dictionary of group IDs mapped to their cage information.'''
         self._c.execute('''
-            SELECT group_id, name, cage_capacity
-            FROM groups
+            SELECT g.group_id, g.cage_capacity, COUNT(a.animal_id)
+            FROM groups g
+            LEFT JOIN animals a ON a.group_id = g.group_id AND a.active = 1
+            GROUP BY g.group_id
+            ORDER BY g.rowid
         ''')
         groups = self._c.fetchall()
 
         # Create a simulated cage structure based on group capacity
         cages_by_group = {}
-        for group in groups:
-            group_id, _, capacity = group
+        for group_id, capacity, animal_count in groups:
             # Create virtual cage IDs for the group based on capacity
-            num_cages = (self.get_group_animal_count(group_id) + capacity - 1) // capacity
+            num_cages = (animal_count + capacity - 1) // capacity
             cages_by_group[group_id] = list(range(1, num_cages + 1))
 
         return cages_by_group
@@ -420,9 +687,10 @@ class ExperimentDatabase:
 
     def get_cage_capacity(self, group_id):
         '''Returns the cage capacity for a group.'''
-        self._c.execute('SELECT cage_capacity FROM groups WHERE group_id = ?', (group_id,))
-        result = self._c.fetchone()
-        return result[0] if result else None
+        for gid, _name, capacity in self._settings_cache()["groups"]:
+            if gid == group_id:
+                return capacity
+        return None
 
     def get_animals_in_cage(self, group_name):
         '''Returns animals in a virtual cage based on group and cage number.'''
@@ -436,32 +704,44 @@ class ExperimentDatabase:
             ''', (group_name,))
             return self._c.fetchall() or [] #Empty list if nothing
         except sqlite3.Error as e:
-            print(f"Database error: {e}")
+            log.error("Database error: %s", e)
             return []
 
     def get_cage_assignments(self):
-        '''Returns a dictionary of animal IDs mapped to their cage assignments.'''
-        cage_assignments = {}
-        groups = self._c.execute('SELECT group_id, cage_capacity FROM groups').fetchall()
-
-        for group_id, capacity in groups:
-            animals = self._c.execute('''
-                SELECT animal_id
-                FROM animals
-                WHERE group_id = ? AND active = 1
-                ORDER BY animal_id
-            ''', (group_id,)).fetchall()
+        '''Returns {animal_id: (group_id, cage_number)} for every active animal, in one query.
 
-            for i, animal in enumerate(animals):
-                cage_number = (i // capacity) + 1
-                cage_assignments[animal[0]] = (group_id, cage_number)
+        Animals fill a group's cages in animal_id order, cage_capacity per cage.'''
+        self._c.execute('''
+            SELECT a.animal_id, a.group_id,
+                (ROW_NUMBER() OVER (PARTITION BY a.group_id ORDER BY a.animal_id) - 1)
+                    / g.cage_capacity + 1
+            FROM animals a
+            JOIN groups g ON g.group_id = a.group_id
+            WHERE a.active = 1
+            ORDER BY g.rowid, a.animal_id
+        ''')
+        return {animal_id: (group_id, cage_number)
+                for animal_id, group_id, cage_number in self._c.fetchall()}
 
-        return cage_assignments
+    def get_group_assignments(self):
+        '''Returns [(group_id, name, [active animal ids])] for every group, in one query.'''
+        self._c.execute('''
+            SELECT g.group_id, g.name, a.animal_id
+            FROM groups g
+            LEFT JOIN animals a ON a.group_id = g.group_id AND a.active = 1
+            ORDER BY g.group_id, a.animal_id
+        ''')
+        assignments = []
+        for group_id, name, animal_id in self._c.fetchall():
+            if not assignments or assignments[-1][0] != group_id:
+                assignments.append((group_id, name, []))
+            if animal_id is not None:
+                assignments[-1][2].append(animal_id)
+        return assignments
 
     def get_groups(self):
         '''Returns a list of all group names in the database.'''
-        self._c.execute("SELECT name FROM groups")
-        return [group[0] for group in self._c.fetchall()]
+        return [name for _group_id, name, _capacity in self._settings_cache()["groups"]]
 
     def update_group_names(self, group_names):
         """Update group names in order of group_id.
@@ -478,6 +758,7 @@ class ExperimentDatabase:
                     (group_names[index], group_id),
                 )
         self._conn.commit()
+        self.invalidate_settings()
 
     def get_animal_current_cage(self, animal_id):
         '''Returns the current cage (group_id) for an animal'''
@@ -489,7 +770,56 @@ class ExperimentDatabase:
         result = self._c.fetchone()
         return result[0] if result else None
 
-    def update_animal_cage(self, animal_id, new_group_id):
+    def move_animals(self, animal_ids, target_group_id, capacity=None):
+        '''Moves active animals into target_group_id in one transaction.
+
+        capacity defaults to the target group's cage_capacity; ValueError is raised (and
+        nothing is changed) when the moved animals would not fit. Returns the delta
+        {"target": group_id, "moved": {animal_id: old_group_id}, "skipped": [already there]}.'''
+        ids = sorted({int(animal_id) for animal_id in animal_ids})
+        delta = {"target": target_group_id, "moved": {}, "skipped": []}
+        if not ids:
+            return delta
+        placeholders = ", ".join("?" * len(ids))
+        try:
+            self._c.execute(f'''SELECT animal_id, group_id FROM animals
+                            WHERE active = 1 AND animal_id IN ({placeholders})''', ids)
+            for animal_id, group_id in self._c.fetchall():
+                if group_id == target_group_id:
+                    delta["skipped"].append(animal_id)
+                else:
+                    delta["moved"][animal_id] = group_id
+            if not delta["moved"]:
+                return delta
+
+            self._c.execute('''SELECT cage_capacity,
+                                   (SELECT COUNT(*) FROM animals WHERE group_id = ? AND active = 1)
+                            FROM groups WHERE group_id = ?''', (target_group_id, target_group_id))
+            row = self._c.fetchone()
+            if row is None:
+                raise LookupError(f"No group found with ID {target_group_id}")
+            limit = row[0] if capacity is None else capacity
+            if limit is not None and row[1] + len(delta["moved"]) > int(limit):
+                raise ValueError(f"Moving these animals would exceed the maximum capacity of {limit}.")
+
+            moved = list(delta["moved"])
+            moved_placeholders = ", ".join("?" * len(moved))
+            self._c.execute(f'''UPDATE animals SET group_id = ?
+                            WHERE active = 1 AND animal_id IN ({moved_placeholders})''',
+                            [target_group_id] + moved)
+            affected = sorted(set(delta["moved"].values()) | {target_group_id})
+            self._c.execute(f'''UPDATE groups SET num_animals = (
+                                SELECT COUNT(*) FROM animals
+                                WHERE animals.group_id = groups.group_id AND active = 1)
+                            WHERE group_id IN ({", ".join("?" * len(affected))})''', affected)
+            self._conn.commit()
+            return delta
+        except sqlite3.Error as e:
+            log.error("Error moving animals: %s", e)
+            self._conn.rollback()
+            raise
+
+    def update_animal_cage(self, animal_id, new_group_id, commit=True):
         '''Updates an animal's cage assignment by updating its group_id'''
         try:
             # Get current group_id
@@ -524,10 +854,11 @@ class ExperimentDatabase:
                     WHERE group_id = ?
                 ''', (new_group_id,))
 
-                self._conn.commit()
+                if commit:
+                    self._conn.commit()
                 return True
         except sqlite3.Error as e:
-            print(f"Error updating animal group: {e}")
+            log.error("Error updating animal group: %s", e)
             self._conn.rollback()
             return False
 
@@ -554,20 +885,27 @@ class ExperimentDatabase:
 
     def get_measurement_type(self):
         '''Returns whether the measurement is automatic (1) or manual (0).'''
-        self._c.execute("SELECT measurement_type FROM experiment")
-        result = self._c.fetchone()
-        return result[0] if result else 0  # Default to manual (0)
+        return self._setting("measurement_type", 0)  # Default to manual (0)
 
     def update_measurement_type(self, measurement_type):
         '''Updates measurement_type in the experiment table.'''
         self._c.execute("UPDATE experiment SET measurement_type = ?", (measurement_type,))
         self._conn.commit()
+        self.invalidate_settings()
 
     def update_measurement_name(self, measurement: str):
         """Updates the measurement name(s) string in the experiment table."""
         self._c.execute("UPDATE experiment SET measurement = ?", (measurement,))
+        self.invalidate_settings()
+        self._sync_progress_slot_count()
         self._conn.commit()
 
+    def _sync_progress_slot_count(self):
+        '''Rebuilds the completion index when the measurement names change the slot count.'''
+        slot_count = _measurement_slot_count(self.get_measurement_name())
+        if slot_count != self.get_measurement_slot_count():
+            self.rebuild_progress_index(slot_count)
+
     def backup_to_file(self, target_path: str):
         """Safely copy the current database state into another SQLite file.
 
@@ -592,7 +930,7 @@ class ExperimentDatabase:
             finally:
                 dest.close()
         except sqlite3.Error as e:
-            print(f"Error backing up database to file: {e}")
+            log.error("Error backing up database to file: %s", e)
 
     def delete_measurement_column(self, measurement_id: int):
         """Delete a measurement slot globally and shift later slots left by 1.
@@ -626,7 +964,7 @@ class ExperimentDatabase:
             )
             self._conn.commit()
         except sqlite3.Error as e:
-            print(f"Error deleting measurement column: {e}")
+            log.error("Error deleting measurement column: %s", e)
             try:
                 self._conn.rollback()
             except Exception:
@@ -716,7 +1054,7 @@ class ExperimentDatabase:
             f.write("### Table: groups ###\n")
             groups_df.to_csv(f, index=False)
 
-        print(f"Exported to formatted CSV: {output_file}")
+        log.info("Exported to formatted CSV: %s", output_file)
 
 
     def export_to_csv(self, directory):
@@ -746,7 +1084,7 @@ class ExperimentDatabase:
             csv_file_path = os.path.join(experiment_folder, filename)
             df.to_csv(csv_file_path, index=False)
 
-        print(f"All tables exported successfully to {experiment_folder}.")
+        log.info("All tables exported successfully to %s.", experiment_folder)
 
     def set_animal_active_status(self, animal_id, status):
         '''Sets the active status of an animal.'''
@@ -772,6 +1110,7 @@ class ExperimentDatabase:
         '''Sets the number of animals in the experiment.'''
         self._c.execute("UPDATE experiment SET num_animals = ?", (number,))
         self._conn.commit()
+        self.invalidate_settings()
 
     def insert_blank_data_for_day(self, animal_ids, date):
         '''Inserts blank measurements for a list of animal IDs for a specific date.'''
@@ -782,17 +1121,15 @@ class ExperimentDatabase:
                                 (animal_id, date, None))  # Insert None for blank value
             self._conn.commit()
         except Exception as e:
-            print(f"Error inserting blank data: {e}")
+            log.error("Error inserting blank data: %s", e)
             self._conn.rollback()
 
     def get_measurement_name(self):
         '''Returns the measurement name from the experiment table.'''
         try:
-            self._c.execute("SELECT measurement FROM experiment")
-            result = self._c.fetchone()
-            return result[0] if result else None  # Return the measurement type or None if not found
+            return self._setting("measurement")  # Return the measurement type or None if not found
         except Exception as e:
-            print(f"Error retrieving measurement value: {e}")
+            log.error("Error retrieving measurement value: %s", e)
             return None
 
     def randomize_cages(self):
@@ -848,7 +1185,7 @@ class ExperimentDatabase:
             return True
 
         except Exception as e:
-            print(f"Error during randomization: {e}")
+            log.error("Error during randomization: %s", e)
             self._conn.rollback()
             return False
 
@@ -856,15 +1193,8 @@ class ExperimentDatabase:
         '''Automatically sorts animals, putting largest into groups, then smallest, until all are sorted'''
         try:
             # Get latest measurement for each active animal
-            self._c.execute('''
-                SELECT a.animal_id, m.value, m.timestamp
-                FROM animals a
-                JOIN animal_measurements m ON a.animal_id = m.animal_id
-                WHERE a.active = 1
-                GROUP BY a.animal_id
-                HAVING m.timestamp = MAX(m.timestamp)
-            ''')
-            measurements = self._c.fetchall()
+            measurements = [(animal_id, value, timestamp)
+                            for animal_id, (timestamp, value) in self.get_latest_measurements().items()]
 
             # Sort measurements by value in descending order
             measurements.sort(key=lambda x: x[1], reverse=True)
@@ -937,13 +1267,12 @@ class ExperimentDatabase:
             return True
 
         except Exception as e:
-            print(f"Error during autosort: {e}")
+            log.error("Error during autosort: %s", e)
             self._conn.rollback()
             return False
 
     def get_cage_number(self, cage_name):
-        self._c.execute('''
-                        SELECT group_id FROM groups
-                        WHERE name = ?''', (cage_name,))
-        result = self._c.fetchone()
-        return result[0] if result else None
+        for group_id, name, _capacity in self._settings_cache()["groups"]:
+            if name == cage_name:
+                return group_id
+        return None
@@ -0,0 +1,262 @@
+'''In-memory state for mapping RFID tags to animals at reader speed.
+
+The RFID mapping page used to re-query the animal list, search for the next
+free animal id and copy the database file after every scanned tag. A
+RFIDMappingSession loads that state once and keeps it current in memory:
+
+    session = RFIDMappingSession(db, on_flush=page.save)
+    animal_id, group_id = session.add("900123456789012")   # in memory only
+    if session.flush_due():
+        session.flush()                                     # one insert batch + persist
+
+Free animal ids come from a heap, groups are filled in order using cached
+counters, and used tags live in a set, so each tag costs O(log n). Pending
+mappings stay in memory (not in an open transaction on the shared
+connection, where another caller's rollback would silently discard them)
+until flush() inserts them with add_animals().
+
+Whole batches (SimAll, a vendor manifest read by read_rfid_manifest) go
+through add_many(), which validates every entry in memory and inserts them
+with a single executemany in one transaction.
+
+Every session registers itself so flush_all_sessions() can persist whatever
+is still pending when the application exits.
+'''
+import csv
+import heapq
+import logging
+import sqlite3
+import weakref
+
+log = logging.getLogger(__name__)
+
+# Tags mapped before the session commits and persists on its own.
+FLUSH_EVERY = 25
+# Quiet period after the last tag before pending mappings are persisted.
+FLUSH_DELAY_MS = 2000
+
+# Sessions still alive, so pending mappings can be flushed on exit.
+_live_sessions = weakref.WeakSet()
+
+
+class MappingError(Exception):
+    '''A tag could not be mapped (duplicate tag, experiment full, no group space).'''
+
+
+class RFIDMappingSession:
+    '''Free-id allocator, group counters and used-tag set for one experiment.'''
+
+    def __init__(self, db, on_flush=None, flush_every=FLUSH_EVERY):
+        self.db = db
+        self.on_flush = on_flush
+        self.flush_every = flush_every
+        self._pending_rows = []
+        self.flushes = 0
+        self.reload()
+        _live_sessions.add(self)
+
+    @property
+    def pending(self):
+        '''Mappings made since the last flush (not yet in the database).'''
+        return len(self._pending_rows)
+
+    def reload(self):
+        '''Re-reads the allocator state from the database (after removals or external edits).
+
+        Pending mappings are flushed first so they are not lost.'''
+        if self._pending_rows:
+            self.flush()
+        cursor = self.db._c
+        self.total = int(self.db.get_total_number_animals() or 0)
+        rows = cursor.execute("SELECT animal_id, rfid, active FROM animals").fetchall()
+        self.used_ids = {animal_id for animal_id, _rfid, _active in rows}
+        self.used_tags = {str(rfid) for _aid, rfid, _active in rows if rfid is not None}
+        self.mapped = sum(1 for _aid, _rfid, active in rows if active == 1)
+        self._free_ids = [i for i in range(1, self.total + 1) if i not in self.used_ids]
+        heapq.heapify(self._free_ids)
+        self.groups = [list(row) for row in cursor.execute(
+            "SELECT group_id, num_animals, cage_capacity FROM groups ORDER BY group_id").fetchall()]
+        self._group_index = 0
+
+    def is_used(self, rfid):
+        '''True if rfid is already mapped to an animal (active or not).'''
+        return str(rfid) in self.used_tags
+
+    def is_full(self):
+        '''True once every animal of the experiment has a tag.'''
+        return self.mapped >= self.total
+
+    def remaining(self):
+        '''Animals still waiting for a tag.'''
+        return max(self.total - self.mapped, 0)
+
+    def next_animal_id(self):
+        '''The id the next tag will be mapped to.'''
+        if self._free_ids:
+            return self._free_ids[0]
+        return max(self.used_ids | {self.total}) + 1
+
+    def _next_group(self):
+        while self._group_index < len(self.groups):
+            group = self.groups[self._group_index]
+            if group[1] < group[2]:
+                return group
+            self._group_index += 1
+        return None
+
+    def add(self, rfid):
+        '''Maps rfid to the next free animal in the first group with space; returns (animal_id, group_id).
+
+        Nothing is written until flush(); raises MappingError if it cannot be mapped.'''
+        rfid = str(rfid)
+        if self.is_used(rfid):
+            raise MappingError("This RFID tag has already been mapped to an animal")
+        if self.is_full():
+            raise MappingError("Maximum number of animals reached")
+        group = self._next_group()
+        if group is None:
+            raise MappingError("No available group slot. Check group capacity.")
+        animal_id = self.next_animal_id()
+        self._pending_rows.append((animal_id, rfid, group[0], ''))
+        if self._free_ids and self._free_ids[0] == animal_id:
+            heapq.heappop(self._free_ids)
+        self.used_ids.add(animal_id)
+        self.used_tags.add(rfid)
+        self.mapped += 1
+        group[1] += 1
+        return animal_id, group[0]
+
+    def add_many(self, entries):
+        '''Maps a batch atomically; entries are tags or (animal_id, rfid) pairs. Returns [(animal_id, rfid, group_id)].
+
+        Every entry is checked before anything is written; on any problem MappingError is raised
+        listing them and nothing changes. The batch is committed but not persisted (call flush()).'''
+        if self.pending:
+            self.flush()
+        problems = []
+        planned = []
+        ids = set()
+        tags = set()
+        free = list(self._free_ids)
+        groups = [list(group) for group in self.groups]
+        group_index = self._group_index
+        mapped = self.mapped
+        for entry in entries:
+            animal_id, rfid = entry if isinstance(entry, (tuple, list)) else (None, entry)
+            rfid = str(rfid).strip()
+            if not rfid:
+                problems.append("empty tag")
+                continue
+            if rfid in self.used_tags or rfid in tags:
+                problems.append(f"tag {rfid} is already mapped")
+                continue
+            if animal_id is not None:
+                animal_id = int(animal_id)
+                if animal_id < 1 or animal_id in self.used_ids or animal_id in ids:
+                    problems.append(f"animal {animal_id} is already mapped or invalid")
+                    continue
+            if mapped >= self.total:
+                problems.append(f"tag {rfid}: maximum number of animals reached")
+                continue
+            while group_index < len(groups) and groups[group_index][1] >= groups[group_index][2]:
+                group_index += 1
+            if group_index >= len(groups):
+                problems.append(f"tag {rfid}: no available group slot")
+                continue
+            if animal_id is None:
+                while free and free[0] in ids:
+                    heapq.heappop(free)
+                animal_id = heapq.heappop(free) if free else max(self.used_ids | ids | {self.total}) + 1
+            group = groups[group_index]
+            group[1] += 1
+            mapped += 1
+            ids.add(animal_id)
+            tags.add(rfid)
+            planned.append((animal_id, rfid, group[0]))
+        if problems:
+            shown = "; ".join(problems[:5])
+            more = f" (+{len(problems) - 5} more)" if len(problems) > 5 else ""
+            raise MappingError(f"{len(problems)} entries could not be mapped: {shown}{more}")
+        if not planned:
+            return []
+        try:
+            self.db.add_animals([(animal_id, rfid, group_id, '')
+                                 for animal_id, rfid, group_id in planned])
+        except sqlite3.Error as e:
+            raise MappingError(f"Failed to map RFIDs: {e}") from e
+        self.used_ids |= ids
+        self.used_tags |= tags
+        self._free_ids = [i for i in self._free_ids if i not in ids]
+        heapq.heapify(self._free_ids)
+        self.groups = groups
+        self._group_index = group_index
+        self.mapped = mapped
+        return planned
+
+    def flush_due(self):
+        '''True when enough mappings are pending to persist now.'''
+        return self.pending >= self.flush_every
+
+    def flush(self):
+        '''Inserts pending mappings in one transaction and runs the persistence callback once.
+
+        Returns how many were flushed. If the insert fails the in-memory state is reloaded from the
+        database (the pending mappings are dropped) and MappingError is raised.'''
+        rows, self._pending_rows = self._pending_rows, []
+        if not rows:
+            return 0
+        try:
+            self.db.add_animals(rows)
+        except sqlite3.Error as e:
+            self.reload()
+            raise MappingError(f"Failed to save {len(rows)} RFID mappings: {e}") from e
+        if self.on_flush is not None:
+            self.on_flush()
+        self.flushes += 1
+        return len(rows)
+
+
+def flush_all_sessions():
+    '''Flushes every live session with pending mappings (called on application exit); returns rows flushed.'''
+    flushed = 0
+    for session in list(_live_sessions):
+        pending = session.pending
+        if not pending:
+            continue
+        try:
+            flushed += session.flush()
+        except Exception:  # pylint: disable=broad-exception-caught
+            log.exception("Could not flush %d pending RFID mappings", pending)
+    return flushed
+
+
+def read_rfid_manifest(path):
+    '''Reads a tag manifest CSV into add_many() entries.
+
+    Rows are either "animal_id,rfid" or a single "rfid" column; a header row is skipped.
+    The format is decided by the first non-blank row, so "5," is a missing tag, not tag "5".'''
+    entries = []
+    two_columns = None
+    with open(path, newline='', encoding='utf-8-sig') as manifest:
+        for line, row in enumerate(csv.reader(manifest), start=1):
+            row = [cell.strip() for cell in row]
+            if not any(row):
+                continue
+            first_row = two_columns is None
+            if first_row:
+                two_columns = len(row) >= 2
+            if not two_columns:
+                if first_row and row[0].lower() in ("rfid", "tag"):
+                    continue
+                if not row[0]:
+                    raise MappingError(f"Line {line}: missing tag")
+                entries.append(row[0])
+                continue
+            if not row[0].isdigit():
+                if first_row:
+                    continue
+                raise MappingError(f"Line {line}: animal id {row[0]!r} is not a number")
+            if len(row) < 2 or not row[1]:
+                raise MappingError(f"Line {line}: missing tag")
+            entries.append((int(row[0]), row[1]))
+    return entries
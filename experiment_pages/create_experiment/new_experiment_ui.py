@@ -773,7 +773,7 @@ class NewExperimentUI(  # pylint: disable=too-many-instance-attributes
     # ------------------------------------------------------------
     def raise_warning(self, message: str, title: str = "Warning"):
         """Show an in-page warning banner (no separate window)."""
-        AudioManager.play(ERROR_SOUND)
+        AudioManager.play(ERROR_SOUND, preempt=True)
         self._show_warning_banner(message, title=title)
 
     def _build_warning_banner(self):
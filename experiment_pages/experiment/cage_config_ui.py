@@ -1,4 +1,6 @@
 '''Contains cage configuration page and behaviour.'''
+import logging
+import os
 from customtkinter import *
 from shared.tk_models import *
 from tkinter import messagebox
@@ -8,6 +10,8 @@ from shared.file_utils import SUCCESS_SOUND, ERROR_SOUND
 from shared.file_utils import save_temp_to_file
 from shared.hid_wedge import HIDWedgeListener
 
+log = logging.getLogger(__name__)
+
 class CageConfigurationUI(MouserPage):
     '''The Frame that allows user to configure the cages.'''
     def __init__(self, database, parent: CTk, prev_page: CTkFrame = None, file_path = ''):
@@ -227,6 +231,9 @@ class CageConfigurationUI(MouserPage):
 
         self.animal_buttons = {}
         self.cage_buttons = {}
+        # Tiles created and (re)packed by the incremental board, for diagnostics.
+        self.board_stats = {"created": 0, "packed": 0}
+        self._board_built = False
         self.selected_animals = set()
         self.selected_cage = None
 
@@ -431,24 +438,47 @@ class CageConfigurationUI(MouserPage):
         super().raise_frame()
         self._start_or_stop_hid_listener()
 
+    def refresh(self):
+        '''Brings the cage layout and tile labels up to date with the database.'''
+        self.db.reset_attributes()
+        self.update_config_frame()
+        self.refresh_animal_tiles()
+        return True
+
+    def teardown(self):
+        '''Stops HID scanning before destroying the page.'''
+        self._stop_hid_scan_listener()
+        super().teardown()
+
     def update_config_frame(self):
-        '''Updates the config frame to reflect new information.'''
-        for widget in self.config_frame.winfo_children():
-            widget.destroy()
-        self.animal_buttons = {}
-        self.cage_buttons = {}
-        self.create_cage_layout()
+        '''Brings the cage board in line with the database, touching only groups that changed.'''
+        assignments = self.db.get_group_assignments()
+        if not self._board_built or [name for _group_id, name, _animals in assignments] != list(self.cage_buttons):
+            # Groups were added, removed or renamed: lay the board out again.
+            for widget in self.config_frame.winfo_children():
+                widget.destroy()
+            self.animal_buttons = {}
+            self.cage_buttons = {}
+            self.create_cage_layout(assignments)
+            return
+        self._apply_assignments(assignments)
 
-    def create_cage_layout(self):
+    def create_cage_layout(self, assignments=None):
         '''Creates the layout of all cages and their animals.'''
-        cages = self.db.get_groups()  # Each group represents a cage
+        if assignments is None:
+            assignments = self.db.get_group_assignments()  # Each group represents a cage
         label_style = CTkFont("Segoe UI Semibold", 13)
         tile_style = CTkFont("Segoe UI", 12)
+        self._tile_font = tile_style
+        self._cage_frames = {}
+        self._cage_members = {}
+        self._group_names = {group_id: name for group_id, name, _animals in assignments}
+        self._board_built = True
 
         self.config_frame.grid_rowconfigure(0, weight=1)
         max_columns = 3
 
-        if not cages:
+        if not assignments:
             empty_state = CTkFrame(
                 self.config_frame,
                 corner_radius=18,
@@ -471,7 +501,7 @@ class CageConfigurationUI(MouserPage):
             ).pack(fill="x", padx=16, pady=(0, 16), anchor="w")
             return
 
-        for index, cage_name in enumerate(cages):
+        for index, (_group_id, cage_name, _animals) in enumerate(assignments):
             row = index // max_columns
             col = index % max_columns
             cage_frame = CTkFrame(
@@ -513,29 +543,91 @@ class CageConfigurationUI(MouserPage):
             cage_button.pack(fill="x", padx=14, pady=(10, 12))
             self.cage_buttons[cage_name] = cage_button
 
-            animals = self.db.get_animals_in_group(cage_name)
-            if not animals:
-                CTkLabel(
-                    cage_frame,
-                    text="No animals assigned",
-                    text_color=self.ui_palette["text_muted"],
-                    font=tile_style,
-                ).pack(fill="x", padx=14, pady=(0, 14), anchor="w")
+            empty_label = CTkLabel(
+                cage_frame,
+                text="No animals assigned",
+                text_color=self.ui_palette["text_muted"],
+                font=tile_style,
+            )
+            self._cage_frames[cage_name] = (cage_frame, empty_label)
+            self._cage_members[cage_name] = None
+
+        self._apply_assignments(assignments)
+
+    def _animal_tile_text(self, animal_id):
+        weight = self.db.animal_weights.get(int(animal_id))
+        return f"{animal_id}  ·  {weight:g}" if isinstance(weight, (int, float)) and weight else animal_id
+
+    def _animal_button(self, animal_id):
+        '''Returns the tile for animal_id, creating it on first use.
+
+        Tiles are children of config_frame and packed into their cage frame, so a move
+        re-packs the existing tile instead of destroying and recreating it.'''
+        button = self.animal_buttons.get(animal_id)
+        if button is None:
+            button = CTkButton(
+                self.config_frame,
+                text=self._animal_tile_text(animal_id),
+                command=lambda a=animal_id: self.toggle_animal_selection(a),
+                fg_color=self._animal_button_default_fg,
+                hover_color="#93c5fd",
+                text_color=self.ui_palette["text"],
+                font=self._tile_font,
+                corner_radius=12,
+            )
+            self.animal_buttons[animal_id] = button
+            self.board_stats["created"] += 1
+        return button
+
+    def _apply_assignments(self, assignments, prune=True):
+        '''Re-packs the tiles of groups whose membership changed.
+
+        With prune, assignments cover the whole board and tiles of animals no longer listed are dropped.'''
+        present = set()
+        for _group_id, cage_name, animals in assignments:
+            members = [str(animal_id) for animal_id in animals]
+            present.update(members)
+            if self._cage_members.get(cage_name) == members:
+                continue
+            cage_frame, empty_label = self._cage_frames[cage_name]
+            for animal_id in self._cage_members.get(cage_name) or ():
+                button = self.animal_buttons.get(animal_id)
+                if button is not None:
+                    button.pack_forget()
+            if members:
+                empty_label.pack_forget()
             else:
-                for animal in animals:
-                    animal_id = str(animal[0])
-                    animal_button = CTkButton(
-                        cage_frame,
-                        text=animal_id,
-                        command=lambda a=animal_id: self.toggle_animal_selection(a),
-                        fg_color=self._animal_button_default_fg,
-                        hover_color="#93c5fd",
-                        text_color=self.ui_palette["text"],
-                        font=tile_style,
-                        corner_radius=12,
-                    )
-                    animal_button.pack(fill="x", padx=14, pady=4)
-                    self.animal_buttons[animal_id] = animal_button
+                empty_label.pack(fill="x", padx=14, pady=(0, 14), anchor="w")
+            for animal_id in members:
+                button = self._animal_button(animal_id)
+                button.pack(in_=cage_frame, fill="x", padx=14, pady=4)
+                # Stack above the cage frame, which may have been created after the tile.
+                button.lift(cage_frame)
+                self.board_stats["packed"] += 1
+            self._cage_members[cage_name] = members
+        if not prune:
+            return
+        for animal_id in [a for a in self.animal_buttons if a not in present]:
+            self.animal_buttons.pop(animal_id).destroy()
+            self.selected_animals.discard(animal_id)
+
+    def _clear_selection(self):
+        '''Deselects every animal tile and the selected cage.'''
+        for animal_id in self.selected_animals:
+            button = self.animal_buttons.get(animal_id)
+            if button is not None:
+                button.configure(fg_color=self._animal_button_default_fg)
+        self.selected_animals.clear()
+        if self.selected_cage in self.cage_buttons:
+            self.cage_buttons[self.selected_cage].configure(fg_color=self._cage_button_default_fg)
+        self.selected_cage = None
+
+    def refresh_animal_tiles(self):
+        '''Updates tile labels (latest measurements) without re-laying out the board.'''
+        for animal_id, button in self.animal_buttons.items():
+            text = self._animal_tile_text(animal_id)
+            if button.cget("text") != text:
+                button.configure(text=text)
 
     def select_cage(self, cage_name):
         '''Handles cage selection by updating visual feedback.'''
@@ -575,6 +667,7 @@ class CageConfigurationUI(MouserPage):
     def randomize(self):
         '''Autosorts the animals into cages.'''
         self.db.randomize_cages()
+        self._clear_selection()
         self.update_config_frame()
         self.save()
         AudioManager.play(SUCCESS_SOUND)
@@ -587,6 +680,7 @@ class CageConfigurationUI(MouserPage):
         )
         if confirmed:
             self.db.autosort()
+            self._clear_selection()
             self.update_config_frame()
             self.save()
             AudioManager.play(SUCCESS_SOUND)
@@ -607,12 +701,17 @@ class CageConfigurationUI(MouserPage):
             self.raise_warning("Both animals are in the same cage.")
             return
 
-        # Perform the swap using the database controller
-        self.db.update_animal_cage(animal_id1, cage2)  # Move animal 1 to cage 2
-        self.db.update_animal_cage(animal_id2, cage1)  # Move animal 2 to cage 1
+        # Both moves are committed together, or neither is
+        moved = (self.db.update_animal_cage(animal_id1, cage2, commit=False)  # Move animal 1 to cage 2
+                 and self.db.update_animal_cage(animal_id2, cage1, commit=False))  # Move animal 2 to cage 1
+        if not moved:
+            self.db.rollback()
+            self.raise_warning("The animals could not be swapped.")
+            return
+        self.db.commit()
 
-        self.selected_animals.clear()
-        self.update_config_frame()
+        self._clear_selection()
+        self._apply_moves({int(animal_id1): (cage1, cage2), int(animal_id2): (cage2, cage1)})
         self.save()
         AudioManager.play(SUCCESS_SOUND)
 
@@ -631,43 +730,56 @@ class CageConfigurationUI(MouserPage):
         target_cage = self.selected_cage  # The display name
         target_group = self.db.get_cage_number(target_cage)  # The internal number
 
-        # Check if moving would exceed cage maximum
-        target_cage_count = len(self.db.get_animals_in_group(target_cage))
-        if target_cage_count + len(self.selected_animals) > self.db.get_cage_max():
-            self.raise_warning(f"Moving these animals would exceed the maximum capacity of {self.db.get_cage_max()}.")
+        # Capacity is checked and every animal moved in one transaction
+        try:
+            delta = self.db.move_animals(self.selected_animals, target_group)
+        except ValueError as e:
+            self.raise_warning(str(e))
+            return
+        except Exception:  # pylint: disable=broad-exception-caught
+            log.exception("Error moving animals")
+            self.raise_warning("The animals could not be moved.")
             return
 
-        # Track if any animals were actually moved
-        animals_moved = False
-
-        # Move each selected animal
-        for animal_id in list(self.selected_animals):  # Convert to list to avoid modifying set during iteration
-            # Get current cage of the animal
-            current_cage = self.db.get_animal_current_cage(animal_id)
-
-            # Skip if animal is already in target cage
-            if current_cage == target_group:
-                continue
-
-            # Perform the move using the database controller with internal group number
-            self.db.update_animal_cage(animal_id, target_group)
-            animals_moved = True
-
-        if not animals_moved:
+        if not delta["moved"]:
             self.raise_warning("No animals were moved. They might already be in the target cage.")
             return
 
         # Clear selections and update the UI
-        self.selected_animals.clear()
-        self.selected_cage = None
-        if target_cage in self.cage_buttons:  # Use display name for button lookup
-            self.cage_buttons[target_cage].configure(fg_color=self._cage_button_default_fg)  # Reset cage button color
-        self.update_config_frame()
+        self._clear_selection()
+        self._apply_moves({animal_id: (old_group, target_group) for animal_id, old_group in delta["moved"].items()})
         self.save()
         AudioManager.play(SUCCESS_SOUND)
 
+    def _apply_moves(self, moves):
+        '''Re-packs only the groups touched by moves ({animal_id: (old_group_id, new_group_id)}).'''
+        names = getattr(self, "_group_names", {})
+        affected = {group_id for pair in moves.values() for group_id in pair}
+        if not affected <= set(names) or any(self._cage_members.get(names[g]) is None for g in affected):
+            self.update_config_frame()
+            return
+        members = {group_id: list(self._cage_members[names[group_id]]) for group_id in affected}
+        for animal_id, (old_group, new_group) in moves.items():
+            animal_key = str(animal_id)
+            if animal_key in members[old_group]:
+                members[old_group].remove(animal_key)
+            members[new_group].append(animal_key)
+        self._apply_assignments(
+            [(group_id, names[group_id], sorted(members[group_id], key=int)) for group_id in sorted(affected)],
+            prune=False,
+        )
+
     def raise_warning(self, message):
-        '''Raises a warning dialog with the given message.'''
+        '''Shows a warning dialog with the given message without blocking the caller.
+
+        A warning raised while another is open replaces its text instead of stacking windows.'''
+        AudioManager.play(ERROR_SOUND, preempt=True)
+        window = getattr(self, "_warning_window", None)
+        if window is not None and window.winfo_exists():
+            self._warning_label.configure(text=message)
+            window.lift()
+            return
+
         palette = getattr(self, "ui_palette", None) or {
             "bg": ("#f8fafc", "#0b1220"),
             "text": ("#0f172a", "#e2e8f0"),
@@ -680,14 +792,15 @@ class CageConfigurationUI(MouserPage):
         message_window.resizable(False, False)
         message_window.configure(fg_color=palette["bg"])
 
-        CTkLabel(
+        self._warning_label = CTkLabel(
             message_window,
             text=message,
             wraplength=320,
             justify=LEFT,
             text_color=palette["text"],
             font=CTkFont("Segoe UI", 12),
-        ).pack(fill="x", padx=20, pady=(20, 10))
+        )
+        self._warning_label.pack(fill="x", padx=20, pady=(20, 10))
 
         ok_button = CTkButton(
             message_window,
@@ -701,9 +814,9 @@ class CageConfigurationUI(MouserPage):
         )
         ok_button.pack(pady=(0, 16))
 
-        AudioManager.play(ERROR_SOUND)
+        self._warning_window = message_window
+        # Modal for input, but the caller returns immediately.
         message_window.grab_set()
-        message_window.wait_window()
 
     def save_to_database(self):
         '''Saves updated values to database.'''
@@ -723,6 +836,10 @@ class CageConfigurationUI(MouserPage):
             self.db.commit()
             print("Changes committed")
 
+            # Working directly on the experiment file: the commit is the save.
+            if os.path.abspath(current_file) == os.path.abspath(self.file_path):
+                return
+
             # Save back to original file location
             print(f"Saving {current_file} to {self.file_path}")
             save_temp_to_file(current_file, self.file_path)
@@ -2,13 +2,13 @@
 from datetime import date
 import re
 import csv
-from collections import deque
 from functools import partial
 import tkinter as tk
 import tkinter.font as tkfont
 from tkinter.ttk import Treeview, Style
 from tkinter import dialog, filedialog
 import time
+import logging
 import sqlite3
 import serial
 import os
@@ -21,8 +21,18 @@ from shared.audio import AudioManager
 from shared.serial_handler import SerialDataHandler
 from shared.file_utils import save_temp_to_file
 import threading
-from shared.flash_overlay import FlashOverlay
+from shared.flash_overlay import FlashOverlayManager
+from shared.ui_dispatcher import UIDispatcher
+from shared.thread_supervisor import ThreadSupervisor
+from shared.activity_log import ActivityLog, session_log_path
 from shared.hid_wedge import HIDWedgeListener
+from shared.device_drivers import get_driver, guess_driver_name
+from shared.stability_filter import StabilityFilter
+from shared.serial_engine import SerialIOEngine
+from shared.serial_port_controller import invalidate_port_cache
+from shared.metrics import MetricsRegistry
+
+log = logging.getLogger(__name__)
 
 #pylint: disable= undefined-variable
 class DataCollectionUI(MouserPage):
@@ -31,6 +41,10 @@ class DataCollectionUI(MouserPage):
     def __init__(self, parent: CTk, prev_page: CTkFrame = None, database_name = "", file_path = "", original_file_path: str | None = None):
 
         super().__init__(parent, "Data Collection", prev_page)
+        # One overlay per page, reused by every scan/save/completion message.
+        self.flash_overlay = FlashOverlayManager.for_page(self)
+        # Background threads hand UI work to the main thread through this queue.
+        self.dispatcher = UIDispatcher.for_widget(self)
         ui = get_ui_metrics()
         self._ui = ui
         action_button_font = CTkFont("Segoe UI Semibold", ui["action_font_size"])
@@ -71,15 +85,28 @@ class DataCollectionUI(MouserPage):
         self._last_hid_tag_time = 0.0
         self._serial_controllers = {"device": None, "reader": None}
         self._active_animal_id = None
-        self._measurement_serial_threads = {}
-        self._measurement_serial_stop = threading.Event()
-        self._activity_entries = deque(maxlen=200)
+        self._measurement_serial_subs = {}
+        self._measurement_filters = {}
         self._last_device_status = {}
         self._device_connected_until = {}
         self._last_connected_port = {}
 
         self.current_file_path = file_path
         self.original_file_path = original_file_path or file_path
+        session_name = os.path.splitext(os.path.basename(self.original_file_path or database_name or ""))[0]
+        # Incremental on-screen log; also written to a rotating file when MOUSER_ACTIVITY_LOG_DIR is set.
+        self.activity_log = ActivityLog(file_path=session_log_path(session_name))
+        registry = MetricsRegistry.instance()
+        self._scan_metric = registry.counter("rfid.scans", page="data_collection")
+        self._unknown_tag_metric = registry.counter("rfid.unknown_tags", page="data_collection")
+        self._echo_metric = registry.counter("rfid.reader_echoes", page="data_collection")
+        # Last tag and read time per source (HID on the Tk thread, serial on a worker); a repeat within
+        # 0.35 s is counted as a reader echo but still processed.
+        self._recent_tags = {}
+        self._recent_tags_lock = threading.Lock()
+        self._autosave_metric = registry.histogram("autosave_ms", page="data_collection")
+        # Stability filter counters per measurement column, shown in the Diagnostics window.
+        registry.register_collector("measurement_filters", self.get_measurement_filter_stats)
         self.menu_page = prev_page
 
         self.database = ExperimentDatabase(database_name)
@@ -1001,7 +1028,14 @@ class DataCollectionUI(MouserPage):
             if hasattr(self, "devices_summary_label") and self.devices_summary_label:
                 self.devices_summary_label.configure(text=f"{registered} registered · {connected} connected")
 
+        def _refresh_devices_card():
+            # Manual refresh should see newly plugged devices immediately, not after the port cache TTL
+            # (even before any serial controller has been created).
+            invalidate_port_cache()
+            _update_devices_card_once()
+
         self._update_devices_card_once = _update_devices_card_once
+        self._refresh_devices_card = _refresh_devices_card
         self._update_devices_card_once()
 
         # Divider between the scroll area and the action buttons.
@@ -1168,7 +1202,7 @@ class DataCollectionUI(MouserPage):
             border_width=0,
             text_color="#ffffff",
             font=CTkFont("Segoe UI Semibold", 13),
-            command=self._update_devices_card_once,
+            command=self._refresh_devices_card,
         ).grid(row=0, column=1, sticky="ew", padx=(8, 0))
 
         # RFID reader port selection is auto-detected (serial) or inferred (HID) on refresh; no manual config needed.
@@ -1207,6 +1241,7 @@ class DataCollectionUI(MouserPage):
             self.activity_text.configure(state="disabled")
         except Exception:
             pass
+        self.activity_log.attach(self.activity_text, self.dispatcher)
 
         CTkFrame(self.right_panel, fg_color="transparent").grid(row=2, column=0, sticky="nsew")
         self._log_activity("Ready.")
@@ -1224,45 +1259,7 @@ class DataCollectionUI(MouserPage):
 
     def _log_activity(self, message: str):
         """Append a line to the Activity log."""
-        try:
-            msg = str(message).strip()
-        except Exception:
-            msg = ""
-        if not msg:
-            return
-
-        timestamp = time.strftime("%H:%M:%S")
-        line = f"{timestamp}  {msg}"
-        try:
-            self._activity_entries.append(line)
-        except Exception:
-            return
-
-        if not hasattr(self, "activity_text") or not self.activity_text:
-            return
-
-        def _render():
-            if not self.winfo_exists():
-                return
-            try:
-                self.activity_text.configure(state="normal")
-            except Exception:
-                pass
-            try:
-                self.activity_text.delete("1.0", "end")
-                self.activity_text.insert("end", "\n".join(self._activity_entries))
-                self.activity_text.see("end")
-            except Exception:
-                pass
-            try:
-                self.activity_text.configure(state="disabled")
-            except Exception:
-                pass
-
-        try:
-            self.after(0, _render)
-        except Exception:
-            pass
+        self.activity_log.append(message)
 
     def _update_table_hscroll_visibility(self):
         """Show the bottom horizontal scrollbar only when needed."""
@@ -1333,11 +1330,14 @@ class DataCollectionUI(MouserPage):
             if not tag:
                 return
             self._last_hid_tag_time = time.monotonic()
+            self._scan_metric.inc()
+            self._count_reader_echo("hid", tag)
             try:
                 animal_id = self.database.get_animal_id(tag)
             except Exception:
                 animal_id = None
             if animal_id is None:
+                self._unknown_tag_metric.inc()
                 # Ignore non-matching keystrokes (prevents accidental capture of normal typing).
                 self.set_status("HID RFID scanned (unmapped).")
                 return
@@ -1347,6 +1347,15 @@ class DataCollectionUI(MouserPage):
         self._hid_rfid_listener = HIDWedgeListener(self, _on_tag, capture_all=True)
         self._hid_rfid_listener.start()
 
+    def _count_reader_echo(self, source, tag):
+        '''Counts tag as a reader echo when it repeats the previous scan from source within 0.35 s.'''
+        now = time.monotonic()
+        with self._recent_tags_lock:
+            previous = self._recent_tags.get(source)
+            self._recent_tags[source] = (tag, now)
+        if previous is not None and previous[0] == tag and (now - previous[1]) < 0.35:
+            self._echo_metric.inc()
+
     def _stop_hid_rfid_listening(self):
         if getattr(self, "_hid_rfid_listener", None) is None:
             return
@@ -1406,6 +1415,12 @@ class DataCollectionUI(MouserPage):
             pass
         return settings
 
+    def _get_measurement_driver(self, device_label, port_description=""):
+        """Protocol driver for a measurement device: configured in serial settings, else guessed from names."""
+        controller = getattr(self, "_serial_controllers", {}).get("device")
+        configured = getattr(controller, "driver_name", None) if controller else None
+        return get_driver(configured or guess_driver_name(device_label, port_description))
+
     def _start_measurement_serial_listeners(self):
         """Start background listeners for each measurement column (serial devices).
 
@@ -1421,85 +1436,97 @@ class DataCollectionUI(MouserPage):
         if not hasattr(self, "_resolve_serial_port_for_device"):
             return
 
-        self._measurement_serial_stop.clear()
         serial_kwargs = self._get_serial_device_kwargs()
+        engine = SerialIOEngine.instance()
 
         for measurement_index, measurement_name in enumerate(self.measurement_strings or []):
             device_label = str(measurement_name or "").strip()
             if not device_label:
                 continue
 
-            port, _desc, is_connected, _note = self._resolve_serial_port_for_device(device_label, "device")
+            port, desc, is_connected, _note = self._resolve_serial_port_for_device(device_label, "device")
             if not port or not is_connected:
                 continue
 
-            thread_key = f"{measurement_index}:{port}"
-            if thread_key in self._measurement_serial_threads:
+            sub_key = f"{measurement_index}:{port}"
+            if sub_key in self._measurement_serial_subs:
                 continue
+            driver = self._get_measurement_driver(device_label, desc)
+            device_controller = self._serial_controllers.get("device")
+            framing = getattr(device_controller, "framing", None)
+            decoder = driver.make_decoder(framing)
+            stability = StabilityFilter()
+            self._measurement_filters[measurement_index] = stability
+            state = {"filtered_for": None}
+
+            def _on_frame(frame, mi=measurement_index, drv=driver, filt=stability, st=state, key=sub_key):
+                # Runs on the serial engine thread; only settled values are handed to Tk.
+                reading = drv.decode(frame)
+                if reading is None:
+                    return
+                if reading.stable is False and drv.request_command:
+                    # Keep polling until the device reports a settled value.
+                    entry = self._measurement_serial_subs.get(key)
+                    if entry:
+                        entry[0].write(drv.request_command)
+
+                animal_id = getattr(self, "_active_animal_id", None)
+                if animal_id != st["filtered_for"]:
+                    filt.reset()
+                    st["filtered_for"] = animal_id
+                if animal_id is None:
+                    return
 
-            def _thread_target(mi: int, port_name: str, key: str):
-                ser_obj = None
-                try:
-                    ser_obj = serial.Serial(port=port_name, **serial_kwargs)
-                except Exception as exc:
-                    print(f"Failed to open device port {port_name} for measurement index {mi}: {exc}")
+                # Only the settled value is saved; intermediate samples are coalesced.
+                settled = filt.add(reading.value, reading.stable)
+                if settled is None:
                     return
+                dropped = filt.take_coalesced()
+                self.dispatcher.post(self._commit_settled_value, animal_id, mi, settled, dropped)
 
-                buffer = ""
-                try:
-                    while not self._measurement_serial_stop.is_set():
-                        try:
-                            chunk = ser_obj.read(64)
-                        except Exception:
-                            break
-                        if not chunk:
-                            continue
-                        try:
-                            buffer += chunk.decode("utf-8", errors="ignore")
-                        except Exception:
-                            continue
-
-                        if "\n" not in buffer and "\r" not in buffer:
-                            continue
-
-                        lines = re.split(r"[\r\n]+", buffer)
-                        buffer = lines[-1]  # keep trailing partial
-                        for line in lines[:-1]:
-                            raw = str(line).strip()
-                            if not raw:
-                                continue
-                            match = re.search(r"-?\d+(?:\.\d+)?", raw)
-                            if not match:
-                                continue
-                            value_text = match.group(0)
-
-                            animal_id = getattr(self, "_active_animal_id", None)
-                            if animal_id is None:
-                                continue
-
-                            self.after(
-                                0,
-                                lambda aid=animal_id, idx=mi, val=value_text: self.change_selected_value_at(aid, idx, val),
-                            )
-                finally:
-                    try:
-                        if ser_obj and ser_obj.is_open:
-                            ser_obj.close()
-                    except Exception:
-                        pass
-                    try:
-                        if key in self._measurement_serial_threads:
-                            del self._measurement_serial_threads[key]
-                    except Exception:
-                        pass
+            def _on_error(exc, mi=measurement_index, key=sub_key):
+                log.warning("Device port for measurement index %s failed: %s", mi, exc)
+                self._measurement_serial_subs.pop(key, None)
 
-            t = threading.Thread(target=_thread_target, args=(measurement_index, port, thread_key), daemon=True)
-            self._measurement_serial_threads[thread_key] = t
-            t.start()
+            try:
+                sub = engine.open(port, _on_frame, decoder=decoder, on_error=_on_error, driver=driver.name,
+                                  framing=framing, **serial_kwargs)
+            except Exception as exc:
+                log.warning("Failed to open device port %s for measurement index %s: %s", port, measurement_index, exc)
+                continue
+            self._measurement_serial_subs[sub_key] = (sub, driver)
+
+        # A device opened after the animal was scanned still gets asked for its reading.
+        self._request_device_readings()
+
+    def _request_device_readings(self):
+        """Ask every on-demand measurement device for one reading of the active animal."""
+        if getattr(self, "_active_animal_id", None) is None:
+            return
+        for sub, driver in list(self._measurement_serial_subs.values()):
+            if driver.request_command:
+                sub.write(driver.request_command)
 
     def _stop_measurement_serial_listeners(self):
-        self._measurement_serial_stop.set()
-        self._measurement_serial_threads = {}
+        subs = list(self._measurement_serial_subs.values())
+        self._measurement_serial_subs = {}
+        for sub, _driver in subs:
+            try:
+                sub.close()
+            except Exception:
+                pass
+
+    def _commit_settled_value(self, animal_id, measurement_index, value, coalesced):
+        """Save one settled device reading and report how many samples were coalesced into it."""
+        if self.change_selected_value_at(animal_id, measurement_index, value) and coalesced:
+            self.set_status(f"Saved {value} for Animal {animal_id} ({coalesced} samples coalesced).")
+
+    def get_measurement_filter_stats(self):
+        """Per measurement column: samples received, committed and coalesced by the stability filter."""
+        return {
+            idx: {"received": f.received, "committed": f.committed, "coalesced": f.coalesced}
+            for idx, f in dict(self._measurement_filters).items()
+        }
 
     def showSaveFileDialog(self):
         '''Opens a file dialog for the user to select where to save the CSV file.'''
@@ -1879,7 +1906,7 @@ class DataCollectionUI(MouserPage):
             message=warning_message,
             icon="warning"
         )
-        AudioManager.play(ERROR_SOUND)
+        AudioManager.play(ERROR_SOUND, preempt=True)
 
     def item_selected(self, _):
         '''On item selection.
@@ -2036,8 +2063,8 @@ class DataCollectionUI(MouserPage):
                     color = ("#92400e", "#fbbf24")
                 self.status_chip_label.configure(text=f"● {chip_text}", text_color=color)
 
-        if self.winfo_exists():
-            self.after(0, _update)
+        # Only the latest status text is drawn per UI tick.
+        self.dispatcher.post(_update, key=(self, "status"), owner=self)
 
     def _set_scan_button_state(self, running: bool):
         self._scan_is_running = bool(running)
@@ -2121,8 +2148,7 @@ class DataCollectionUI(MouserPage):
         if not self.database.is_data_collected_for_date(self.current_date):
             if self.database.get_measurement_type() == 1:
                 # Create Flash overlay using new Flash Overlay Class
-                FlashOverlay(
-                    parent=self,
+                self.flash_overlay.show(
                     message="Data Collection Started",
                     duration=1000,
                     bg_color="#00FF00", #Bright Green
@@ -2130,70 +2156,64 @@ class DataCollectionUI(MouserPage):
                 )
                 AudioManager.play(SUCCESS_SOUND)
 
-        print("📡 Starting RFID listener...")
-        print("All RFIDs:", self.database.get_all_animals_rfid())
-        animals = self.database.get_animals()
-        print("Animals:", animals)
-
-        # Check RFIDs directly
-        print("RFIDs in database:", self.database.get_all_animals_rfid())
-
-        # Try fetching one by one
-        for rfid in self.database.get_all_animals_rfid():
-            print(f"RFID {rfid} -> ID:", self.database.get_animal_id(rfid))
+        log.info("Starting RFID listener")
 
         self.rfid_stop_event.clear()  # Reset stop flag
 
-        def listen():
+        def listen(worker):
+            reader = None
             try:
-                self.rfid_reader = SerialDataHandler("reader")
-                self.rfid_reader.start()
-                print("🔄 RFID Reader Started!")
-
-                while not self.rfid_stop_event.is_set():
-                    if self.rfid_reader:  # Check if reader still exists
-                        received_rfid = self.rfid_reader.get_stored_data()
-
-                        if received_rfid:
-                            received_rfid = re.sub(r"[^\w]", "", received_rfid)  # Keep only alphanumeric characters, gets rid of spaces and encrypted greeting messages
-
-                            if not received_rfid:
-                                print("⚠️ Empty RFID scan detected, ignoring...")
-                                continue
-
-                            print(f"📡 RFID Scanned: {received_rfid}")
-                            animal_id = self.database.get_animal_id(received_rfid)
-
-                            if animal_id is not None:
-                                print(f"✅ Found Animal ID: {animal_id}")
-                                FlashOverlay(
-                                    parent=self,
-                                    message="Animal Found",
-                                    duration=500,
-                                    bg_color="#00FF00", # Bright Green
-                                    text_color="black"
-                                )
-                                AudioManager.play(SUCCESS_SOUND)
-                                self.after(250, lambda aid=animal_id: self.process_scanned_animal(aid))
-                            else:
-                                self.raise_warning("No animal found for scanned RFID.")
-                                self.set_status("RFID not mapped to any animal.")
-
-
-
-                    time.sleep(0.1)  # Shorter sleep time for more responsive stopping
+                # Each received frame wakes the listener, so it never polls.
+                reader = SerialDataHandler("reader", on_data=lambda _data: worker.wake())
+                self.rfid_reader = reader
+                worker.add_closer(reader.stop)
+                reader.start()
+                log.debug("RFID reader started")
+
+                while not worker.stopping:
+                    received_rfid = reader.get_stored_data()
+                    if not received_rfid:
+                        worker.wait(timeout=1.0)
+                        continue
+
+                    received_rfid = re.sub(r"[^\w]", "", received_rfid)  # Keep only alphanumeric characters, gets rid of spaces and encrypted greeting messages
+
+                    if not received_rfid:
+                        log.debug("Empty RFID scan detected, ignoring")
+                        continue
+
+                    log.debug("RFID scanned: %s", received_rfid)
+                    self._scan_metric.inc()
+                    self._count_reader_echo("serial", received_rfid)
+                    animal_id = self.database.get_animal_id(received_rfid)
+
+                    if animal_id is not None:
+                        log.debug("Found animal %s", animal_id)
+                        self.flash_overlay.show(
+                            message="Animal Found",
+                            duration=500,
+                            bg_color="#00FF00", # Bright Green
+                            text_color="black"
+                        )
+                        AudioManager.play(SUCCESS_SOUND)
+                        # Give the flash a moment before the measurement prompt opens.
+                        self.dispatcher.post(self.after, 250, lambda aid=animal_id: self.process_scanned_animal(aid))
+                    else:
+                        self._unknown_tag_metric.inc()
+                        self.dispatcher.post(self.raise_warning, "No animal found for scanned RFID.")
+                        self.set_status("RFID not mapped to any animal.")
             except Exception as e:
-                print(f"Error in RFID listener: {e}")
+                log.error("Error in RFID listener: %s", e)
             finally:
-                if hasattr(self, 'rfid_reader') and self.rfid_reader:
-                    self.rfid_reader.stop()
-                    self.rfid_reader.close()
-                    self.rfid_reader = None
-                self._set_scan_button_state(False)
-                print("🛑 RFID listener thread ended.")
-
-        self.rfid_thread = threading.Thread(target=listen, daemon=True)
-        self.rfid_thread.start()
+                if reader is not None:
+                    reader.stop()
+                    if self.rfid_reader is reader:
+                        self.rfid_reader = None
+                if not worker.stopping:
+                    self.dispatcher.post(self._set_scan_button_state, False)
+                log.debug("RFID listener thread ended")
+
+        self.rfid_thread = ThreadSupervisor.instance().spawn("data-collection-rfid-listener", listen, owner=self)
         self.set_status("RFID listener started.")
         try:
             self._start_measurement_serial_listeners()
@@ -2202,7 +2222,7 @@ class DataCollectionUI(MouserPage):
 
     def stop_listening(self):
         '''Stops the RFID listener and ensures the serial port is released.'''
-        print("🛑 Stopping RFID listener...")
+        log.info("Stopping RFID listener")
         self.set_status("Stopping listener...")
         self._log_activity("Stopped scanning.")
 
@@ -2217,28 +2237,20 @@ class DataCollectionUI(MouserPage):
             pass
         self._active_animal_id = None
 
+        # Signal this page's workers; their closers release the reader, so nothing is joined here.
+        ThreadSupervisor.instance().stop_owner(self)
+
         # Stop and close the RFID reader
         if hasattr(self, 'rfid_reader') and self.rfid_reader:
             try:
                 self.rfid_reader.stop()
-                self.rfid_reader.close()
             except Exception as e:
-                print(f"Error closing RFID reader: {e}")
+                log.warning("Error closing RFID reader: %s", e)
             finally:
                 self.rfid_reader = None
 
-        # Wait for thread to finish with timeout
-        if self.rfid_thread and self.rfid_thread.is_alive():
-            try:
-                self.rfid_thread.join(timeout=2)  # Wait up to 2 seconds
-                if self.rfid_thread.is_alive():
-                    print("⚠️ Warning: RFID thread did not stop cleanly")
-            except Exception as e:
-                print(f"Error joining RFID thread: {e}")
-
         self.rfid_thread = None
         self._measurement_in_progress = False
-        print("✅ RFID listener cleanup completed.")
         self._set_scan_button_state(False)
         self.set_status("Listener stopped.")
 
@@ -2256,6 +2268,7 @@ class DataCollectionUI(MouserPage):
     def process_scanned_animal(self, animal_id):
         """Select scanned animal and capture weight for that animal."""
         self._active_animal_id = animal_id
+        self._request_device_readings()
         self.select_animal_by_id(animal_id)
         self._log_activity(f"RFID matched Animal {animal_id}.")
 
@@ -2274,43 +2287,42 @@ class DataCollectionUI(MouserPage):
             return
         self._measurement_in_progress = True
         self.set_status(f"RFID matched Animal {animal_id}. Capturing weight...")
-        threading.Thread(
-            target=self._collect_weight_for_animal,
-            args=(animal_id,),
-            daemon=True,
-        ).start()
+        ThreadSupervisor.instance().spawn(
+            "data-collection-weight-capture", self._collect_weight_for_animal, animal_id, owner=self
+        )
 
-    def _collect_weight_for_animal(self, animal_id):
+    def _collect_weight_for_animal(self, worker, animal_id):
         """Read from configured device; fallback to manual entry."""
-        weight_value = self._read_weight_from_device(timeout_seconds=3.0)
+        weight_value = self._read_weight_from_device(timeout_seconds=3.0, worker=worker)
+        if worker.stopping:
+            return
         if weight_value is None:
-            self.after(0, lambda aid=animal_id: self._prompt_manual_weight(aid))
+            self.dispatcher.post(self._prompt_manual_weight, animal_id)
             return
-        self.after(0, lambda aid=animal_id, val=weight_value: self._finalize_weight_capture(aid, val))
+        self.dispatcher.post(self._finalize_weight_capture, animal_id, weight_value)
+
+    def _read_weight_from_device(self, timeout_seconds=3.0, worker=None):
+        """Best-effort weight read from serial weighing device.
 
-    def _read_weight_from_device(self, timeout_seconds=3.0):
-        """Best-effort weight read from serial weighing device."""
-        data_handler = None
+        On-demand balances are polled with their driver's request command, so a settled
+        reading costs one round trip; streaming devices are read until a frame parses."""
+        controller = getattr(self, "_serial_controllers", {}).get("device")
+        port = getattr(controller, "reader_port", None) if controller else None
+        if not port:
+            return None
         try:
-            data_handler = SerialDataHandler("device")
-            data_handler.start()
-            start_time = time.monotonic()
-            while time.monotonic() - start_time < timeout_seconds and not self.rfid_stop_event.is_set():
-                raw = data_handler.get_stored_data()
-                if raw:
-                    match = re.search(r"-?\d+(?:\.\d+)?", str(raw))
-                    if match:
-                        return float(match.group(0))
-                time.sleep(0.1)
+            driver = self._get_measurement_driver("Balancer")
+            # Opened through the serial engine so manual-mode reads are recorded by a serial capture.
+            reading = driver.request_reading_via_engine(
+                port,
+                timeout=timeout_seconds,
+                stop_event=worker.stop_event if worker is not None else self.rfid_stop_event,
+                framing=getattr(controller, "framing", None),
+                **self._get_serial_device_kwargs(),
+            )
+            return None if reading is None else float(reading.value)
         except Exception:
             return None
-        finally:
-            if data_handler:
-                try:
-                    data_handler.stop()
-                except Exception:
-                    pass
-        return None
 
     def _prompt_manual_weight(self, animal_id):
         """Prompt for manual weight when scale is unavailable."""
@@ -2344,10 +2356,10 @@ class DataCollectionUI(MouserPage):
         for child in self.table.get_children():
             item_values = self.table.item(child)["values"]
             if str(item_values[0]) == str(animal_id):  # Ensure IDs match as strings
-                self.after(0, lambda: self._select_row_on_main_thread(child))
+                self.dispatcher.post(self._select_row_on_main_thread, child, key=(self, "select_row"))
                 return
 
-        print(f"⚠️ Animal ID {animal_id} not found in table.")
+        log.warning("Animal ID %s not found in table", animal_id)
 
     def _select_row_on_main_thread(self, child):
         '''Helper function to safely select a row on the main thread.'''
@@ -2402,7 +2414,7 @@ class DataCollectionUI(MouserPage):
                     continue
                 parsed_values.append(float(text))
 
-            print(f"Saving data point(s) for animal {animal_id_to_change}: {parsed_values}")
+            log.debug("Saving data point(s) for animal %s: %s", animal_id_to_change, parsed_values)
 
             today = str(date.today())
             for index, value in enumerate(parsed_values):
@@ -2410,7 +2422,6 @@ class DataCollectionUI(MouserPage):
                 if value is None:
                     continue
                 self.database.change_data_entry(today, animal_id_to_change, value, index + 1)
-            print("Database entry updated")
 
             # Update display table
             try:
@@ -2446,23 +2457,21 @@ class DataCollectionUI(MouserPage):
                         self.table.update_idletasks()
                         break
                 if updated:
-                    print(f"Table display updated for animal {animal_id_to_change}")
                     # Keep summary tiles in sync with the updated table.
                     try:
                         self.get_values_for_date()
                     except Exception:
                         pass
                 else:
-                    print(f"Warning: Could not find animal {animal_id_to_change} in table")
+                    log.warning("Could not find animal %s in table", animal_id_to_change)
             except Exception as table_error:
-                print(f"Error updating table display: {table_error}")
+                log.error("Error updating table display: %s", table_error)
 
             # Autosave: Commit and save the database file
             if hasattr(self.database, 'db_file') and self.database.db_file != ":memory:":
                 try:
                     # Ensure all changes are committed
                     self.database._conn.commit()
-                    print("Changes committed")
 
                     # Persist temp DB back to the original experiment file when needed.
                     original_path = os.path.abspath(getattr(self, "original_file_path", "") or "")
@@ -2470,19 +2479,18 @@ class DataCollectionUI(MouserPage):
                     if original_path and db_path and original_path != ":memory:" and db_path != ":memory:" and original_path != db_path:
                         # Do not auto-save into encrypted originals without the password flow.
                         if str(original_path).lower().endswith(".pmouser"):
-                            print("Autosave skipped for encrypted experiment; use Save flow.")
+                            log.info("Autosave skipped for encrypted experiment; use Save flow.")
                         else:
-                            print(f"Autosave backup {db_path} -> {original_path}")
-                            if hasattr(self.database, "backup_to_file"):
-                                self.database.backup_to_file(original_path)
-                            else:
-                                save_temp_to_file(db_path, original_path)
-                            print("Autosave Success!")
+                            log.debug("Autosave backup %s -> %s", db_path, original_path)
+                            with self._autosave_metric.time():
+                                if hasattr(self.database, "backup_to_file"):
+                                    self.database.backup_to_file(original_path)
+                                else:
+                                    save_temp_to_file(db_path, original_path)
                     else:
-                        print("Autosave: committed to SQLite (no backup needed).")
+                        log.debug("Autosave: committed to SQLite (no backup needed)")
 
-                    FlashOverlay(
-                        parent=self,
+                    self.flash_overlay.show(
                         message="Data Collected",
                         duration=1000,
                         bg_color="#00FF00", # Bright Green
@@ -2491,26 +2499,21 @@ class DataCollectionUI(MouserPage):
 
                     # If all animals have data for today, show completion message
                     if self.database.is_data_collected_for_date(str(date.today())):
-                        self.after(1100, lambda: FlashOverlay(  # Delay to show after the first overlay
-                            parent=self,
+                        self.flash_overlay.show(  # Shown once the first overlay finishes
                             message="All Animals Measured for Today!",
                             duration=4000,
                             bg_color="#FFF700",  # Different color for completion
-                            text_color="black"
-                        ))
+                            text_color="black",
+                            queue=True
+                        )
 
 
                 except Exception as save_error:
-                    print(f"Autosave failed: {save_error}")
-                    print(f"Error type: {type(save_error)}")
-                    import traceback
-                    print(f"Full traceback: {traceback.format_exc()}")
+                    log.exception("Autosave failed: %s", save_error)
             return True
         except Exception as e:
             self.raise_warning("Failed to save data for animal.")
-            print(f"Top level error: {e}")
-            import traceback
-            print(f"Full traceback: {traceback.format_exc()}")
+            log.exception("Failed to save data for animal %s: %s", animal_id_to_change, e)
             return False
 
     def change_selected_value_at(self, animal_id_to_change, measurement_index: int, value):
@@ -2559,8 +2562,6 @@ class DataCollectionUI(MouserPage):
         column_ids = self.table["columns"] or ()
         measurement_slots = max(len(column_ids) - 2, 1)
         total_count = len(self.table.get_children()) or 0
-        done_rows = 0
-        remaining_rows = 0
         filled_cells = 0
         total_cells = total_count * measurement_slots
 
@@ -2588,7 +2589,6 @@ class DataCollectionUI(MouserPage):
             has_any = any(_cell_is_filled(v) for v in measurement_values)
             has_all = has_any and all(_cell_is_filled(v) for v in measurement_values)
             if has_all:
-                done_rows += 1
                 status = "Done"
                 tag = "done"
             elif has_any:
@@ -2597,8 +2597,6 @@ class DataCollectionUI(MouserPage):
             else:
                 status = "Pending"
                 tag = "pending"
-            if status != "Done":
-                remaining_rows += 1
             filled_cells += sum(1 for v in measurement_values if _cell_is_filled(v))
 
             row_values = [animal_id] + measurement_values + [status]
@@ -2607,9 +2605,11 @@ class DataCollectionUI(MouserPage):
         # Update summary tiles (UI only)
         try:
             # Total animals: number of rows
-            # Measured today: number of rows that are fully complete ("Done")
-            # Remaining: rows that are still Pending or In Progress
+            # Measured today / Remaining: complete and incomplete active animals, read in one
+            # query from the database's per-day completion index (no per-row counting)
             # Completion: percentage of all measurement cells filled across all rows/columns
+            done_rows, active_animals = self.database.get_daily_progress(self.current_date)
+            remaining_rows = max(active_animals - done_rows, 0)
             completion = int(round((filled_cells / float(total_cells)) * 100)) if total_cells else 0
             if hasattr(self, "total_animals_value") and self.total_animals_value:
                 self.total_animals_value.configure(text=str(total_count))
@@ -2628,6 +2628,24 @@ class DataCollectionUI(MouserPage):
         self.set_status("Ready.")
         self._start_device_polling()
 
+    def refresh(self):
+        '''Reloads today's values; the page is rebuilt if the set of animals changed.'''
+        table_ids = {str(self.table.item(child)["values"][0]) for child in self.table.get_children()}
+        if table_ids != {str(animal[0]) for animal in self.database.get_animals()}:
+            return False
+        self.get_values_for_date()
+        return True
+
+    def teardown(self):
+        '''Stops listeners, device polling and the session log before destroying the page.'''
+        if self.rfid_thread is not None or self._measurement_serial_subs:
+            self.stop_listening()
+        self._stop_hid_rfid_listening()
+        self._stop_device_polling()
+        self.activity_log.close()
+        MetricsRegistry.instance().unregister_collector("measurement_filters")
+        super().teardown()
+
 
     def press_back_to_menu_button(self):
         '''Navigates back to Experiment Menu.'''
@@ -2648,6 +2666,7 @@ class DataCollectionUI(MouserPage):
 
     def close_connection(self):
         '''Closes database file.'''
+        self.activity_log.close()
         self.database.close()
 
 class ChangeMeasurementsDialog():
@@ -2735,31 +2754,7 @@ class ChangeMeasurementsDialog():
         if self.data_collection.database.get_measurement_type() == 1 and len(self.measurement_items) == 1:
             self.thread_running = True
 
-            def _auto_capture_once():
-                data_handler = None
-                try:
-                    data_handler = SerialDataHandler("device")
-                    data_handler.start()
-                    start_time = time.monotonic()
-                    while time.monotonic() - start_time < 5.0 and self.thread_running:
-                        received_data = data_handler.get_stored_data()
-                        if received_data:
-                            try:
-                                self.textboxes[0].delete(0, END)
-                                self.textboxes[0].insert(0, str(received_data).strip())
-                            except Exception:
-                                pass
-                            break
-                        time.sleep(0.1)
-                except Exception:
-                    pass
-                finally:
-                    if data_handler:
-                        try:
-                            data_handler.stop()
-                        except Exception:
-                            pass
-
+            def _finish_auto_capture():
                 if self.thread_running:
                     self.data_collection.after(0, lambda: self.finish(animal_id))
 
@@ -2780,7 +2775,42 @@ class ChangeMeasurementsDialog():
                                 ],
                             )
 
-            threading.Thread(target=_auto_capture_once, daemon=True).start()
+            def _auto_capture_once():
+                # Frames arrive through the shared serial engine; poll the handler from Tk, no extra thread.
+                try:
+                    data_handler = SerialDataHandler("device")
+                    data_handler.start()
+                except Exception:
+                    data_handler = None
+                deadline = time.monotonic() + 5.0
+
+                def _poll():
+                    received_data = data_handler.get_stored_data() if data_handler else None
+                    try:
+                        closed = not self.root.winfo_exists()
+                    except Exception:
+                        closed = True
+                    done = received_data or closed or time.monotonic() >= deadline or not self.thread_running
+                    if not done:
+                        self.root.after(100, _poll)
+                        return
+                    if data_handler:
+                        try:
+                            data_handler.stop()
+                        except Exception:
+                            pass
+                    if received_data:
+                        try:
+                            self.textboxes[0].delete(0, END)
+                            self.textboxes[0].insert(0, str(received_data).strip())
+                        except Exception:
+                            pass
+                    if not closed:
+                        _finish_auto_capture()
+
+                _poll()
+
+            self.root.after(0, _auto_capture_once)
 
         self.root.mainloop()
 
@@ -152,6 +152,9 @@ class _MenuTile(CTkFrame):
 class ExperimentMenuUI(MouserPage):
     """Provides navigation options for the selected experiment."""
 
+    # Menu of the experiment currently open; its pages are torn down when another one opens.
+    _active_menu = None
+
     def _persist_temp_to_original_if_available(self):
         """Persist temp DB back to the original experiment file when the app uses temp copies.
 
@@ -237,6 +240,13 @@ class ExperimentMenuUI(MouserPage):
 
         super().__init__(root, "Experiment Menu", menu_page)
 
+        # Pages built once per experiment and reused on every visit (see _show_page).
+        self._pages = {}
+        previous_menu = ExperimentMenuUI._active_menu
+        if previous_menu is not None and previous_menu is not self:
+            previous_menu.close_experiment()
+        ExperimentMenuUI._active_menu = self
+
         palette = {
             "bg": ("#f1f5f9", "#0b1220"),
             "text_muted": ("#64748b", "#94a3b8"),
@@ -775,6 +785,8 @@ class ExperimentMenuUI(MouserPage):
             group_names = updated_experiment.get_group_names()
             db.update_group_names(group_names)
             db.update_measurement_type(updated_experiment.get_measurement_type())
+            # Groups and measurement mode shape every cached page; rebuild them on next visit.
+            self.close_pages()
 
         from experiment_pages.experiment.group_config_ui import (  # pylint: disable=import-error,import-outside-toplevel
             GroupConfigUI,
@@ -813,8 +825,7 @@ class ExperimentMenuUI(MouserPage):
                 CageConfigUI,
             )
 
-            page = CageConfigUI(self.file_path, self.root, self, self.file_path)
-            page.raise_frame()
+            self._show_page("cage_config", lambda: CageConfigUI(self.file_path, self.root, self, self.file_path))
         except sqlite3.DatabaseError as exc:
             messagebox.showerror(
                 "Cage Configuration Error",
@@ -842,14 +853,13 @@ class ExperimentMenuUI(MouserPage):
         )
 
         try:
-            page = DataCollectionUI(
+            self._show_page("data_collection", lambda: DataCollectionUI(
                 parent=self.root,
                 prev_page=self,
                 database_name=self.file_path,
                 file_path=self.file_path,
                 original_file_path=getattr(self, "original_file_path", None),
-            )
-            page.raise_frame()
+            ))
         except Exception as e:  # pylint: disable=broad-exception-caught
             messagebox.showerror("Data Collection Error", f"Failed to open Data Collection page.\n\n{e}")
 
@@ -859,8 +869,7 @@ class ExperimentMenuUI(MouserPage):
             DataAnalysisUI,
         )
 
-        page = DataAnalysisUI(self.root, self, self.file_path)
-        page.raise_frame()
+        self._show_page("data_analysis", lambda: DataAnalysisUI(self.root, self, self.file_path))
 
     def open_map_rfid(self):
         """Open Map RFID Page."""
@@ -868,8 +877,7 @@ class ExperimentMenuUI(MouserPage):
             MapRFIDPage,
         )
 
-        page = MapRFIDPage(self.file_path, self.root, self, self.file_path)
-        page.raise_frame()
+        self._show_page("map_rfid", lambda: MapRFIDPage(self.file_path, self.root, self, self.file_path))
 
     def open_summary(self):
         """Open Experiment Summary Page."""
@@ -889,6 +897,45 @@ class ExperimentMenuUI(MouserPage):
         page = InvestigatorsUI(self.root, self, self.file_path)
         page.raise_frame()
 
+    def _show_page(self, key, factory):
+        """Raise the cached page for key, refreshing its data, or build it on first visit."""
+        page = self._pages.get(key)
+        if page is not None:
+            try:
+                reusable = page.winfo_exists() and page.refresh() is not False
+            except Exception as exc:  # pylint: disable=broad-exception-caught
+                print(f"Refreshing cached {key} page failed, rebuilding: {exc}")
+                reusable = False
+            if not reusable:
+                self._teardown_page(key)
+                page = None
+        if page is None:
+            page = factory()
+            self._pages[key] = page
+        page.raise_frame()
+        return page
+
+    def _teardown_page(self, key):
+        page = self._pages.pop(key, None)
+        if page is None:
+            return
+        try:
+            page.teardown()
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            print(f"Error tearing down {key} page: {exc}")
+
+    def close_pages(self):
+        """Tear down every cached page (stops their threads and after jobs)."""
+        for key in list(self._pages):
+            self._teardown_page(key)
+
+    def close_experiment(self):
+        """Release this experiment's pages and the menu itself when another experiment is opened."""
+        self.close_pages()
+        if ExperimentMenuUI._active_menu is self:
+            ExperimentMenuUI._active_menu = None
+        self.teardown()
+
     def all_rfid_mapped(self):
         """Return True if all expected animals have RFID mappings."""
         num_animals = self.experiment_db.get_total_number_animals()
@@ -936,6 +983,7 @@ class ExperimentMenuUI(MouserPage):
 
     def delete_experiment(self):
         """Delete the currently opened experiment file and navigate back."""
+        self.close_pages()
         self.disconnect_database()
         path = self.file_path
         try:
@@ -959,6 +1007,7 @@ class ExperimentMenuUI(MouserPage):
 
     def back_to_welcome(self):
         """Return to the main welcome screen."""
+        self.close_pages()
         from ui.welcome_screen import ( 
             setup_welcome_screen,
         )
@@ -1,10 +1,8 @@
 '''Map RFID module.'''
+import logging
 import time
 import platform
-import shutil
-import subprocess
-import re
-from tkinter import Menu
+from tkinter import Menu, filedialog
 from tkinter.ttk import Style, Treeview
 import tkinter.font as tkfont
 import random
@@ -18,13 +16,20 @@ from shared.file_utils import SUCCESS_SOUND, ERROR_SOUND
 from shared.tk_models import *
 from shared.serial_port_controller import SerialPortController
 from shared.serial_handler import SerialDataHandler
+from shared.virtual_devices import VirtualSerialPair
 from shared.hid_wedge import HIDWedgeListener
 
 from databases.experiment_database import ExperimentDatabase
+from databases.mapping_session import RFIDMappingSession, MappingError, FLUSH_DELAY_MS, read_rfid_manifest
 from shared.audio import AudioManager
 
 import shared.file_utils as file_utils
-from shared.flash_overlay import FlashOverlay
+from shared.flash_overlay import FlashOverlayManager
+from shared.ui_dispatcher import UIDispatcher
+from shared.thread_supervisor import ThreadSupervisor
+from shared.metrics import MetricsRegistry
+
+log = logging.getLogger(__name__)
 
 class RFIDHandler:
     def __init__(self):
@@ -86,6 +91,10 @@ class MapRFIDPage(MouserPage):# pylint: disable= undefined-variable
     def __init__(self, database, parent: CTk, previous_page: CTkFrame = None, file_path = ""):
 
         super().__init__(parent, "RFID Mapping", previous_page)
+        # One overlay per page, reused by every scan/save/completion message.
+        self.flash_overlay = FlashOverlayManager.for_page(self)
+        # Background threads hand UI work to the main thread through this queue.
+        self.dispatcher = UIDispatcher.for_widget(self)
         ui = get_ui_metrics()
         self._ui = ui
         action_button_font = CTkFont("Segoe UI Semibold", ui["nav_font_size"])
@@ -147,6 +156,16 @@ class MapRFIDPage(MouserPage):# pylint: disable= undefined-variable
         self.db = ExperimentDatabase(file)
 
         self.animal_rfid_list = self.db.get_all_animals_rfid()
+        # Mapped tags are committed and saved in batches, not once per tag.
+        self.mapping_session = RFIDMappingSession(self.db, on_flush=self.save)
+        self._flush_job = None
+        registry = MetricsRegistry.instance()
+        self._scan_metric = registry.counter("rfid.scans", page="map_rfid")
+        # Reader echoes of the same tag, debounced below.
+        self._duplicate_metric = registry.counter("rfid.duplicates_suppressed", page="map_rfid")
+        # Operator scanned a tag that is already mapped.
+        self._already_mapped_metric = registry.counter("rfid.already_mapped", page="map_rfid")
+        self._autosave_metric = registry.histogram("autosave_ms", page="map_rfid")
         self.animals = []
         self.animal_id = 1
         
@@ -254,6 +273,18 @@ class MapRFIDPage(MouserPage):# pylint: disable= undefined-variable
         setattr(self.scan_toggle_button, "_mouser_variant", "success")
         self.scan_toggle_button.place(relx=0.50, rely=0.42, anchor=CENTER)
 
+        self.import_button = CTkButton(
+            self,
+            text="Import Tag CSV",
+            compound=TOP,
+            width=ui["action_width"],
+            height=ui["action_height"],
+            font=action_button_font,
+            command=self.import_rfid_manifest,
+        )
+        setattr(self.import_button, "_mouser_variant", "info")
+        self.import_button.place(relx=0.82, rely=0.42, anchor=CENTER)
+
         self.table_frame = CTkFrame(
             self,
             fg_color=self._palette["card_bg"],
@@ -379,14 +410,9 @@ class MapRFIDPage(MouserPage):# pylint: disable= undefined-variable
 
         self.item_selected(None)
 
-        animals_setup = self.db.get_all_animal_ids()
-        for row_index, animal in enumerate(animals_setup):
-            rfid = self.db.get_animal_rfid(animal)
-            value = (int(animal), rfid)
-            row_tag = "even_row" if row_index % 2 == 0 else "odd_row"
-            self.table.insert('', END, values=value, tags=("text_font", row_tag))
-            self.animals.append(value)
-            self.animal_id_entry_text.set(animal)
+        self._render_table()
+        if self.animals:
+            self.animal_id_entry_text.set(self.animals[-1][0])
 
         self._refresh_summary_cards()
         if self.db.experiment_uses_rfid() == 0:
@@ -430,8 +456,8 @@ class MapRFIDPage(MouserPage):# pylint: disable= undefined-variable
             if hasattr(self, "reader_status_chip_label") and self.reader_status_chip_label.winfo_exists():
                 self.reader_status_chip_label.configure(text=f"Reader: {self._status_chip_text(status_text)}")
 
-        if self.winfo_exists():
-            self.after(0, _update)
+        # Only the latest reader status is drawn per UI tick.
+        self.dispatcher.post(_update, key=(self, "reader_status"), owner=self)
 
     def _status_chip_text(self, status_text):
         """Return the status text for the header chip."""
@@ -442,15 +468,9 @@ class MapRFIDPage(MouserPage):# pylint: disable= undefined-variable
 
     def _refresh_summary_cards(self):
         """Update ANIMALS / SCANNED / PENDING cards."""
-        try:
-            total = int(self.db.get_total_number_animals() or 0)
-        except Exception:  # pylint: disable=broad-exception-caught
-            total = 0
-        try:
-            scanned = int(len(self.db.get_animals()))
-        except Exception:  # pylint: disable=broad-exception-caught
-            scanned = int(len(self.animals))
-        pending = max(total - scanned, 0)
+        total = self.mapping_session.total
+        scanned = self.mapping_session.mapped
+        pending = self.mapping_session.remaining()
         if hasattr(self, "total_animals_value") and self.total_animals_value.winfo_exists():
             self.total_animals_value.configure(text=str(total))
         if hasattr(self, "scanned_value") and self.scanned_value.winfo_exists():
@@ -498,28 +518,24 @@ class MapRFIDPage(MouserPage):# pylint: disable= undefined-variable
 
         # Ensure old listener is properly stopped before starting a new one
         if self.rfid_thread and self.rfid_thread.is_alive():
-            print("⚠️ Stopping stale RFID listener before restarting...")
+            log.info("Stopping stale RFID listener before restarting")
             self.stop_listening()
-            time.sleep(0.5)  # Allow OS to release the port
 
-        if len(self.db.get_animals()) != self.db.get_total_number_animals():
-            FlashOverlay(
-                parent=self,
+        if not self.mapping_session.is_full():
+            self.flash_overlay.show(
                 message="RFID Scanning Started",
                 duration=1000,
                 bg_color="#00FF00", #Bright Green
                 text_color="black"
             )
 
-        time.sleep(.1)
-
-        print("📡 Starting a fresh RFID listener...")
-        print("RFIDs already scanned: ", self.animal_rfid_list)
+        log.info("Starting RFID listener (%d tags already mapped)", self.mapping_session.mapped)
         self.rfid_stop_event.clear()  # Reset the stop flag
 
         # Try serial mode first; fallback to HID if serial can't open.
-        self.rfid_reader = SerialDataHandler("reader")
-        serial_reader = getattr(self.rfid_reader, "reader", None)
+        reader = SerialDataHandler("reader")
+        self.rfid_reader = reader
+        serial_reader = getattr(reader, "reader", None)
         serial_port = getattr(serial_reader, "ser", None)
         if serial_port is None:
             self._switch_to_hid_fallback("Serial RFID unavailable.")
@@ -531,84 +547,85 @@ class MapRFIDPage(MouserPage):# pylint: disable= undefined-variable
 
         switching_to_hid = False
 
-        def listen():
+        def listen(worker):
             nonlocal switching_to_hid
             try:
-                self.rfid_reader.start()
-                print("🔄 RFID Reader Started!")
+                # Each received frame wakes the listener; the timeout only paces the connection checks.
+                reader.on_data = lambda _data: worker.wake()
+                reader.start()
+                log.debug("RFID reader started")
 
                 last_rfid = None
                 serial_start_time = time.monotonic()
                 got_first_serial_data = False
 
-                while not self.rfid_stop_event.is_set():
-                    serial_reader = getattr(self.rfid_reader, "reader", None)
+                while not worker.stopping:
+                    serial_reader = getattr(reader, "reader", None)
                     serial_port = getattr(serial_reader, "ser", None)
                     if serial_port is None or not getattr(serial_port, "is_open", False):
                         switching_to_hid = True
-                        self.after(0, lambda: self._switch_to_hid_fallback("Serial connection lost."))
+                        self.dispatcher.post(self._switch_to_hid_fallback, "Serial connection lost.")
                         return
 
-                    received_rfid = self.rfid_reader.get_stored_data()
+                    received_rfid = reader.get_stored_data()
                     elapsed = time.monotonic() - serial_start_time
                     if (not got_first_serial_data) and (not received_rfid) and elapsed > self._serial_first_data_timeout:
                         switching_to_hid = True
-                        self.after(0, lambda: self._switch_to_hid_fallback("No serial RFID data received."))
+                        self.dispatcher.post(self._switch_to_hid_fallback, "No serial RFID data received.")
                         return
 
                     if not received_rfid or received_rfid == last_rfid:
-                        time.sleep(0.5)
+                        worker.wait(timeout=0.5)
                         continue
 
                     got_first_serial_data = True
                     last_rfid = received_rfid
-                    print(f"📡 RFID Scanned: {received_rfid}")
-                    self.after(0, lambda value=received_rfid: self._handle_scanned_rfid(value))
+                    log.debug("RFID scanned: %s", received_rfid)
+                    self.dispatcher.post(self._handle_scanned_rfid, received_rfid)
 
             except Exception as e:
-                print(f"Error in RFID listener: {e}")
+                log.error("Error in RFID listener: %s", e)
             finally:
-                if hasattr(self, 'rfid_reader') and self.rfid_reader:
-                    self.rfid_reader.stop()
-                    self.rfid_reader.close()
+                reader.stop()
+                if self.rfid_reader is reader:
                     self.rfid_reader = None
-                print("RFID listener thread ended.")
-                if (not switching_to_hid) and self.winfo_exists():
-                    self.after(0, lambda: self._set_scanning_state(False))
+                log.debug("RFID listener thread ended")
+                # A listener replaced by a newer session must not reset that session's state.
+                if not switching_to_hid and not worker.stopping:
+                    self.dispatcher.post(self._set_scanning_state, False)
 
-
-        self.rfid_thread = threading.Thread(target=listen, daemon=True)
-        self.rfid_thread.start()
+        self.rfid_thread = ThreadSupervisor.instance().spawn(
+            "map-rfid-listener", listen, owner=self, closers=[reader.stop]
+        )
 
     def stop_listening(self):
-        """Stops the RFID listener thread and ensures the serial port is released."""
-        print("⛔ Stopping RFID scanning...")
+        """Stops the RFID listener thread and releases the serial port without waiting for it."""
+        log.info("Stopping RFID scanning")
         self.set_reader_status("Stopping scanner...")
         self.rfid_stop_event.set()  # Stop the listener loop
         self._stop_hid_listener()
         self.use_hid_fallback = False
 
-        if self.rfid_thread and self.rfid_thread.is_alive():
-            self.rfid_thread.join(timeout=1)  # Ensure the thread fully stops
+        # Closing the reader detaches the port from the serial engine, so it is free on return.
+        ThreadSupervisor.instance().stop_owner(self)
+        self.rfid_thread = None
 
         if self.rfid_reader:
             try:
-                print("🔌 Closing serial connection...")
+                log.debug("Closing serial connection")
                 self.rfid_reader.stop()
                 self.rfid_reader = None
             except Exception as e:
                 self.raise_warning("Failed to close the serial port properly.")
-                print(f"⚠️ Error closing serial port: {e}")
-
+                log.warning("Error closing serial port: %s", e)
 
-        time.sleep(0.5)  # Allow OS to release the port
         self.set_reader_status("Stopped listening.")
         self._set_scanning_state(False)
 
     def _switch_to_hid_fallback(self, reason=""):
         """Stop serial reading and switch to HID fallback mode."""
         if reason:
-            print(f"⚠️ {reason} Switching to HID fallback.")
+            log.warning("%s Switching to HID fallback.", reason)
 
         if reason:
             self.set_reader_status(f"{reason} HID fallback active.")
@@ -638,8 +655,7 @@ class MapRFIDPage(MouserPage):# pylint: disable= undefined-variable
         self.parent.focus_force()
         self.set_reader_status("Scan tag")
         if show_flash:
-            FlashOverlay(
-                parent=self,
+            self.flash_overlay.show(
                 message="HID Fallback Active: Scan tag then press Enter",
                 duration=2000,
                 bg_color="#FDE68A",
@@ -661,19 +677,22 @@ class MapRFIDPage(MouserPage):# pylint: disable= undefined-variable
         clean_rfid = clean_rfid.strip()
 
         if not clean_rfid:
-            print("⚠️ Empty or invalid RFID detected, skipping...")
+            log.debug("Empty or invalid RFID detected, skipping")
             return
 
+        self._scan_metric.inc()
         now = time.monotonic()
         if clean_rfid == self._recent_tag and (now - self._recent_tag_time) < 0.35:
+            self._duplicate_metric.inc()
             return
         self._recent_tag = clean_rfid
         self._recent_tag_time = now
         self.set_reader_status(f"Tag detected: {clean_rfid}")
 
-        if clean_rfid in self.animal_rfid_list:
-            print(f"⚠️ RFID {clean_rfid} is already in use! Skipping...")
-            AudioManager.play(ERROR_SOUND)
+        if self.mapping_session.is_used(clean_rfid):
+            log.info("RFID %s is already in use, skipping", clean_rfid)
+            self._already_mapped_metric.inc()
+            AudioManager.play(ERROR_SOUND, preempt=True)
             self.raise_warning("This RFID tag has already been mapped to an animal")
             return
 
@@ -689,30 +708,56 @@ class MapRFIDPage(MouserPage):# pylint: disable= undefined-variable
         )
         if confirm.get() == "Yes":
             self.set_reader_status("Simulating RFID mapping...")
-            total_needed = self.db.get_total_number_animals()
-            current_count = len(self.db.get_animals())
+            log.info("Simulating RFIDs: %d mapped, %d total needed",
+                     self.mapping_session.mapped, self.mapping_session.total)
 
-            print(f"Simulating RFIDs: {current_count} mapped, {total_needed} total needed")
-
-            if current_count >= total_needed:
+            if self.mapping_session.is_full():
                 self.raise_warning()
                 return
 
-            while current_count < total_needed:
-                previous_count = current_count
-                self.add_random_rfid()
-                current_count = len(self.db.get_animals())
-                if current_count == previous_count:
-                    self.raise_warning("Unable to map remaining animals. Check group capacity and serial setup.")
-                    break
-                # Force UI update
-                self.update()
-                self.scroll_to_latest_entry()
-
-            self.save()
+            tags = set()
+            while len(tags) < self.mapping_session.remaining():
+                rfid = str(get_random_rfid())
+                if not self.mapping_session.is_used(rfid):
+                    tags.add(rfid)
+
+            if self.map_tags(sorted(tags)):
+                AudioManager.play(SUCCESS_SOUND)
+                self.set_reader_status("Simulation complete.")
+
+    def import_rfid_manifest(self):
+        '''Maps every tag of a vendor manifest CSV (animal_id,rfid or one tag per line) at once.'''
+        path = filedialog.askopenfilename(
+            title="Select RFID tag manifest",
+            filetypes=[("CSV files", "*.csv"), ("Text files", "*.txt"), ("All files", "*.*")],
+        )
+        if not path:
+            return
+        try:
+            entries = read_rfid_manifest(path)
+        except (OSError, UnicodeDecodeError, MappingError) as e:
+            self.raise_warning(f"Could not read manifest: {e}")
+            return
+        mapped = self.map_tags(entries)
+        if mapped:
             AudioManager.play(SUCCESS_SOUND)
-            self.set_reader_status("Simulation complete.")
-            self._refresh_summary_cards()
+            self.set_reader_status(f"Imported {mapped} RFID mapping(s).")
+
+    def map_tags(self, entries):
+        '''Maps a batch of tags in one transaction and redraws the table once; returns how many were mapped.'''
+        self._cancel_flush_job()
+        try:
+            mapped = self.mapping_session.add_many(entries)
+        except MappingError as e:
+            self.raise_warning(str(e))
+            return 0
+        if not mapped:
+            return 0
+        self.animal_rfid_list.extend(rfid for _animal_id, rfid, _group_id in mapped)
+        self.save()
+        self.update()
+        self._refresh_summary_cards()
+        return len(mapped)
 
 
     def scroll_to_latest_entry(self):
@@ -729,14 +774,13 @@ class MapRFIDPage(MouserPage):# pylint: disable= undefined-variable
 
     def add_random_rfid(self):
         '''Adds a random rfid value to the next animal.'''
-        active_animals = len(self.db.get_animals())
-        if active_animals >= self.db.get_total_number_animals():
+        if self.mapping_session.is_full():
             self.raise_warning()
             return
 
         # Generate a unique RFID
         rfid = get_random_rfid()
-        while str(rfid) in [str(existing) for existing in self.animal_rfid_list]:
+        while self.mapping_session.is_used(rfid):
             rfid = get_random_rfid()
 
         self._add_rfid_mapping(rfid, play_audio=False)
@@ -745,11 +789,10 @@ class MapRFIDPage(MouserPage):# pylint: disable= undefined-variable
     def add_value(self, rfid):
         """Adds RFID to the table, similar to add_random_rfid but with a provided RFID."""
         if rfid is None or rfid == "":
-            print("🚫 Skipping None/Empty RFID value... No entry will be added.")
+            log.debug("Skipping empty RFID value")
             return
 
-        active_animals = len(self.db.get_animals())
-        if active_animals >= self.db.get_total_number_animals():
+        if self.mapping_session.is_full():
             self.raise_warning()
             return
 
@@ -757,19 +800,17 @@ class MapRFIDPage(MouserPage):# pylint: disable= undefined-variable
         if not added:
             return
 
-        total_scanned = len(self.db.get_animals())
-        total_expected = self.db.get_total_number_animals()
-        print(f"✅ Scanned: {total_scanned} / Expected: {total_expected}")
+        total_scanned = self.mapping_session.mapped
+        total_expected = self.mapping_session.total
+        log.debug("Scanned: %d / Expected: %d", total_scanned, total_expected)
 
-        # Save changes
-        self.save()
+        # Save changes (batched; the last tag flushes at once)
+        self._schedule_flush()
 
         # If we haven't scanned all animals yet, restart serial listening.
         # HID fallback stays active and keeps listening without restart.
         if total_scanned < total_expected:
-            print("⌨️ Waiting for next tag...")
-            FlashOverlay(
-                parent=self,
+            self.flash_overlay.show(
                 message="Scan Successful!",
                 duration=1000,
                 bg_color="#00FF00", #Bright Green
@@ -777,12 +818,9 @@ class MapRFIDPage(MouserPage):# pylint: disable= undefined-variable
             )
             return
         else:
-            print("🎉 All animals have been mapped to RFIDs! RFID scanning completed.")
-            print("RFIDs scanned: ", self.db.get_all_animals_rfid())
-            self.save()
+            log.info("All animals have been mapped to RFIDs")
             AudioManager.play(SUCCESS_SOUND)
-            FlashOverlay(
-                parent=self,
+            self.flash_overlay.show(
                 message="Scan successful! All RFIDs scanned.",
                 duration=4000,
                 bg_color="#00FF00", # Green to keep success feedback consistent
@@ -791,18 +829,12 @@ class MapRFIDPage(MouserPage):# pylint: disable= undefined-variable
 
     def _add_rfid_mapping(self, rfid, play_audio=True):
         """Insert RFID mapping into database and table. Returns True on success."""
-        animal_id = self.get_next_animal()
-        group_id = self.db.find_next_available_group()
-        if group_id is None:
-            self.raise_warning("No available group slot. Check group capacity.")
-            return False
-
-        inserted_id = self.db.add_animal(animal_id, rfid, group_id, '')
-        if inserted_id is None:
-            self.raise_warning("Failed to map RFID. Please try again.")
+        try:
+            animal_id, _group_id = self.mapping_session.add(rfid)
+        except MappingError as e:
+            self.raise_warning(str(e))
             return False
 
-        self.db._conn.commit()
         row_index = len(self.table.get_children())
         row_tag = "even_row" if row_index % 2 == 0 else "odd_row"
         self.table.insert('', END, values=(animal_id, rfid), tags=("text_font", row_tag))
@@ -819,7 +851,7 @@ class MapRFIDPage(MouserPage):# pylint: disable= undefined-variable
 
     def item_selected(self, _):
         selected = self.table.selection()
-        print("Selection ", selected, " changed.")
+        log.debug("Selection %s changed", selected)
 
         enable_button = len(selected) > 0
         self._set_button_enabled(self.delete_button, enable_button)
@@ -834,6 +866,7 @@ class MapRFIDPage(MouserPage):# pylint: disable= undefined-variable
             self.raise_warning("No item selected. Please select an item to remove.")
             return
 
+        self.flush_mappings()
         for item in selected_items:
             item_id = int(self.table.item(item, 'values')[0])
             rfid_value = self.table.item(item, 'values')[1]
@@ -843,9 +876,10 @@ class MapRFIDPage(MouserPage):# pylint: disable= undefined-variable
             self.animals = [(index, tag) for (index, tag) in self.animals if index != item_id]
             if rfid_value in self.animal_rfid_list:
                 self.animal_rfid_list.remove(rfid_value)
-            print("Total number of animal rows in the table:", len(self.table.get_children()))
+            log.debug("Removed animal %s", item_id)
 
         self.save()
+        self.mapping_session.reload()
         self.change_entry_text()
         self.set_reader_status("Removed selected mapping(s).")
         self._refresh_summary_cards()
@@ -863,16 +897,37 @@ class MapRFIDPage(MouserPage):# pylint: disable= undefined-variable
 
     def get_next_animal(self):
         '''returns the next animal in our experiment.'''
-        total_animals = self.db.get_total_number_animals()
-        # Get list of existing ACTIVE animal IDs from the database
-        existing_animal_ids = self.db.get_all_animals()
+        return self.mapping_session.next_animal_id()
+
+    def _schedule_flush(self):
+        '''Flushes now every FLUSH_EVERY tags (or when all are mapped), else after a quiet period.'''
+        if self.mapping_session.flush_due() or self.mapping_session.is_full():
+            self.flush_mappings()
+            return
+        self._cancel_flush_job()
+        self._flush_job = self.after(FLUSH_DELAY_MS, self.flush_mappings)
 
-        # Find the first gap in the sequence
-        for animal_id in range(1, total_animals + 1):
-            if animal_id not in existing_animal_ids:
-                return animal_id
+    def _cancel_flush_job(self):
+        if self._flush_job is not None:
+            try:
+                self.after_cancel(self._flush_job)
+            except Exception:  # pylint: disable=broad-exception-caught
+                pass
+            self._flush_job = None
 
-        return total_animals + 1
+    def flush_mappings(self):
+        '''Writes pending mappings and saves the experiment file once; returns how many were flushed.'''
+        self._cancel_flush_job()
+        try:
+            return self.mapping_session.flush()
+        except MappingError as e:
+            log.exception("Could not save pending RFID mappings")
+            # The session reloaded from the database; redraw so the table matches it.
+            self._render_table()
+            self.change_entry_text()
+            self._refresh_summary_cards()
+            self.raise_warning(str(e))
+            return 0
 
     def open_serial_port_selection(self):
         '''Opens serial port selection.'''
@@ -882,37 +937,21 @@ class MapRFIDPage(MouserPage):# pylint: disable= undefined-variable
     def raise_warning(self, warning_message = 'Maximum number of animals reached'):
         '''Show warning as non-blocking overlay only (no modal dialog).'''
         self.set_reader_status(str(warning_message))
-        FlashOverlay(
-            parent=self,
+        self.flash_overlay.show(
             message=warning_message,
             duration=2000,
             bg_color="red",
             text_color="black"
         )
-        AudioManager.play(ERROR_SOUND)
+        AudioManager.play(ERROR_SOUND, preempt=True)
 
     def update(self):
         """Updates the table view to match the database state."""
-        # Clear existing table entries
-        for item in self.table.get_children():
-            self.table.delete(item)
-
-        # Clear existing animals list
-        self.animals.clear()
-
-        # Fetch all active animals from database
-        animals_setup = self.db.get_all_animal_ids()
-
-        # Rebuild table with fresh data
-        for row_index, animal in enumerate(animals_setup):
-            rfid = self.db.get_animal_rfid(animal)
-            value = (int(animal), rfid)
-            row_tag = "even_row" if row_index % 2 == 0 else "odd_row"
-            self.table.insert('', END, values=value, tags=("text_font", row_tag))
-            self.animals.append(value)
+        self.mapping_session.reload()
+        self._render_table()
 
         # Update the animal ID entry text
-        if animals_setup:
+        if self.animals:
             self.animal_id_entry_text.set(str(self.get_next_animal()))
         else:
             self.animal_id_entry_text.set("1")
@@ -920,6 +959,14 @@ class MapRFIDPage(MouserPage):# pylint: disable= undefined-variable
         # Scroll to show the latest entry
         self.scroll_to_latest_entry()
 
+    def _render_table(self):
+        '''Redraws the table from one query of the active mappings.'''
+        self.table.delete(*self.table.get_children())
+        self.animals = [(int(animal_id), rfid) for animal_id, rfid in self.db.get_rfid_mappings()]
+        for row_index, value in enumerate(self.animals):
+            row_tag = "even_row" if row_index % 2 == 0 else "odd_row"
+            self.table.insert('', END, values=value, tags=("text_font", row_tag))
+
     def press_back_to_menu_button(self):
         '''Handles back to menu button press.'''
         try:
@@ -928,7 +975,11 @@ class MapRFIDPage(MouserPage):# pylint: disable= undefined-variable
             if self.db is None or getattr(self.db, "_c", None) is None or getattr(self.db, "_conn", None) is None:
                 reopen_path = self.file_path or getattr(self.db, "db_file", None) or ":memory:"
                 self.db = ExperimentDatabase(reopen_path)
+                self.mapping_session.db = self.db
+                self.mapping_session.reload()
 
+            # Pending mappings are only in memory until flushed.
+            flushed = self.flush_mappings()
             if len(self.db.get_all_animals_rfid()) != self.db.get_total_number_animals():
                 self.raise_warning('Not all animals have been mapped to RFIDs')
                 return
@@ -936,7 +987,8 @@ class MapRFIDPage(MouserPage):# pylint: disable= undefined-variable
             # Close threads first
             self.stop_listening()
             # Save database state to permanent file
-            self.save()
+            if not flushed:
+                self.save()
 
             # Do not close the experiment database here: `ExperimentMenuUI` holds a reference to
             # the shared singleton instance, and closing it would invalidate that reference.
@@ -953,9 +1005,7 @@ class MapRFIDPage(MouserPage):# pylint: disable= undefined-variable
 
         except Exception as e:
             self.raise_warning("An error occurred while saving or cleaning up.")
-            print(f"Error during save and cleanup: {e}")
-            import traceback
-            print(f"Full traceback: {traceback.format_exc()}")
+            log.exception("Error during save and cleanup: %s", e)
 
 
 
@@ -963,6 +1013,22 @@ class MapRFIDPage(MouserPage):# pylint: disable= undefined-variable
         '''Raise the frame for this UI'''
         super().raise_frame()
 
+    def refresh(self):
+        '''Reloads the RFID table from the database.'''
+        self.update()
+        return True
+
+    def teardown(self):
+        '''Stops the serial and HID listeners before destroying the page.'''
+        if self.rfid_thread is not None:
+            self.stop_listening()
+        self._stop_hid_listener()
+        if self.mapping_session.pending:
+            self.flush_mappings()
+        else:
+            self._cancel_flush_job()
+        super().teardown()
+
     def save(self):
         '''Saves current database state to permanent file'''
         try:
@@ -971,23 +1037,21 @@ class MapRFIDPage(MouserPage):# pylint: disable= undefined-variable
 
             # Ensure all changes are committed
             self.db._conn.commit()
-            print("Changes committed")
 
             # Save back to original file location
-            print(f"Saving {current_file} to {self.file_path}")
-            file_utils.save_temp_to_file(current_file, self.file_path)
-            try:
-                from ui.commands import save_file  # pylint: disable=import-outside-toplevel
-                save_file()
-            except Exception as save_exc:
-                print(f"Could not run global save_file() hook: {save_exc}")
-            print("Save successful!")
+            log.debug("Saving %s to %s", current_file, self.file_path)
+            with self._autosave_metric.time():
+                file_utils.save_temp_to_file(current_file, self.file_path)
+                try:
+                    from ui.commands import save_file  # pylint: disable=import-outside-toplevel
+                    save_file()
+                except Exception as save_exc:
+                    log.warning("Could not run global save_file() hook: %s", save_exc)
+            log.debug("Save successful")
 
         except Exception as e:
             self.raise_warning("An error occurred while saving or cleaning up.")
-            print(f"Error during save and cleanup: {e}")
-            import traceback
-            print(f"Full traceback: {traceback.format_exc()}")
+            log.exception("Error during save and cleanup: %s", e)
 
     def sacrifice_selected_items(self):
         '''Decreases the maximum number of animals in the experiment by 1'''
@@ -997,6 +1061,7 @@ class MapRFIDPage(MouserPage):# pylint: disable= undefined-variable
             self.raise_warning("No items selected. Please select animals to sacrifice.")
             return
 
+        self.flush_mappings()
         # First mark the selected animals as inactive
         for item in selected_items:
             animal_id = int(self.table.item(item, 'values')[0])
@@ -1023,6 +1088,7 @@ class MapRFIDPage(MouserPage):# pylint: disable= undefined-variable
 
         # Lastly, commit and save changes (After all animals sacrificed)
         self.save()
+        self.mapping_session.reload()
         self.change_entry_text()
         self.set_reader_status("Updated sacrificed animal selection.")
         self._refresh_summary_cards()
@@ -1123,59 +1189,36 @@ class SerialSimulator():
         self.parent = parent
         self.serial_controller = SerialPortController()
         self.written_port = None
-        self.socat_process = None
+        self.virtual_pair = None
         self.dynamic_virtual_ports = []
 
     def _current_virtual_ports(self):
-        """Return discovered virtual ports, including runtime-created socat ports."""
+        """Return discovered virtual ports, including runtime-created virtual pairs."""
         ports = self.dynamic_virtual_ports if self.dynamic_virtual_ports else self.serial_controller.get_virtual_port()
         # Keep order stable and unique
         return list(dict.fromkeys(ports))
 
-    def _start_socat_pair(self):
-        """Create a PTY pair using socat on macOS/Linux and return two device paths."""
+    def _start_virtual_pair(self):
+        """Create a linked PTY pair in-process on macOS/Linux and return the two device paths."""
         if platform.system() == "Windows":
             return []
-        if shutil.which("socat") is None:
-            return []
-
         try:
-            self.socat_process = subprocess.Popen(
-                ["socat", "-d", "-d", "pty,raw,echo=0", "pty,raw,echo=0"],
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.PIPE,
-                text=True
-            )
-            ports = []
-            for _ in range(20):
-                if self.socat_process.stderr is None:
-                    break
-                line = self.socat_process.stderr.readline()
-                if not line:
-                    continue
-                match = re.search(r"/dev/\S+", line)
-                if match:
-                    port = match.group(0)
-                    if port not in ports:
-                        ports.append(port)
-                if len(ports) >= 2:
-                    self.dynamic_virtual_ports = ports[:2]
-                    return self.dynamic_virtual_ports
+            self.virtual_pair = VirtualSerialPair().start()
+            self.dynamic_virtual_ports = self.virtual_pair.ports()
+            return self.dynamic_virtual_ports
         except Exception as e:
-            print(f"Failed to start socat PTY pair: {e}")
-
-        # Cleanup on partial failure
-        self._stop_socat_pair()
+            print(f"Failed to create virtual serial pair: {e}")
+        self._stop_virtual_pair()
         return []
 
-    def _stop_socat_pair(self):
-        """Terminate socat process if we started one."""
-        if self.socat_process:
+    def _stop_virtual_pair(self):
+        """Close the virtual pair if we created one."""
+        if self.virtual_pair:
             try:
-                self.socat_process.terminate()
+                self.virtual_pair.stop()
             except Exception:
                 pass
-            self.socat_process = None
+            self.virtual_pair = None
 
     def open(self):
 
@@ -1191,11 +1234,11 @@ class SerialSimulator():
                     option_2="Create"
                 )
                 if warning.get() == "Create":
-                    virtual_ports = self._start_socat_pair()
+                    virtual_ports = self._start_virtual_pair()
                     if len(virtual_ports) < 2:
                         CTkMessagebox(
                             title="Error",
-                            message="Unable to create virtual ports. Install socat and try again.",
+                            message="Unable to create virtual ports.",
                             icon="cancel"
                         )
                         return
@@ -1296,13 +1339,11 @@ class SerialSimulator():
         '''Opens download lint in webbrowser.'''
         if platform.system() == "Windows":
             webbrowser.open("https://softradar.com/com0com/")
-        else:
-            webbrowser.open("https://man7.org/linux/man-pages/man1/socat.1.html")
 
     def on_closing(self):
         '''Closes all ports and closes the window.'''
         self.serial_controller.close_all_port()
-        self._stop_socat_pair()
+        self._stop_virtual_pair()
         self.dynamic_virtual_ports = []
         self.written_port = None
         self.root.destroy()
@@ -1337,6 +1378,6 @@ class SerialSimulator():
         ok_button = CTkButton(message, text="OK", width=10, command=dismiss_warning)
         ok_button.grid(row=2, column=0, padx=10, pady=10)
 
-        AudioManager.play(ERROR_SOUND)
+        AudioManager.play(ERROR_SOUND, preempt=True)
 
         message.mainloop()
@@ -1,7 +1,7 @@
 """
 Review Experiment Summary UI (UI refresh only).
 
-- Keeps the same data/DB calls and behavior
+- Reads the whole summary with one get_experiment_summary() query
 - Updates layout to match the newer Mouser pages (header + card styling)
 - Light/dark adaptive colors via CustomTkinter appearance mode
 """
@@ -99,32 +99,21 @@ class ReviewUI(MouserPage):  # pylint: disable=too-few-public-methods
         scrollable.place(relx=0.5, rely=0.0, y=150, anchor="n", relwidth=0.60, relheight=0.70)
         scrollable.grid_columnconfigure(0, weight=1)
 
-        investigators_row = self.database._c.execute(  # pylint: disable=protected-access
-            "SELECT investigators FROM experiment"
-        ).fetchone()
-        if investigators_row:
-            investigators_value = "\n".join(investigators_row[0].split(","))
-        else:
-            investigators_value = "N/A"
-
-        groups = self.database.get_groups()
+        # All settings come from one read of the experiment row.
+        summary = self.database.get_experiment_summary()
+        investigators = summary.get("investigators") or []
         data = [
-            ("Experiment Name", self.database.get_experiment_name()),
-            ("Investigators", investigators_value),
-            (
-                "Species",
-                self.database._c.execute(  # pylint: disable=protected-access
-                    "SELECT species FROM experiment"
-                ).fetchone()[0],
-            ),
-            ("Measurement Item", self.database.get_measurement_name()),
-            ("Number of Animals", str(self.database.get_total_number_animals())),
-            ("Animals per Group", str(self.database.get_cage_capacity(1))),
-            ("Group Names", groups),
-            ("Uses RFID", "Yes" if self.database.experiment_uses_rfid() else "No"),
+            ("Experiment Name", summary.get("name")),
+            ("Investigators", "\n".join(investigators) if investigators else "N/A"),
+            ("Species", summary.get("species")),
+            ("Measurement Item", summary.get("measurement")),
+            ("Number of Animals", str(summary.get("num_animals", 0))),
+            ("Animals per Group", str(summary.get("cage_capacity"))),
+            ("Group Names", summary.get("groups", [])),
+            ("Uses RFID", "Yes" if summary.get("uses_rfid") else "No"),
             (
                 "Measurement Type",
-                "Automatic" if self.database.get_measurement_type() == 1 else "Manual",
+                "Automatic" if summary.get("measurement_type") == 1 else "Manual",
             ),
         ]
 
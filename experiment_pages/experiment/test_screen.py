@@ -4,18 +4,24 @@ Modernized Test Screen UI.
 - Redesigned layout using clean section cards and uniform typography
 - Preserves full functionality for RFID and Serial device testing
 - Uses threading-safe updates for live reading display
+- "Measure" runs a timed link test (frames/s, jitter, parse failures, RTT, drops)
 - Consistent blue accent theme and adaptive light/dark background
 """
 
 import time
-import threading
 import tkinter
 from customtkinter import (
-    CTkToplevel, CTkFrame, CTkLabel, CTkButton, CTkFont, set_appearance_mode
+    CTkToplevel, CTkFrame, CTkLabel, CTkButton, CTkFont, CTkOptionMenu, StringVar, set_appearance_mode
 )
 from shared.serial_handler import SerialDataHandler
 from shared.serial_port_controller import SerialPortController
 from shared.hid_wedge import HIDWedgeListener
+from shared.ui_dispatcher import UIDispatcher
+from shared.thread_supervisor import ThreadSupervisor
+from shared.link_test import LINK_TEST_SECONDS, format_link_report, measure_link
+
+# Link test lengths offered next to each Measure button.
+LINK_TEST_DURATIONS = ("5 s", "10 s", "30 s", "60 s")
 
 
 class TestScreen(CTkToplevel):
@@ -26,22 +32,24 @@ class TestScreen(CTkToplevel):
 
         self.title("Device Test Console")
 
-        # --- Window Configuration (700x500) ---
-        self.geometry("700x500")
-        self.minsize(700, 500)
+        # --- Window Configuration (700x600) ---
+        self.geometry("700x600")
+        self.minsize(700, 600)
         self.configure(fg_color=("white", "#18181b"))
         set_appearance_mode("System")
 
         # Center window on screen for Windows & Linux
         self.update_idletasks()
         sw, sh = self.winfo_screenwidth(), self.winfo_screenheight()
-        x, y = max((sw - 700) // 2, 0), max((sh - 500) // 2, 0)
-        self.geometry(f"700x500+{x}+{y}")
+        x, y = max((sw - 700) // 2, 0), max((sh - 600) // 2, 0)
+        self.geometry(f"700x600+{x}+{y}")
 
         self.reading_labels = {}
         self.hid_listener = None
         self.hid_status_key = None
         self._is_closing = False
+        # Reader threads hand label updates to the main thread through this queue.
+        self.dispatcher = UIDispatcher.for_widget(self)
 
         # --- Fonts (cross-platform safe) ---
         default_family = ("Segoe UI", "Inter", "DejaVu Sans", "Sans Serif")
@@ -75,10 +83,14 @@ class TestScreen(CTkToplevel):
 
     def _configured_port_for(self, setting_type):
         """Return configured COM/tty port name for a setting type, else None."""
+        controller = self._port_settings_for(setting_type)
+        # retrieve_setting stores the configured serial port in reader_port.
+        return controller.reader_port if controller else None
+
+    def _port_settings_for(self, setting_type):
+        """Return the SerialPortController holding a setting type's port settings, else None."""
         try:
-            controller = SerialPortController(setting_type)
-            # retrieve_setting stores the configured serial port in reader_port.
-            return controller.reader_port
+            return SerialPortController(setting_type)
         except Exception:
             return None
 
@@ -153,10 +165,33 @@ class TestScreen(CTkToplevel):
             command=lambda: self._run_test(device_type, com_port, status_key)
         ).grid(row=0, column=1, padx=10, pady=5)
 
+        # Link measurement length and button
+        duration = StringVar(value=f"{LINK_TEST_SECONDS:.0f} s")
+        CTkOptionMenu(
+            row_frame,
+            values=list(LINK_TEST_DURATIONS),
+            variable=duration,
+            width=90,
+            height=32,
+            font=self.body_font,
+        ).grid(row=1, column=0, sticky="e", padx=10, pady=(0, 8))
+        CTkButton(
+            row_frame,
+            text="Measure",
+            width=180,
+            height=32,
+            corner_radius=10,
+            fg_color="#475569",
+            hover_color="#334155",
+            font=self.body_font,
+            text_color="white",
+            command=lambda: self._run_link_test(device_type, status_key, float(duration.get().split()[0]))
+        ).grid(row=1, column=1, padx=10, pady=(0, 8))
+
         # Status label
         status = CTkLabel(row_frame, text="Waiting...", font=self.body_font,
-                          text_color=("#6b7280", "#a1a1aa"))
-        status.grid(row=0, column=2, sticky="e", padx=10, pady=5)
+                          text_color=("#6b7280", "#a1a1aa"), justify="left", wraplength=240)
+        status.grid(row=0, column=2, rowspan=2, sticky="e", padx=10, pady=5)
         self.reading_labels[status_key] = status
 
     # --- Core Logic (unchanged functionality) ---
@@ -176,34 +211,59 @@ class TestScreen(CTkToplevel):
                 self._update_status(status_key, "Port unavailable/config mismatch")
             return
 
-        threading.Thread(target=data_handler.start, daemon=True).start()
-
-        def check_for_data():
-            retries = 20
-            while retries > 0:
-                if self._is_closing or not self.winfo_exists():
-                    data_handler.stop()
-                    return
-                time.sleep(0.5)
-                if data_handler.received_data:
-                    received_data = data_handler.get_stored_data()
-                    if not self._is_closing and self.winfo_exists():
-                        self.after(0, lambda: self._update_status(status_key, received_data))
-                    data_handler.stop()
-                    return
-                retries -= 1
-            data_handler.stop()
+        def check_for_data(worker):
+            # Frames wake the worker as they arrive; it gives up after 10 seconds.
+            deadline = time.monotonic() + 10.0
+            try:
+                while worker.wait(timeout=max(0.0, deadline - time.monotonic())):
+                    if data_handler.received_data:
+                        received_data = data_handler.get_stored_data()
+                        if not self._is_closing:
+                            self.dispatcher.post(self._update_status, status_key, received_data)
+                        return
+                    if time.monotonic() >= deadline:
+                        break
+            finally:
+                data_handler.stop()
+            if worker.stopping or self._is_closing:
+                return
             if device_type == "rfid":
                 # Some RFID readers present as keyboard-wedge HID even when a COM port exists.
-                if not self._is_closing and self.winfo_exists():
-                    self.after(0, lambda: self._update_status(
-                        status_key, "No serial data; switching to HID fallback..."
-                    ))
-                    self.after(0, lambda: self._start_hid_fallback(status_key))
-            elif not self._is_closing and self.winfo_exists():
-                self.after(0, lambda: self._update_status(status_key, "No data received"))
+                self.dispatcher.post(self._update_status, status_key, "No serial data; switching to HID fallback...")
+                self.dispatcher.post(self._start_hid_fallback, status_key)
+            else:
+                self.dispatcher.post(self._update_status, status_key, "No data received")
 
-        threading.Thread(target=check_for_data, daemon=True).start()
+        worker = ThreadSupervisor.instance().spawn(
+            f"test-screen-{status_key}", check_for_data, owner=self, closers=[data_handler.stop]
+        )
+        data_handler.on_data = lambda _data: worker.wake()
+        data_handler.start()
+        worker.wake()
+
+    def _run_link_test(self, device_type, status_key, seconds=LINK_TEST_SECONDS):
+        """Measures the configured port's throughput, jitter, parse failures, RTT and drops for seconds."""
+        controller = self._port_settings_for("reader" if device_type == "rfid" else "device")
+        port = controller.reader_port if controller else None
+        if not port:
+            self._update_status(status_key, "Port unavailable/config mismatch")
+            return
+        self._update_status(status_key, f"Measuring {port} for {seconds:.0f} s...")
+
+        def measure(worker):
+            try:
+                result = measure_link(
+                    port, driver=controller.driver_name, framing=controller.framing,
+                    seconds=seconds, periodic=device_type != "rfid",
+                    stop_event=worker.stop_event, baudrate=controller.baud_rate,
+                    bytesize=controller.byte_size, parity=controller.parity, stopbits=controller.stop_bits)
+                message = format_link_report(result)
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                message = f"Link test failed: {e}"
+            if not worker.stopping and not self._is_closing:
+                self.dispatcher.post(self._update_status, status_key, message)
+
+        ThreadSupervisor.instance().spawn(f"link-test-{status_key}", measure, owner=self)
 
     def _update_status(self, status_key, message):
         """Safely update label from background thread."""
@@ -237,6 +297,7 @@ class TestScreen(CTkToplevel):
     def _on_close(self):
         """Cleanup listeners on window close."""
         self._is_closing = True
+        ThreadSupervisor.instance().stop_owner(self)
         if self.hid_listener:
             self.hid_listener.stop()
             self.hid_listener = None
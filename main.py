@@ -23,9 +23,17 @@ sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
 
 from shared.tk_models import MouserPage, raise_frame  # pylint: disable=wrong-import-position
 from shared.serial_port_controller import SerialPortController  # pylint: disable=wrong-import-position
+from shared.serial_engine import shutdown_serial_engine  # pylint: disable=wrong-import-position
+from shared.thread_supervisor import shutdown_threads  # pylint: disable=wrong-import-position
+from shared.app_logging import configure_logging, shutdown_logging  # pylint: disable=wrong-import-position
+from shared.serial_capture import start_capture, stop_capture  # pylint: disable=wrong-import-position
+from shared.audio import AudioManager  # pylint: disable=wrong-import-position
+from shared.file_utils import SUCCESS_SOUND, ERROR_SOUND  # pylint: disable=wrong-import-position
 from ui.root_window import create_root_window  # pylint: disable=wrong-import-position
 from ui.menu_bar import build_menu  # pylint: disable=wrong-import-position
 from ui.welcome_screen import setup_welcome_screen  # pylint: disable=wrong-import-position
+from experiment_pages.experiment.experiment_menu_ui import ExperimentMenuUI  # pylint: disable=wrong-import-position
+from databases.mapping_session import flush_all_sessions  # pylint: disable=wrong-import-position
 
 
 # Global app variables
@@ -34,11 +42,22 @@ TEMP_FILE_PATH = None
 CURRENT_FILE_PATH = None
 PASSWORD = None
 
+# Log records are written by a background listener (levels via MOUSER_LOG_LEVEL / MOUSER_LOG_LEVELS)
+configure_logging()
+
 # Clear any old Temp folders
 temp_folder_path = os.path.join(tempfile.gettempdir(), TEMP_FOLDER_NAME)
 if os.path.exists(temp_folder_path):
     shutil.rmtree(temp_folder_path)
 
+# Optional raw serial capture for reproducing field issues (replay with `python -m shared.serial_capture`)
+SERIAL_CAPTURE_PATH = os.environ.get("MOUSER_SERIAL_CAPTURE")
+if SERIAL_CAPTURE_PATH:
+    start_capture(SERIAL_CAPTURE_PATH)
+
+# Decode feedback sounds and open the audio stream before the first scan
+AudioManager.preload(SUCCESS_SOUND, ERROR_SOUND)
+
 # Create root window
 root = create_root_window()
 
@@ -70,5 +89,26 @@ root.grid_columnconfigure(0, weight=1)
 main_frame.grid_rowconfigure(1, weight=1)
 main_frame.grid_columnconfigure(0, weight=1)
 
+
+def on_close():
+    '''Tears down the open experiment's pages (flushing pending RFID mappings) before the window closes.'''
+    if ExperimentMenuUI._active_menu is not None:  # pylint: disable=protected-access
+        ExperimentMenuUI._active_menu.close_pages()  # pylint: disable=protected-access
+    flush_all_sessions()
+    root.destroy()
+
+
+root.protocol("WM_DELETE_WINDOW", on_close)
+
 # Start the main event loop
 root.mainloop()
+
+# Persist RFID mappings still pending if the loop ended without going through on_close().
+flush_all_sessions()
+
+# Stop every background worker together, then release any serial ports still attached to the shared I/O engine.
+shutdown_threads()
+shutdown_serial_engine()
+stop_capture()
+AudioManager.shutdown()
+shutdown_logging()
@@ -0,0 +1,131 @@
+'''Incremental activity log for a CTkTextbox.
+
+New lines are queued and appended to the end of the textbox once per UI tick
+(through the window's UIDispatcher); when the textbox holds more than
+max_lines, the oldest lines are deleted from the head. The cost of logging
+stays constant no matter how long the session runs.
+
+Optionally every line is also written to a rotating session file on disk
+(set file_path, or the MOUSER_ACTIVITY_LOG_DIR environment variable):
+
+    activity = ActivityLog(textbox, dispatcher, file_path=session_log_path("Experiment 1"))
+    activity.append("Started scanning.")
+'''
+import logging
+import logging.handlers
+import os
+import re
+import time
+from collections import deque
+
+log = logging.getLogger(__name__)
+
+# Lines kept in memory and on screen.
+MAX_LINES = 200
+# Rotating session file: size per file and number of rotated files kept.
+LOG_FILE_MAX_BYTES = 1_000_000
+LOG_FILE_BACKUPS = 5
+ACTIVITY_LOG_DIR_ENV = "MOUSER_ACTIVITY_LOG_DIR"
+
+
+def session_log_path(name, directory=None):
+    '''Returns the session file path for name in directory (or $MOUSER_ACTIVITY_LOG_DIR), or None.'''
+    directory = directory or os.environ.get(ACTIVITY_LOG_DIR_ENV)
+    if not directory:
+        return None
+    safe_name = re.sub(r"[^\w.-]+", "_", str(name or "session")).strip("_") or "session"
+    return os.path.join(directory, f"activity_{safe_name}_{time.strftime('%Y-%m-%d')}.log")
+
+
+class ActivityLog:
+    '''Append-only, head-trimmed activity log rendered in batches.'''
+
+    def __init__(self, textbox=None, dispatcher=None, max_lines=MAX_LINES, file_path=None,
+                 max_bytes=LOG_FILE_MAX_BYTES, backup_count=LOG_FILE_BACKUPS):
+        self.textbox = textbox
+        self.dispatcher = dispatcher
+        self.max_lines = max_lines
+        self.entries = deque(maxlen=max_lines)
+        self._pending = deque()
+        self._rendered_lines = 0
+        self.renders = 0
+        self.file_path = file_path
+        self._file_logger = None
+        self._file_handler = None
+        if file_path:
+            self._open_file(file_path, max_bytes, backup_count)
+
+    def _open_file(self, file_path, max_bytes, backup_count):
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(file_path)), exist_ok=True)
+            self._file_handler = logging.handlers.RotatingFileHandler(
+                file_path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8"
+            )
+            self._file_handler.setFormatter(logging.Formatter("%(asctime)s  %(message)s"))
+            # A private logger so session lines never reach the application's handlers.
+            self._file_logger = logging.Logger(f"mouser.activity.{id(self)}")
+            self._file_logger.addHandler(self._file_handler)
+        except OSError as e:
+            log.warning("Activity log file unavailable (%s): %s", file_path, e)
+            self._file_logger = None
+            self._file_handler = None
+
+    def attach(self, textbox, dispatcher):
+        '''Connects the textbox once it exists; lines logged before are shown on the next tick.'''
+        self.textbox = textbox
+        self.dispatcher = dispatcher
+        self._pending.extend(self.entries)
+        dispatcher.post(self.render, key=(self, "render"))
+
+    def append(self, message):
+        '''Adds one timestamped line (callable from any thread); returns the line or None.'''
+        try:
+            msg = str(message).strip()
+        except Exception:  # pylint: disable=broad-exception-caught
+            msg = ""
+        if not msg:
+            return None
+        line = f"{time.strftime('%H:%M:%S')}  {msg}"
+        self.entries.append(line)
+        if self._file_logger is not None:
+            self._file_logger.info(msg)
+        if self.textbox is not None:
+            self._pending.append(line)
+            if self.dispatcher is not None:
+                # A burst of lines is rendered once per UI tick.
+                self.dispatcher.post(self.render, key=(self, "render"))
+        return line
+
+    def render(self):
+        '''Appends queued lines to the textbox and trims the head (main thread).'''
+        lines = []
+        while self._pending:
+            lines.append(self._pending.popleft())
+        if not lines or self.textbox is None:
+            return
+        # Only the newest max_lines can ever be visible.
+        lines = lines[-self.max_lines:]
+        try:
+            if not self.textbox.winfo_exists():
+                return
+            self.textbox.configure(state="normal")
+            prefix = "\n" if self._rendered_lines else ""
+            self.textbox.insert("end", prefix + "\n".join(lines))
+            self._rendered_lines += len(lines)
+            excess = self._rendered_lines - self.max_lines
+            if excess > 0:
+                self.textbox.delete("1.0", f"{excess + 1}.0")
+                self._rendered_lines -= excess
+            self.textbox.see("end")
+            self.textbox.configure(state="disabled")
+            self.renders += 1
+        except Exception:  # pylint: disable=broad-exception-caught
+            log.exception("Error rendering activity log")
+
+    def close(self):
+        '''Closes the session file, if any.'''
+        if self._file_handler is not None:
+            self._file_logger.removeHandler(self._file_handler)
+            self._file_handler.close()
+            self._file_handler = None
+            self._file_logger = None
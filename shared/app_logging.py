@@ -0,0 +1,106 @@
+'''Application logging: leveled, per-module, and written off the calling thread.
+
+Modules log through the standard library instead of print():
+
+    log = logging.getLogger(__name__)
+    log.debug("RFID scanned: %s", tag)      # free when DEBUG is off (no formatting, no I/O)
+
+configure_logging() (called once from main.py) installs a QueueHandler on the
+root logger, so a log call only enqueues the record; a QueueListener thread
+formats it and writes to the console and, optionally, a rotating file.
+
+Environment overrides:
+    MOUSER_LOG_LEVEL   default level (e.g. DEBUG), WARNING if unset
+    MOUSER_LOG_LEVELS  per-module levels, e.g. "shared.serial_handler=DEBUG,databases=INFO"
+    MOUSER_LOG_DIR     directory for the rotating mouser.log file
+'''
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+
+DEFAULT_LEVEL = logging.WARNING
+LOG_FORMAT = "%(asctime)s %(levelname)-7s %(name)s: %(message)s"
+LOG_FILE_NAME = "mouser.log"
+# Rotating file: size per file and number of rotated files kept.
+LOG_FILE_MAX_BYTES = 2_000_000
+LOG_FILE_BACKUPS = 3
+LOG_LEVEL_ENV = "MOUSER_LOG_LEVEL"
+LOG_LEVELS_ENV = "MOUSER_LOG_LEVELS"
+LOG_DIR_ENV = "MOUSER_LOG_DIR"
+
+_listener = None
+_queue_handler = None
+
+
+def parse_levels(spec):
+    '''Parses "module=LEVEL,other=LEVEL" into {module: level}; malformed entries are ignored.'''
+    levels = {}
+    for item in (spec or "").split(","):
+        name, sep, level = item.partition("=")
+        name, level = name.strip(), level.strip().upper()
+        if sep and name and isinstance(logging.getLevelName(level), int):
+            levels[name] = logging.getLevelName(level)
+    return levels
+
+
+def _level(value, default=DEFAULT_LEVEL):
+    if isinstance(value, int):
+        return value
+    level = logging.getLevelName(str(value or "").strip().upper())
+    return level if isinstance(level, int) else default
+
+
+def configure_logging(level=None, levels=None, log_dir=None, console=True):
+    '''Routes all logging through a queue to console/file handlers on a listener thread.
+
+    Calling it again replaces the previous configuration. Returns the QueueListener.'''
+    global _listener, _queue_handler  # pylint: disable=global-statement
+    shutdown_logging()
+
+    formatter = logging.Formatter(LOG_FORMAT)
+    handlers = []
+    if console:
+        stream = logging.StreamHandler(sys.stderr)
+        stream.setFormatter(formatter)
+        handlers.append(stream)
+    log_dir = log_dir or os.environ.get(LOG_DIR_ENV)
+    if log_dir:
+        try:
+            os.makedirs(log_dir, exist_ok=True)
+            file_handler = logging.handlers.RotatingFileHandler(
+                os.path.join(log_dir, LOG_FILE_NAME), maxBytes=LOG_FILE_MAX_BYTES,
+                backupCount=LOG_FILE_BACKUPS, encoding="utf-8")
+            file_handler.setFormatter(formatter)
+            handlers.append(file_handler)
+        except OSError as e:
+            print(f"Log file unavailable in {log_dir}: {e}")
+
+    log_queue = queue.SimpleQueue()
+    _queue_handler = logging.handlers.QueueHandler(log_queue)
+    root = logging.getLogger()
+    root.addHandler(_queue_handler)
+    root.setLevel(_level(level if level is not None else os.environ.get(LOG_LEVEL_ENV)))
+
+    module_levels = parse_levels(os.environ.get(LOG_LEVELS_ENV))
+    module_levels.update(levels or {})
+    for name, module_level in module_levels.items():
+        logging.getLogger(name).setLevel(_level(module_level))
+
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+def shutdown_logging():
+    '''Stops the listener after writing every queued record (app exit).'''
+    global _listener, _queue_handler  # pylint: disable=global-statement
+    if _queue_handler is not None:
+        logging.getLogger().removeHandler(_queue_handler)
+        _queue_handler = None
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
@@ -1,78 +1,285 @@
 '''
 Module that contains methods and classes that are used for the audio in our program.
+
+Sounds are decoded once into 16-bit PCM at a common output format and played
+on a single output stream that a worker thread keeps open, so a beep does not
+pay for opening the WAV file or initializing the audio device:
+
+    AudioManager.preload(SUCCESS_SOUND, ERROR_SOUND)   # at startup
+    AudioManager.play(SUCCESS_SOUND)                   # queued behind the current sound
+    AudioManager.play(ERROR_SOUND, preempt=True)       # cuts the current sound off
 '''
-import wave
-from threading import Thread, Lock
+import logging
 import os
+import wave
+from array import array
+from collections import deque, namedtuple
+from threading import Condition, Lock, Thread
 
-class AudioManager:
-    '''
-    Contains the helper function play(String:filepath)
-    '''
-    _lock = Lock()
-    _is_playing = False 
+from shared.metrics import MetricsRegistry
 
-    @staticmethod
-    def __play(filepath): #pylint: disable= no-self-argument
-        chunk = 1024
-        audio_file = None
-        out_p = None
-        out_stream = None
-        try:
-            # Delay importing PyAudio so app startup does not hard-fail if the
-            # native extension is unavailable on a machine.
-            import pyaudio
+log = logging.getLogger(__name__)
 
-            # Ensure the file exists before opening
-            if not os.path.exists(filepath):
-                print(f"Error: Audio file {filepath} not found.")
-                return
+# Every clip is converted to this format so one stream can play all of them.
+OUTPUT_RATE = 48000
+OUTPUT_CHANNELS = 2
+OUTPUT_SAMPLE_WIDTH = 2
+# Frames written per stream write; bounds how long a preempting sound waits (~5 ms).
+WRITE_FRAMES = 256
+# Pending sounds kept while another one plays; older requests are dropped beyond this.
+QUEUE_LIMIT = 2
+
+AudioClip = namedtuple("AudioClip", ["path", "pcm", "frames"])
+
+
+def _to_int16(raw, sample_width):
+    '''Converts little-endian PCM samples of any common width to a signed 16-bit array.'''
+    if sample_width == 2:
+        samples = array("h")
+        samples.frombytes(raw)
+        return samples
+    if sample_width == 1:
+        # 8-bit WAV data is unsigned.
+        return array("h", ((b - 128) << 8 for b in raw))
+    # 24/32-bit: keep the two most significant bytes of each sample.
+    return array("h", (int.from_bytes(raw[i + sample_width - 2:i + sample_width], "little", signed=True)
+                       for i in range(0, len(raw), sample_width)))
+
+
+def _convert(samples, channels, rate):
+    '''Returns interleaved OUTPUT_CHANNELS samples resampled (linearly) to OUTPUT_RATE.'''
+    frames = len(samples) // channels
+    if channels == OUTPUT_CHANNELS:
+        source = [samples[c::channels][:frames] for c in range(channels)]
+    elif channels == 1:
+        source = [samples, samples]
+    else:
+        source = [samples[0::channels][:frames], samples[1::channels][:frames]]
+
+    if rate != OUTPUT_RATE and frames > 1:
+        out_frames = max(1, int(frames * OUTPUT_RATE / rate))
+        step = (frames - 1) / max(out_frames - 1, 1)
+        resampled = []
+        for channel in source:
+            out = array("h", bytes(2 * out_frames))
+            for i in range(out_frames):
+                pos = i * step
+                j = int(pos)
+                frac = pos - j
+                nxt = channel[j + 1] if j + 1 < frames else channel[j]
+                out[i] = int(channel[j] + (nxt - channel[j]) * frac)
+            resampled.append(out)
+        source, frames = resampled, out_frames
+
+    interleaved = array("h", bytes(2 * frames * OUTPUT_CHANNELS))
+    for c, channel in enumerate(source):
+        interleaved[c::OUTPUT_CHANNELS] = channel[:frames]
+    return interleaved, frames
+
+
+def decode_clip(filepath):
+    '''Reads a WAV file into an AudioClip in the output format.'''
+    with wave.open(filepath, "rb") as audio_file:
+        raw = audio_file.readframes(audio_file.getnframes())
+        samples = _to_int16(raw, audio_file.getsampwidth())
+        pcm, frames = _convert(samples, audio_file.getnchannels(), audio_file.getframerate())
+    return AudioClip(filepath, pcm.tobytes(), frames)
+
+
+def _open_pyaudio_stream():
+    '''Opens the persistent output stream; returns (stream, close_fn).'''
+    # Delay importing PyAudio so app startup does not hard-fail if the
+    # native extension is unavailable on a machine.
+    import pyaudio  # pylint: disable=import-outside-toplevel
+    out_p = pyaudio.PyAudio()
+    stream = out_p.open(
+        format=out_p.get_format_from_width(OUTPUT_SAMPLE_WIDTH),
+        channels=OUTPUT_CHANNELS,
+        rate=OUTPUT_RATE,
+        output=True,
+        frames_per_buffer=WRITE_FRAMES,
+    )
+
+    def close():
+        stream.stop_stream()
+        stream.close()
+        out_p.terminate()
+
+    return stream, close
 
-            with AudioManager._lock:
-                AudioManager._is_playing = True
-                audio_file = wave.open(filepath, "rb")
-                out_p = pyaudio.PyAudio()
 
-                out_stream = out_p.open(
-                    format=out_p.get_format_from_width(audio_file.getsampwidth()),
-                    channels=audio_file.getnchannels(),
-                    rate=audio_file.getframerate(),
-                    output=True
-                )
+class AudioEngine:
+    '''Worker thread owning one output stream and a short queue of clips to play.
 
-            print(f"Playing Audio: {filepath}")
-            data = audio_file.readframes(chunk)
+    open_stream() returns (stream, close_fn); stream only needs write(bytes).'''
 
-            # Stream audio data in chunks
-            while data:
-                out_stream.write(data)
-                data = audio_file.readframes(chunk)
+    def __init__(self, open_stream=None):
+        self._open_stream = open_stream or _open_pyaudio_stream
+        self._cond = Condition()
+        self._queue = deque()
+        self._clips = {}
+        self._clip_lock = Lock()
+        self._preempt = False
+        self._running = False
+        self._thread = None
+        self.current = None
+        self.played = 0
+        self.dropped = 0
+        self.preempted = 0
+        self.available = True
 
-        except Exception as e:
-            print(f"Error playing audio: {e}")
+    def clip(self, filepath):
+        '''Returns the decoded clip for filepath, decoding it on first use.'''
+        with self._clip_lock:
+            clip = self._clips.get(filepath)
+            if clip is None:
+                clip = decode_clip(filepath)
+                self._clips[filepath] = clip
+            return clip
 
+    def start(self):
+        '''Starts the worker thread (which opens the output stream).'''
+        with self._cond:
+            if self._running or not self.available:
+                return
+            self._running = True
+        self._thread = Thread(target=self._run, name="audio-engine", daemon=True)
+        self._thread.start()
+
+    def play(self, filepath, preempt=False):
+        '''Queues filepath; preempt=True drops pending sounds and cuts off the current one.'''
+        if not self.available:
+            return False
+        try:
+            clip = self.clip(filepath)
+        except Exception:  # pylint: disable=broad-exception-caught
+            log.exception("Error loading audio %s", filepath)
+            return False
+        self.start()
+        with self._cond:
+            if preempt:
+                self.dropped += len(self._queue)
+                self._queue.clear()
+                if self.current is not None:
+                    self._preempt = True
+            elif len(self._queue) >= QUEUE_LIMIT:
+                self._queue.popleft()
+                self.dropped += 1
+            self._queue.append(clip)
+            self._cond.notify()
+        return True
+
+    def metrics(self):
+        '''Snapshot of the engine's counters.'''
+        with self._cond:
+            queued = len(self._queue)
+        return {"available": self.available, "played": self.played, "dropped": self.dropped,
+                "preempted": self.preempted, "queued": queued, "clips": len(self._clips)}
+
+    def is_playing(self):
+        '''True while a clip is being written or waiting in the queue.'''
+        with self._cond:
+            return self.current is not None or bool(self._queue)
+
+    def _run(self):
+        try:
+            stream, close = self._open_stream()
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            log.warning("Audio output unavailable: %s", e)
+            self.available = False
+            with self._cond:
+                self._running = False
+                self._queue.clear()
+                self._cond.notify_all()
+            return
+        chunk_bytes = WRITE_FRAMES * OUTPUT_CHANNELS * OUTPUT_SAMPLE_WIDTH
+        try:
+            while True:
+                with self._cond:
+                    while self._running and not self._queue:
+                        self._cond.wait()
+                    if not self._running:
+                        return
+                    self.current = self._queue.popleft()
+                    self._preempt = False
+                pcm = memoryview(self.current.pcm)
+                for offset in range(0, len(pcm), chunk_bytes):
+                    if self._preempt:
+                        self.preempted += 1
+                        break
+                    stream.write(bytes(pcm[offset:offset + chunk_bytes]))
+                with self._cond:
+                    self.current = None
+                    self.played += 1
+                    self._cond.notify_all()
+        except Exception:  # pylint: disable=broad-exception-caught
+            log.exception("Error playing audio")
         finally:
-            # Ensure resources are properly closed
+            with self._cond:
+                self.current = None
+                self._running = False
+                self._cond.notify_all()
+            try:
+                close()
+            except Exception:  # pylint: disable=broad-exception-caught
+                log.exception("Error during audio cleanup")
+
+    def wait_idle(self, timeout=None):
+        '''Blocks until the queue is empty and nothing is playing (for tests and shutdown).'''
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._running or (self.current is None and not self._queue),
+                                       timeout)
+
+    def shutdown(self, timeout=1.0):
+        '''Stops the worker and closes the output stream.'''
+        with self._cond:
+            self._running = False
+            self._preempt = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+
+class AudioManager:
+    '''
+    Contains the helper function play(String:filepath)
+    '''
+    _lock = Lock()
+    _engine = None
+
+    @staticmethod
+    def engine():
+        '''Returns the shared audio engine, creating it on first use.'''
+        with AudioManager._lock:
+            if AudioManager._engine is None:
+                AudioManager._engine = AudioEngine()
+                MetricsRegistry.instance().register_collector("audio", AudioManager._engine.metrics)
+            return AudioManager._engine
+
+    @staticmethod
+    def preload(*filepaths):
+        """Decode sounds and open the output stream ahead of the first beep."""
+        engine = AudioManager.engine()
+        for filepath in filepaths:
             try:
-                if out_stream is not None:
-                    out_stream.stop_stream()
-                    out_stream.close()
-                if out_p is not None:
-                    out_p.terminate()
-                if audio_file is not None:
-                    audio_file.close()
-                AudioManager._is_playing = False
-                print(f"Audio {filepath} has ended.")
-            except Exception as cleanup_error:
-                print(f"Error during audio cleanup: {cleanup_error}")
+                engine.clip(filepath)
+            except Exception:  # pylint: disable=broad-exception-caught
+                log.exception("Error loading audio %s", filepath)
+        engine.start()
 
     @staticmethod
-    def play(filepath):
-        """Play audio asynchronously in a separate thread."""
+    def play(filepath, preempt=False):
+        """Play audio asynchronously on the audio engine's worker thread."""
         if os.path.exists(filepath):
-            if not AudioManager._is_playing:
-                Thread(target=AudioManager.__play, args=(filepath,), daemon=True).start()
-            else:
-                print("Audio is already playing. Please wait.")
+            AudioManager.engine().play(filepath, preempt=preempt)
         else:
-            print(f"Error: Audio file {filepath} does not exist.")
+            log.error("Audio file %s does not exist.", filepath)
+
+    @staticmethod
+    def shutdown():
+        """Stop the audio worker and release the output device."""
+        with AudioManager._lock:
+            engine, AudioManager._engine = AudioManager._engine, None
+        if engine is not None:
+            engine.shutdown()
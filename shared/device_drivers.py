@@ -0,0 +1,288 @@
+'''Protocol drivers for serial measurement devices and RFID readers.
+
+A driver turns one raw frame from a device into a Reading (value, unit,
+stability flag) and, for devices that only print on demand, knows which
+command requests a single reading. Drivers are looked up by name through
+the registry so the serial settings can pick one per device:
+
+    driver = get_driver("sics")
+    reading = driver.request_reading(ser, timeout=2.0)
+
+Registered drivers: generic (line/regex), sics (Mettler-Toledo MT-SICS),
+ohaus, and (A&D), caliper (Sylvac/Mitutoyo style) and rfid (STX/ETX).
+'''
+import queue
+import re
+import time
+from collections import deque, namedtuple
+from shared.serial_framing import FrameDecoder, STX, ETX
+
+# value is a float for measurements and a str tag for RFID readers.
+# stable is True/False when the device reports it, None when the protocol has no flag.
+Reading = namedtuple("Reading", ["value", "unit", "stable", "raw"])
+
+_DRIVERS = {}
+
+_NUMBER = r"[-+]?\s*\d+(?:\.\d+)?"
+
+
+def register_driver(cls):
+    '''Class decorator adding a driver to the registry under cls.name.'''
+    _DRIVERS[cls.name] = cls
+    return cls
+
+
+def available_drivers():
+    '''Returns the registered driver names in registration order.'''
+    return list(_DRIVERS)
+
+
+def get_driver(name=None):
+    '''Returns a new driver instance for name, falling back to the generic driver.'''
+    key = str(name or "").strip().lower()
+    cls = _DRIVERS.get(key) or _DRIVERS["generic"]
+    return cls()
+
+
+def guess_driver_name(device_name="", description=""):
+    '''Best-effort driver choice from a device label and port description.'''
+    text = f"{device_name} {description}".lower()
+    if "rfid" in text or "reader" in text:
+        return "rfid"
+    if "mettler" in text or "sics" in text:
+        return "sics"
+    if "ohaus" in text:
+        return "ohaus"
+    if "a&d" in text:
+        return "and"
+    if "caliper" in text or "sylvac" in text or "mitutoyo" in text:
+        return "caliper"
+    return "generic"
+
+
+def _to_float(text):
+    '''Parses a device number that may contain a sign separated by spaces.'''
+    return float(str(text).replace(" ", ""))
+
+
+class DeviceDriver:
+    '''Base driver: line framed, no request command, no stability flag.'''
+    name = "base"
+    label = "Base"
+    # Command that asks the device for one reading; None for streaming-only devices.
+    request_command = None
+    # Framing hints used by make_decoder() when the settings leave framing on "Auto".
+    terminators = (b"\r", b"\n")
+    stx = None
+    etx = None
+
+    def __init__(self, rate_window=50):
+        self._frame_times = deque(maxlen=rate_window)
+
+    def parse(self, frame):
+        '''Returns a Reading for one frame (bytes or str), or None if it is not a reading.'''
+        raise NotImplementedError
+
+    def decode(self, frame):
+        '''Records the frame arrival for frame rate reporting and parses it.'''
+        self._frame_times.append(time.monotonic())
+        try:
+            return self.parse(frame)
+        except (ValueError, IndexError):
+            return None
+
+    def frame_rate(self):
+        '''Returns frames per second over the recent arrival window (0.0 until two frames arrive).'''
+        if len(self._frame_times) < 2:
+            return 0.0
+        span = self._frame_times[-1] - self._frame_times[0]
+        if span <= 0:
+            return 0.0
+        return (len(self._frame_times) - 1) / span
+
+    @staticmethod
+    def _text(frame):
+        if isinstance(frame, (bytes, bytearray)):
+            frame = bytes(frame).decode("ascii", errors="ignore")
+        return str(frame).strip("\x02\x03\r\n\t ")
+
+    def make_decoder(self, spec=None):
+        '''Returns a FrameDecoder for this device, using spec (settings value) or the driver hints.'''
+        return FrameDecoder.from_spec(spec, self)
+
+    def request_reading(self, ser, timeout=2.0, require_stable=True, stop_event=None, decoder=None):
+        '''Requests (or waits for) one reading from an open serial port.
+
+        Devices with a request command are polled: the command is re-sent whenever an
+        unstable reading comes back, so capture costs one round trip once the value settles.
+        Streaming devices are read until a frame parses. Returns a Reading or None on timeout.'''
+        deadline = time.monotonic() + timeout
+        decoder = decoder or self.make_decoder()
+        if self.request_command:
+            try:
+                ser.reset_input_buffer()
+            except Exception:
+                pass
+            ser.write(self.request_command)
+        while time.monotonic() < deadline:
+            if stop_event is not None and stop_event.is_set():
+                return None
+            chunk = ser.read(getattr(ser, "in_waiting", 0) or 1)
+            if not chunk:
+                continue
+            for frame in decoder.feed(chunk):
+                reading = self.decode(frame)
+                if reading is None:
+                    continue
+                if reading.stable is False and require_stable:
+                    if self.request_command:
+                        ser.write(self.request_command)
+                    continue
+                return reading
+        return None
+
+    def request_reading_via_engine(self, port, timeout=2.0, require_stable=True, stop_event=None, framing=None,
+                                   engine=None, **serial_kwargs):
+        '''Like request_reading(), but opens port through the serial engine so the exchange is captured.
+
+        Returns a Reading, or None on timeout, stop or port failure; opening the port raises
+        serial.SerialException.'''
+        from shared.serial_engine import SerialIOEngine  # pylint: disable=import-outside-toplevel
+        readings = queue.SimpleQueue()
+
+        def on_frame(frame):
+            reading = self.decode(frame)
+            if reading is not None:
+                readings.put(reading)
+
+        engine = engine or SerialIOEngine.instance()
+        sub = engine.open(port, on_frame, decoder=self.make_decoder(framing), on_error=lambda _e: readings.put(None),
+                          driver=self.name, framing=framing, **serial_kwargs)
+        deadline = time.monotonic() + timeout
+        try:
+            if self.request_command:
+                sub.write(self.request_command)
+            while stop_event is None or not stop_event.is_set():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                try:
+                    reading = readings.get(timeout=min(remaining, 0.1))
+                except queue.Empty:
+                    continue
+                if reading is None:
+                    return None
+                if reading.stable is False and require_stable:
+                    if self.request_command:
+                        sub.write(self.request_command)
+                    continue
+                return reading
+            return None
+        finally:
+            sub.close()
+
+
+@register_driver
+class GenericDriver(DeviceDriver):
+    '''Line based devices: the first number in each line, optional unit after it.'''
+    name = "generic"
+    label = "Generic (line/regex)"
+    _pattern = re.compile(r"(-?\d+(?:\.\d+)?)\s*([A-Za-z%]+)?")
+
+    def parse(self, frame):
+        text = self._text(frame)
+        match = self._pattern.search(text)
+        if not match:
+            return None
+        return Reading(float(match.group(1)), match.group(2) or "", None, text)
+
+
+@register_driver
+class SicsDriver(DeviceDriver):
+    '''Mettler-Toledo MT-SICS: "SI" requests an immediate value, answered as "S S|D <value> <unit>".'''
+    name = "sics"
+    label = "Mettler-Toledo SICS"
+    request_command = b"SI\r\n"
+    _pattern = re.compile(r"^S\s+([SD])\s+(" + _NUMBER + r")\s*(\S+)?")
+
+    def parse(self, frame):
+        text = self._text(frame)
+        match = self._pattern.match(text)
+        if not match:
+            # "S I" (busy), "S +"/"S -" (overload/underload), "ES"/"ET"/"EL" errors.
+            return None
+        return Reading(_to_float(match.group(2)), match.group(3) or "", match.group(1) == "S", text)
+
+
+@register_driver
+class OhausDriver(DeviceDriver):
+    '''Ohaus: "IP" prints immediately; unstable values carry a trailing "?".'''
+    name = "ohaus"
+    label = "Ohaus"
+    request_command = b"IP\r\n"
+    _pattern = re.compile(r"(" + _NUMBER + r")\s*([A-Za-z]+)?")
+
+    def parse(self, frame):
+        text = self._text(frame)
+        match = self._pattern.search(text)
+        if not match:
+            return None
+        return Reading(_to_float(match.group(1)), match.group(2) or "", "?" not in text, text)
+
+
+@register_driver
+class AndDriver(DeviceDriver):
+    '''A&D: "Q" requests a value, answered as "ST|US|QT,<value> <unit>" (OL is overload).'''
+    name = "and"
+    label = "A&D"
+    request_command = b"Q\r\n"
+    _pattern = re.compile(r"^(ST|US|QT),(" + _NUMBER + r")\s*(\S+)?")
+
+    def parse(self, frame):
+        text = self._text(frame)
+        match = self._pattern.match(text)
+        if not match:
+            return None
+        return Reading(_to_float(match.group(2)), match.group(3) or "", match.group(1) != "US", text)
+
+
+@register_driver
+class CaliperDriver(DeviceDriver):
+    '''Digital calipers: "?" requests a value such as "+012.34" or Digimatic "01A+00012.34".'''
+    name = "caliper"
+    label = "Digital caliper"
+    request_command = b"?\r"
+    _pattern = re.compile(r"^(?:\d{2}A)?(" + _NUMBER + r")\s*(mm|in)?", re.IGNORECASE)
+
+    def parse(self, frame):
+        text = self._text(frame)
+        match = self._pattern.match(text)
+        if not match:
+            return None
+        return Reading(_to_float(match.group(1)), (match.group(2) or "mm").lower(), True, text)
+
+
+@register_driver
+class RfidDriver(DeviceDriver):
+    '''RFID readers framing tags as STX <tag> [checksum] [CR LF] ETX, or plain CR/LF lines.
+
+    EM4100 style frames (10 hex data characters plus a matching 2 character XOR
+    checksum) have the checksum stripped from the tag.'''
+    name = "rfid"
+    label = "RFID reader (STX/ETX)"
+    stx = STX
+    etx = ETX
+    _hex_frame = re.compile(r"^[0-9A-Fa-f]{12}$")
+
+    def parse(self, frame):
+        text = re.sub(r"[^\w]", "", self._text(frame))
+        if not text:
+            return None
+        if self._hex_frame.match(text):
+            data = bytes.fromhex(text[:10])
+            checksum = 0
+            for byte in data:
+                checksum ^= byte
+            if checksum == int(text[10:], 16):
+                text = text[:10]
+        return Reading(text, "", True, text)
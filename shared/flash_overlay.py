@@ -1,8 +1,27 @@
 '''Custom Flash Screen to show statuses to the user'''
+import logging
+import threading
 from customtkinter import *
+from shared.ui_dispatcher import UIDispatcher
+
+log = logging.getLogger(__name__)
+
+_managers_lock = threading.Lock()
+
+
+def _set_overlay_nav_lock(parent, delta: int):
+    """Reference-count overlay visibility to coordinate with page nav lifting."""
+    try:
+        count = int(getattr(parent, "_active_flash_overlays", 0) or 0)
+        count = max(0, count + int(delta))
+        setattr(parent, "_active_flash_overlays", count)
+        setattr(parent, "_nav_lift_suspended", bool(count > 0))
+    except Exception:
+        pass
+
 
 class FlashOverlay:
-    '''A reusable flash overlay that can be used to show temporary full-screen messages'''
+    '''Shows a temporary full-screen message using the page's shared FlashOverlayManager'''
 
     def __init__(self, parent: CTk, message: str, duration: int = 1000,
                  bg_color: str = "#00FF00", text_color: str = "white",
@@ -10,79 +29,155 @@ class FlashOverlay:
 
         self.parent = parent
         self.duration = duration
-        self._z_job = None
+        self.manager = FlashOverlayManager.for_page(parent)
+        self.manager.show(message, duration=duration, bg_color=bg_color, text_color=text_color, font=font)
+
+    def destroy(self):
+        '''Manually hide the overlay before the duration'''
+        self.manager.hide()
 
-        # Suspend periodic nav-button lifting while overlay is visible.
-        self._set_overlay_nav_lock(+1)
 
-        # Create flash overlay frame
-        self.flash_frame = CTkFrame(parent, fg_color=bg_color)
-        self.flash_frame.place(relx=0, rely=0, relwidth=1, relheight=1)
+class FlashOverlayManager:
+    '''One pre-created overlay per page, reused for every flash message.
 
-        # Add message
-        self.label = CTkLabel(
-            self.flash_frame,
-            text=message,
-            font=font,
-            text_color=text_color
-        )
+    show() may be called from any thread: requests are handed to the Tk thread, and a
+    message that arrives while another is pending replaces it instead of stacking a
+    new overlay. queue=True waits for the current message to finish first (only the
+    latest queued message is kept).'''
+
+    def __init__(self, parent: CTk, font: tuple = ("Arial", 32, "bold")):
+        self.parent = parent
+        self.font = font
+        self._lock = threading.Lock()
+        self._pending = None
+        self._queued = None
+        self._drain_scheduled = False
+        self._visible = False
+        self._hide_job = None
+        self._z_job = None
+        self.flash_frame = None
+        self.label = None
+        self.shown = 0
+        self.coalesced = 0
+        self._dispatcher = None
+        if threading.current_thread() is threading.main_thread():
+            self._dispatcher = UIDispatcher.for_widget(parent)
+            self._build()
+
+    @classmethod
+    def for_page(cls, parent):
+        '''Returns the page's overlay manager, creating it on first use.'''
+        with _managers_lock:
+            manager = getattr(parent, "_flash_overlay_manager", None)
+            if manager is None:
+                manager = cls(parent)
+                setattr(parent, "_flash_overlay_manager", manager)
+            return manager
+
+    def _build(self):
+        if self.flash_frame is not None:
+            return
+        self.flash_frame = CTkFrame(self.parent, fg_color="#00FF00")
+        self.label = CTkLabel(self.flash_frame, text="", font=self.font, text_color="black")
         self.label.place(relx=0.5, rely=0.5, anchor=CENTER)
-        try:
-            self.flash_frame.lift()
-            self.label.lift()
-        except Exception:
-            pass
 
-        # Keep overlay above all page widgets (including nav buttons) for full duration.
-        self._keep_on_top()
+    def show(self, message: str, duration: int = 1000, bg_color: str = "#00FF00",
+             text_color: str = "white", font: tuple = None, queue: bool = False):
+        '''Shows message for duration ms, replacing the message on screen (or queued behind it).'''
+        request = (message, duration, bg_color, text_color, font or self.font)
+        with self._lock:
+            if queue:
+                if self._queued is not None:
+                    self.coalesced += 1
+                self._queued = request
+            else:
+                if self._pending is not None:
+                    self.coalesced += 1
+                self._pending = request
+            if self._drain_scheduled:
+                return
+            self._drain_scheduled = True
+        if threading.current_thread() is threading.main_thread():
+            self._drain()
+        elif self._dispatcher is not None:
+            self._dispatcher.post(self._drain)
+        else:
+            try:
+                self.parent.after(0, self._drain)
+            except Exception:
+                with self._lock:
+                    self._drain_scheduled = False
 
-        # Schedule the fade out
-        self.parent.after(self.duration, self._fade_out)
+    def _drain(self):
+        with self._lock:
+            self._drain_scheduled = False
+            request, self._pending = self._pending, None
+            if request is None and not self._visible:
+                request, self._queued = self._queued, None
+        if request is not None:
+            self._display(*request)
 
-    def _set_overlay_nav_lock(self, delta: int):
-        """Reference-count overlay visibility to coordinate with page nav lifting."""
+    def _display(self, message, duration, bg_color, text_color, font):
         try:
-            count = int(getattr(self.parent, "_active_flash_overlays", 0) or 0)
-            count = max(0, count + int(delta))
-            setattr(self.parent, "_active_flash_overlays", count)
-            setattr(self.parent, "_nav_lift_suspended", bool(count > 0))
+            if not self.parent.winfo_exists():
+                return
+            self._build()
+            self.flash_frame.configure(fg_color=bg_color)
+            self.label.configure(text=message, text_color=text_color, font=font)
+            if not self._visible:
+                self._visible = True
+                _set_overlay_nav_lock(self.parent, +1)
+                self.flash_frame.place(relx=0, rely=0, relwidth=1, relheight=1)
+            self.shown += 1
         except Exception:
-            pass
+            log.exception("Error showing flash overlay")
+            return
+        if self._hide_job is not None:
+            self.parent.after_cancel(self._hide_job)
+        self._hide_job = self.parent.after(duration, self._finish)
+        if self._z_job is None:
+            self._keep_on_top()
+
+    def _finish(self):
+        self._hide_job = None
+        with self._lock:
+            request, self._queued = self._queued, None
+        if request is not None:
+            self._display(*request)
+        else:
+            self.hide()
 
     def _keep_on_top(self):
-        """Continuously re-lift the overlay while active."""
-        if not self.flash_frame.winfo_exists():
+        """Re-lift the overlay while it is visible (a single timer per page)."""
+        self._z_job = None
+        if not self._visible:
             return
         try:
             self.flash_frame.lift()
-            self.label.lift()
-        except Exception:
-            pass
-        try:
             self._z_job = self.parent.after(20, self._keep_on_top)
         except Exception:
             self._z_job = None
 
-    def _fade_out(self):
-        '''Removes the flash overlay'''
-        if self.flash_frame.winfo_exists():
-            self.flash_frame.destroy()
-        if self._z_job is not None:
-            try:
-                self.parent.after_cancel(self._z_job)
-            except Exception:
-                pass
-            self._z_job = None
-        self._set_overlay_nav_lock(-1)
+    def is_visible(self):
+        '''True while a message is on screen.'''
+        return self._visible
 
-    def destroy(self):
-        '''Manually destroy the overlay before the duration'''
-        if self.flash_frame.winfo_exists():
-            self.flash_frame.destroy()
-        if self._z_job is not None:
+    def hide(self):
+        '''Hides the overlay immediately and drops any queued message.'''
+        with self._lock:
+            self._queued = None
+        for job in (self._hide_job, self._z_job):
+            if job is not None:
+                try:
+                    self.parent.after_cancel(job)
+                except Exception:
+                    pass
+        self._hide_job = None
+        self._z_job = None
+        if self._visible:
+            self._visible = False
             try:
-                self.parent.after_cancel(self._z_job)
+                self.flash_frame.place_forget()
             except Exception:
                 pass
-            self._z_job = None
-        self._set_overlay_nav_lock(-1)
+            _set_overlay_nav_lock(self.parent, -1)
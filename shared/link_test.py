@@ -0,0 +1,181 @@
+'''Serial link measurement: throughput, jitter, parse failures, round trips and drops.
+
+The Test Screen's "Measure" button runs measure_link() on a worker for a few
+seconds per device; it works the same against real ports and the pseudo-
+terminal stand-ins in shared.virtual_devices:
+
+    result = measure_link("/dev/ttyUSB0", driver="sics", seconds=10, baudrate=9600)
+    print(format_link_report(result))
+
+Streaming devices are only listened to. Devices whose driver has a request
+command are polled one request at a time, so every response yields a round-
+trip sample and every request left unanswered counts as a dropped frame. For
+periodic streams, drops are estimated from gaps longer than 1.5x the median
+inter-frame interval (or from expected_rate when the device rate is known).
+Frames decoded from one read share its arrival timestamp.
+'''
+import statistics
+import threading
+import time
+
+from shared.device_drivers import get_driver
+from shared.metrics import Histogram, MetricsRegistry
+from shared.serial_engine import SerialIOEngine
+
+# Default measurement length per device in seconds.
+LINK_TEST_SECONDS = 10.0
+# How long a polled device may take to answer one request before it counts as dropped.
+RESPONSE_TIMEOUT = 1.0
+# A gap this many times the median interval means frames went missing.
+GAP_FACTOR = 1.5
+
+
+def summarize_arrivals(times, periodic=True, expected_rate=None, elapsed=None):
+    '''Returns interval/jitter statistics (ms) and a dropped frame estimate for arrival times (seconds).'''
+    intervals = [(b - a) * 1000.0 for a, b in zip(times, times[1:])]
+    summary = {"interval_ms": None, "jitter_ms": None, "max_gap_ms": None, "dropped_frames": 0}
+    if intervals:
+        summary["interval_ms"] = round(statistics.fmean(intervals), 3)
+        summary["jitter_ms"] = round(statistics.pstdev(intervals), 3)
+        summary["max_gap_ms"] = round(max(intervals), 3)
+    if expected_rate and elapsed:
+        summary["dropped_frames"] = max(0, int(round(expected_rate * elapsed)) - len(times))
+    elif periodic and len(intervals) >= 2:
+        median = statistics.median(intervals)
+        if median > 0:
+            summary["dropped_frames"] = sum(int(round(gap / median)) - 1 for gap in intervals
+                                            if gap > GAP_FACTOR * median)
+    return summary
+
+
+class _LinkRecorder:
+    '''Collects frame arrivals on the engine thread and matches responses to requests.'''
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.lock = threading.Lock()
+        self.times = []
+        self.frames = 0
+        self.parse_failures = 0
+        self.unsolicited = 0
+        self.error = None
+        self.sent_at = None
+        self.rtt_ms = []
+        self.response = threading.Event()
+        self.failed = threading.Event()
+
+    def on_frame(self, frame):
+        now = time.monotonic()
+        reading = self.driver.decode(frame)
+        with self.lock:
+            self.frames += 1
+            self.times.append(now)
+            if reading is None:
+                self.parse_failures += 1
+            if self.sent_at is None:
+                self.unsolicited += 1
+            else:
+                self.rtt_ms.append((now - self.sent_at) * 1000.0)
+                self.sent_at = None
+                self.response.set()
+
+    def on_error(self, error):
+        self.error = str(error)
+        self.failed.set()
+        self.response.set()
+
+    def send(self, sub):
+        with self.lock:
+            self.response.clear()
+            self.sent_at = time.monotonic()
+        sub.write(self.driver.request_command)
+
+    def abandon(self):
+        '''Forgets the outstanding request; returns True if it was still unanswered.'''
+        with self.lock:
+            unanswered = self.sent_at is not None
+            self.sent_at = None
+            return unanswered
+
+
+def measure_link(port, driver=None, framing=None, seconds=LINK_TEST_SECONDS, poll=None, periodic=True,
+                 expected_rate=None, response_timeout=RESPONSE_TIMEOUT, stop_event=None, engine=None,
+                 **serial_kwargs):
+    '''Measures one serial link for seconds and returns a result dict.
+
+    driver is a driver name or instance; poll defaults to True when it has a request command.
+    stop_event ends the run early. Opening the port raises serial.SerialException.'''
+    driver = get_driver(driver) if driver is None or isinstance(driver, str) else driver
+    poll = bool(driver.request_command) if poll is None else bool(poll and driver.request_command)
+    engine = engine or SerialIOEngine.instance()
+    recorder = _LinkRecorder(driver)
+    requests = dropped_requests = 0
+    sub = engine.open(port, recorder.on_frame, decoder=driver.make_decoder(framing),
+                      on_error=recorder.on_error, driver=driver.name, framing=framing, **serial_kwargs)
+    start = time.monotonic()
+    deadline = start + seconds
+    try:
+        while not recorder.failed.is_set() and (stop_event is None or not stop_event.is_set()):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            if not poll:
+                (stop_event or recorder.failed).wait(min(remaining, 0.1))
+                continue
+            recorder.send(sub)
+            requests += 1
+            # The last request may finish after the deadline so it is never cut short.
+            if not recorder.response.wait(response_timeout) and recorder.abandon():
+                dropped_requests += 1
+    finally:
+        elapsed = time.monotonic() - start
+        bytes_received = sub.bytes_received
+        sub.close()
+
+    with recorder.lock:
+        times = list(recorder.times)
+        frames, failures = recorder.frames, recorder.parse_failures
+        rtt_samples = list(recorder.rtt_ms)
+        unsolicited = recorder.unsolicited
+    summary = summarize_arrivals(times, periodic=periodic and not poll, expected_rate=expected_rate,
+                                 elapsed=elapsed)
+    rtt = Histogram()
+    rtt_metric = MetricsRegistry.instance().histogram("serial.rtt_ms", port=port)
+    for sample in rtt_samples:
+        rtt.observe(sample)
+        rtt_metric.observe(sample)
+    result = {
+        "port": port,
+        "driver": driver.name,
+        "mode": "request" if poll else "stream",
+        "seconds": round(elapsed, 3),
+        "frames": frames,
+        "bytes": bytes_received,
+        "frames_per_second": round(frames / elapsed, 2) if elapsed > 0 else 0.0,
+        "parse_failures": failures,
+        "parse_failure_rate": round(failures / frames, 4) if frames else 0.0,
+        "requests": requests,
+        "unsolicited_frames": unsolicited if poll else 0,
+        "rtt_ms": rtt.snapshot() if rtt_samples else None,
+        "error": recorder.error,
+    }
+    result.update(summary)
+    if poll:
+        result["dropped_frames"] = dropped_requests
+    return result
+
+
+def format_link_report(result):
+    '''Short multi-line summary of a measure_link() result for the Test Screen.'''
+    if result.get("error"):
+        return f"Link failed: {result['error']}"
+    lines = [f"{result['frames_per_second']:.1f} frames/s ({result['frames']} in {result['seconds']:.1f} s)"]
+    if result.get("jitter_ms") is not None:
+        lines.append(f"jitter {result['jitter_ms']:.1f} ms, max gap {result['max_gap_ms']:.0f} ms")
+    lines.append(f"parse failures {result['parse_failure_rate'] * 100:.1f}%, dropped {result['dropped_frames']}")
+    rtt = result.get("rtt_ms")
+    if rtt:
+        lines.append(f"RTT p50 {rtt['p50']:.1f} / p95 {rtt['p95']:.1f} ms ({result['requests']} requests)")
+    elif result["mode"] == "request":
+        lines.append(f"no responses to {result['requests']} requests")
+    return "\n".join(lines)
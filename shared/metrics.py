@@ -0,0 +1,200 @@
+'''In-process operational metrics: counters, gauges and histograms.
+
+Components look a metric up once and update it on the hot path:
+
+    scans = MetricsRegistry.instance().counter("rfid.scans", page="map")
+    scans.inc()
+
+    commit_ms = MetricsRegistry.instance().histogram("db.commit_ms")
+    with commit_ms.time():
+        conn.commit()
+
+Metrics are keyed by name plus labels (e.g. port="COM3"). Components that
+already keep their own counters (thread supervisor, UI dispatcher, audio)
+register a collector instead; snapshot() calls every collector and returns
+one JSON-serialisable dict, which export_json() writes to disk so stations
+can be compared.
+'''
+import json
+import platform
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+# Recent observations kept per histogram for percentiles.
+HISTOGRAM_SAMPLES = 1024
+
+
+def metric_key(name, labels):
+    '''Returns "name{a=1,b=2}" (or just name without labels).'''
+    if not labels:
+        return name
+    return name + "{" + ",".join(f"{k}={v}" for k, v in sorted(labels.items())) + "}"
+
+
+class Counter:
+    '''Monotonic count.'''
+
+    def __init__(self):
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self._lock:
+            self.value += amount
+
+    def snapshot(self):
+        return self.value
+
+
+class Gauge:
+    '''Value that goes up and down (queue depth, open ports).'''
+
+    def __init__(self):
+        self.value = 0
+
+    def set(self, value):
+        self.value = value
+
+    def inc(self, amount=1):
+        self.value += amount
+
+    def dec(self, amount=1):
+        self.value -= amount
+
+    def snapshot(self):
+        return self.value
+
+
+class Histogram:
+    '''Distribution of observations (typically milliseconds): count/sum/min/max plus recent percentiles.'''
+
+    def __init__(self, max_samples=HISTOGRAM_SAMPLES):
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+        self._samples = deque(maxlen=max_samples)
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        with self._lock:
+            self.count += 1
+            self.total += value
+            self.min = value if self.min is None else min(self.min, value)
+            self.max = value if self.max is None else max(self.max, value)
+            self._samples.append(value)
+
+    @contextmanager
+    def time(self):
+        '''Observes the duration of the with-block in milliseconds.'''
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe((time.perf_counter() - start) * 1000.0)
+
+    def snapshot(self):
+        with self._lock:
+            samples = sorted(self._samples)
+            count, total, low, high = self.count, self.total, self.min, self.max
+
+        def _percentile(fraction):
+            if not samples:
+                return None
+            return round(samples[min(len(samples) - 1, int(fraction * len(samples)))], 3)
+
+        return {
+            "count": count,
+            "mean": round(total / count, 3) if count else None,
+            "min": round(low, 3) if low is not None else None,
+            "max": round(high, 3) if high is not None else None,
+            "p50": _percentile(0.50),
+            "p95": _percentile(0.95),
+            "p99": _percentile(0.99),
+        }
+
+
+class MetricsRegistry:
+    '''Process-wide registry of named metrics and snapshot collectors.'''
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics = {}
+        self._collectors = {}
+        self.started_at = time.time()
+
+    @classmethod
+    def instance(cls):
+        '''Returns the process-wide registry.'''
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def _get(self, kind, name, labels):
+        key = metric_key(name, labels)
+        with self._lock:
+            metric = self._metrics.get(key)
+            if metric is None:
+                metric = kind()
+                self._metrics[key] = metric
+            elif not isinstance(metric, kind):
+                raise TypeError(f"Metric {key} is a {type(metric).__name__}, not a {kind.__name__}")
+            return metric
+
+    def counter(self, name, **labels):
+        '''Returns (creating on first use) the counter name{labels}.'''
+        return self._get(Counter, name, labels)
+
+    def gauge(self, name, **labels):
+        '''Returns (creating on first use) the gauge name{labels}.'''
+        return self._get(Gauge, name, labels)
+
+    def histogram(self, name, **labels):
+        '''Returns (creating on first use) the histogram name{labels}.'''
+        return self._get(Histogram, name, labels)
+
+    def register_collector(self, name, collect):
+        '''Adds collect() -> dict to every snapshot under name (replaces an earlier one).'''
+        with self._lock:
+            self._collectors[name] = collect
+
+    def unregister_collector(self, name):
+        with self._lock:
+            self._collectors.pop(name, None)
+
+    def snapshot(self):
+        '''Returns every metric and collector as a JSON-serialisable dict.'''
+        with self._lock:
+            metrics = dict(self._metrics)
+            collectors = dict(self._collectors)
+        result = {
+            "station": platform.node(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "uptime_s": round(time.time() - self.started_at, 1),
+            "counters": {},
+            "gauges": {},
+            "histograms": {},
+            "collectors": {},
+        }
+        sections = {Counter: "counters", Gauge: "gauges", Histogram: "histograms"}
+        for key in sorted(metrics):
+            metric = metrics[key]
+            result[sections[type(metric)]][key] = metric.snapshot()
+        for name in sorted(collectors):
+            try:
+                result["collectors"][name] = collectors[name]()
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                result["collectors"][name] = {"error": str(e)}
+        return result
+
+    def export_json(self, path):
+        '''Writes snapshot() to path as JSON; returns the snapshot.'''
+        snapshot = self.snapshot()
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f, indent=2, default=str)
+        return snapshot
@@ -0,0 +1,315 @@
+'''Record and replay raw serial traffic.
+
+While a capture is active every chunk of bytes the serial engine reads from
+(or writes to) a port is appended to a compact binary session log with a
+microsecond timestamp, before any framing or parsing. A recorded session
+can then be fed back through the same decoders, drivers and stability
+filters at its original pace, N times faster or as fast as possible:
+
+    start_capture("morning.msr")      # or MOUSER_SERIAL_CAPTURE=morning.msr
+    ...
+    stop_capture()
+
+    SessionReplayer("morning.msr", speed=None).play(on_chunk)
+    benchmark_session("morning.msr")  # max-speed replay through the pipeline
+
+Command line:
+
+    python -m shared.serial_capture morning.msr [--speed 10]
+
+File layout: a header (magic, version, wall-clock start time) followed by
+records of (kind, channel id, length, microseconds since start) + payload.
+Channel records carry a JSON description (port name, driver, framing) and
+are written the first time a port produces traffic. Records are flushed to
+disk every FLUSH_EVERY_RECORDS records and at least every FLUSH_INTERVAL
+seconds, so a crash loses at most that tail of the session.
+'''
+import argparse
+import json
+import logging
+import struct
+import threading
+import time
+from collections import namedtuple
+
+MAGIC = b"MSRL"
+VERSION = 1
+_HEADER = struct.Struct("<4sBd")
+_RECORD = struct.Struct("<BHIQ")
+
+log = logging.getLogger(__name__)
+
+# Flush the log after this many records, and at least this often (seconds) while records are pending.
+FLUSH_EVERY_RECORDS = 64
+FLUSH_INTERVAL = 1.0
+
+KIND_CHANNEL = 0
+KIND_RX = 1
+KIND_TX = 2
+
+# One recorded chunk: t is seconds since the start of the session.
+CapturedChunk = namedtuple("CapturedChunk", ["t", "channel", "kind", "data"])
+
+_capture_lock = threading.Lock()
+_active_recorder = None
+
+
+class SessionRecorder:
+    '''Appends timestamped raw serial chunks to a session log (thread-safe).'''
+
+    def __init__(self, path, flush_every=FLUSH_EVERY_RECORDS, flush_interval=FLUSH_INTERVAL):
+        self.path = path
+        self._file = open(path, "wb")  # pylint: disable=consider-using-with
+        self._lock = threading.Lock()
+        self._start = time.monotonic()
+        self._channels = {}
+        self.records = 0
+        self.bytes_recorded = 0
+        self.flush_every = flush_every
+        self._unflushed = 0
+        self._closed = threading.Event()
+        self._file.write(_HEADER.pack(MAGIC, VERSION, time.time()))
+        self._file.flush()
+        # Flushes a quiet port's last records even when no further traffic arrives.
+        self._flusher = threading.Thread(target=self._flush_loop, args=(flush_interval,),
+                                         name="serial-capture-flush", daemon=True)
+        self._flusher.start()
+
+    def _flush_loop(self, interval):
+        while not self._closed.wait(interval):
+            self.flush()
+
+    def _channel_id(self, name, driver, framing):
+        key = (name, driver, framing)
+        channel = self._channels.get(key)
+        if channel is None:
+            channel = len(self._channels)
+            self._channels[key] = channel
+            meta = json.dumps({"name": name, "driver": driver, "framing": framing}).encode("utf-8")
+            self._write(KIND_CHANNEL, channel, meta)
+        return channel
+
+    def _write(self, kind, channel, data):
+        elapsed_us = int((time.monotonic() - self._start) * 1_000_000)
+        self._file.write(_RECORD.pack(kind, channel, len(data), elapsed_us))
+        self._file.write(data)
+
+    def record(self, name, data, kind=KIND_RX, driver=None, framing=None):
+        '''Records one chunk received from (KIND_RX) or written to (KIND_TX) the port called name.'''
+        if not data:
+            return
+        with self._lock:
+            if self._file is None:
+                return
+            channel = self._channel_id(name, driver, framing)
+            self._write(kind, channel, bytes(data))
+            self.records += 1
+            self.bytes_recorded += len(data)
+            self._unflushed += 1
+            if self._unflushed >= self.flush_every:
+                self._file.flush()
+                self._unflushed = 0
+
+    def flush(self):
+        '''Flushes buffered records to disk.'''
+        with self._lock:
+            if self._file is not None and self._unflushed:
+                self._file.flush()
+                self._unflushed = 0
+
+    def close(self):
+        '''Flushes and closes the log.'''
+        self._closed.set()
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def start_capture(path):
+    '''Starts recording all serial engine traffic to path, replacing any capture in progress.'''
+    global _active_recorder  # pylint: disable=global-statement
+    recorder = SessionRecorder(path)
+    with _capture_lock:
+        previous, _active_recorder = _active_recorder, recorder
+    if previous is not None:
+        previous.close()
+    log.info("Recording serial traffic to %s", path)
+    return recorder
+
+
+def stop_capture():
+    '''Stops the active capture (if any) and returns its recorder.'''
+    global _active_recorder  # pylint: disable=global-statement
+    with _capture_lock:
+        recorder, _active_recorder = _active_recorder, None
+    if recorder is not None:
+        recorder.close()
+    return recorder
+
+
+def active_recorder():
+    '''The recorder in use, or None when serial traffic is not being captured.'''
+    return _active_recorder
+
+
+def read_session(path):
+    '''Returns (channels, chunks) from a session log.
+
+    channels maps channel id to its description dict; chunks is a list of CapturedChunk.
+    A truncated final record (e.g. the app was killed mid-write) is ignored.'''
+    with open(path, "rb") as f:
+        blob = f.read()
+    if len(blob) < _HEADER.size:
+        raise ValueError(f"{path} is not a serial session log")
+    magic, version, _started = _HEADER.unpack_from(blob, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path} is not a serial session log (version {VERSION})")
+    channels = {}
+    chunks = []
+    offset = _HEADER.size
+    while offset + _RECORD.size <= len(blob):
+        kind, channel, length, elapsed_us = _RECORD.unpack_from(blob, offset)
+        offset += _RECORD.size
+        data = blob[offset:offset + length]
+        if len(data) < length:
+            break
+        offset += length
+        if kind == KIND_CHANNEL:
+            channels[channel] = json.loads(data.decode("utf-8"))
+        else:
+            chunks.append(CapturedChunk(elapsed_us / 1_000_000, channel, kind, data))
+    return channels, chunks
+
+
+class SessionReplayer:
+    '''Plays a recorded session back with its original timing scaled by speed.
+
+    speed=1.0 is real time, 10 is ten times faster, None (or 0) replays as fast as possible.'''
+
+    def __init__(self, path, speed=1.0):
+        self.path = path
+        self.speed = speed
+        self.channels, self.chunks = read_session(path)
+
+    @property
+    def duration(self):
+        '''Recorded length of the session in seconds.'''
+        return self.chunks[-1].t if self.chunks else 0.0
+
+    def play(self, on_chunk, kinds=(KIND_RX,), stop_event=None):
+        '''Calls on_chunk(chunk) for each recorded chunk of the given kinds, in order.'''
+        start = time.monotonic()
+        for chunk in self.chunks:
+            if stop_event is not None and stop_event.is_set():
+                return
+            if chunk.kind not in kinds:
+                continue
+            if self.speed:
+                delay = chunk.t / self.speed - (time.monotonic() - start)
+                if delay > 0:
+                    if stop_event is not None:
+                        if stop_event.wait(delay):
+                            return
+                    else:
+                        time.sleep(delay)
+            on_chunk(chunk)
+
+    def play_to_virtual_ports(self, stop_event=None, register=True):
+        '''Re-emits the received bytes on one pseudo-terminal per recorded port (POSIX only).
+
+        Returns (thread, ports); ports maps channel id to the VirtualPort the app should open.'''
+        # pylint: disable=import-outside-toplevel
+        from shared.serial_port_controller import register_virtual_ports, unregister_virtual_ports
+        from shared.virtual_devices import VirtualPort
+        ports = {
+            channel: VirtualPort(f"Mouser replay {meta.get('name')} ({meta.get('driver') or 'generic'})")
+            for channel, meta in self.channels.items()
+        }
+        if register:
+            register_virtual_ports([port.port_info() for port in ports.values()])
+
+        def _run():
+            try:
+                self.play(lambda chunk: ports[chunk.channel].write(chunk.data), stop_event=stop_event)
+            finally:
+                if stop_event is not None:
+                    stop_event.wait()
+                if register:
+                    unregister_virtual_ports([port.path for port in ports.values()])
+                for port in ports.values():
+                    port.close()
+
+        thread = threading.Thread(target=_run, name="serial-replay", daemon=True)
+        thread.start()
+        return thread, ports
+
+
+def benchmark_session(path, speed=None, samples=3, tolerance=0.05):
+    '''Replays a session through the framing, driver and stability pipeline and reports its counters.
+
+    Each recorded port gets a fresh driver (from the recorded driver name) and frame decoder;
+    RFID frames count as scans, measurement readings go through a StabilityFilter.'''
+    # pylint: disable=import-outside-toplevel
+    from shared.device_drivers import get_driver
+    from shared.stability_filter import StabilityFilter
+
+    replayer = SessionReplayer(path, speed=speed)
+    pipelines = {}
+    for channel, meta in replayer.channels.items():
+        driver = get_driver(meta.get("driver"))
+        pipelines[channel] = (driver, driver.make_decoder(meta.get("framing")), StabilityFilter(samples, tolerance))
+    counts = {"chunks": 0, "bytes": 0, "frames": 0, "parse_failures": 0, "scans": 0, "readings": 0,
+              "settled": 0}
+    settled_values = []
+    scanned_tags = []
+
+    def on_chunk(chunk):
+        driver, decoder, stability = pipelines[chunk.channel]
+        counts["chunks"] += 1
+        counts["bytes"] += len(chunk.data)
+        for frame in decoder.feed(chunk.data):
+            counts["frames"] += 1
+            reading = driver.decode(frame)
+            if reading is None:
+                counts["parse_failures"] += 1
+            elif driver.name == "rfid":
+                counts["scans"] += 1
+                scanned_tags.append(reading.value)
+            else:
+                counts["readings"] += 1
+                # Recorded time keeps the stability window meaningful at any replay speed.
+                settled = stability.add(reading.value, reading.stable, now=chunk.t)
+                if settled is not None:
+                    counts["settled"] += 1
+                    settled_values.append(settled)
+
+    start = time.perf_counter()
+    replayer.play(on_chunk)
+    elapsed = time.perf_counter() - start
+    counts.update({
+        "session_seconds": round(replayer.duration, 3),
+        "replay_seconds": round(elapsed, 6),
+        "frames_per_second": round(counts["frames"] / elapsed, 1) if elapsed > 0 else 0.0,
+        "scanned_tags": scanned_tags,
+        "settled_values": settled_values,
+    })
+    return counts
+
+
+def main(argv=None):
+    '''Command line entry point: replay a session through the pipeline and print the counters.'''
+    parser = argparse.ArgumentParser(description="Replay a recorded serial session through the pipeline.")
+    parser.add_argument("path")
+    parser.add_argument("--speed", type=float, default=0.0, help="1 = real time, 0 = as fast as possible")
+    args = parser.parse_args(argv)
+    result = benchmark_session(args.path, speed=args.speed or None)
+    print(f"{result['chunks']} chunks, {result['bytes']} bytes, {result['frames']} frames "
+          f"({result['parse_failures']} parse failures)")
+    print(f"{result['scans']} scans, {result['readings']} readings, {result['settled']} settled values")
+    print(f"{result['session_seconds']} s session replayed in {result['replay_seconds']} s "
+          f"({result['frames_per_second']} frames/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+'''Single background event loop multiplexing every open serial port.
+
+Instead of one blocking reader thread per device, pages subscribe a port
+to the shared SerialIOEngine and get a callback per decoded frame:
+
+    engine = SerialIOEngine.instance()
+    sub = engine.subscribe(ser, on_frame, decoder=FrameDecoder.from_spec("CR"))
+    sub.write(b"SI\\r\\n")
+    ...
+    sub.close()
+
+On POSIX the port's file descriptor is registered with the asyncio selector,
+so an idle port costs nothing until bytes arrive. Ports without a selectable
+descriptor (Windows COM ports) are polled from the same loop. Frame
+callbacks run on the engine thread and must hand UI work back to Tk (for
+example with widget.after). While a serial capture is active (see
+shared.serial_capture) the raw bytes of every port are recorded here.
+Per-port byte/frame counts, port failures and reconnects are published as
+serial.* metrics (see shared.metrics).
+'''
+import asyncio
+import logging
+import threading
+
+import serial
+
+from shared.metrics import MetricsRegistry
+from shared.serial_capture import KIND_RX, KIND_TX, active_recorder
+
+log = logging.getLogger(__name__)
+
+# Poll interval for ports that cannot be registered with the selector (Windows).
+POLL_INTERVAL = 0.02
+
+
+class SerialSubscription:
+    '''One serial port attached to the engine.'''
+
+    def __init__(self, engine, ser, on_frame, decoder=None, on_error=None, name=None, driver=None,
+                 framing=None):
+        self.engine = engine
+        self.ser = ser
+        self.on_frame = on_frame
+        self.on_error = on_error
+        self.decoder = decoder
+        self.name = name or getattr(ser, "port", None) or "serial"
+        # Protocol driver name and framing spec, kept with captured traffic for replay.
+        self.driver_name = driver
+        self.framing = framing
+        self.active = True
+        self.bytes_received = 0
+        self.frames_received = 0
+        registry = MetricsRegistry.instance()
+        self._bytes_metric = registry.counter("serial.bytes", port=self.name)
+        self._frames_metric = registry.counter("serial.frames", port=self.name)
+        self._fd = None
+        self._poll_task = None
+        self._detached = threading.Event()
+
+    def write(self, data):
+        '''Queues bytes to be written to the port from the engine thread.'''
+        if self.active and data:
+            self.engine.call_soon(self._write_now, bytes(data))
+
+    def _write_now(self, data):
+        try:
+            self.ser.write(data)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            self.engine._fail(self, e)
+            return
+        self._capture(data, KIND_TX)
+
+    def _capture(self, data, kind):
+        recorder = active_recorder()
+        if recorder is not None:
+            recorder.record(self.name, data, kind, self.driver_name, self.framing)
+
+    def close(self, timeout=1.0):
+        '''Detaches the port from the engine and closes it.'''
+        self.engine.unsubscribe(self, timeout=timeout)
+
+    def _deliver(self, data):
+        self.bytes_received += len(data)
+        self._bytes_metric.inc(len(data))
+        self._capture(data, KIND_RX)
+        frames = self.decoder.feed(data) if self.decoder is not None else [data]
+        for frame in frames:
+            self.frames_received += 1
+            self._frames_metric.inc()
+            try:
+                self.on_frame(frame)
+            except Exception:  # pylint: disable=broad-exception-caught
+                log.exception("Error in serial frame handler for %s", self.name)
+
+
+class SerialIOEngine:
+    '''Owns one asyncio loop on a daemon thread and all port subscriptions.'''
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self):
+        self._loop = None
+        self._thread = None
+        self._ready = threading.Event()
+        self._subscriptions = set()
+        self._lock = threading.Lock()
+        # Ports whose subscription failed (e.g. unplugged); subscribing one again counts as a reconnect.
+        self._failed_ports = set()
+
+    @classmethod
+    def instance(cls):
+        '''Returns the process-wide engine, starting it on first use.'''
+        with cls._instance_lock:
+            if cls._instance is None or not cls._instance.is_running():
+                cls._instance = cls()
+                cls._instance.start()
+            return cls._instance
+
+    def is_running(self):
+        '''True while the loop thread is alive.'''
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        '''Starts the event loop thread.'''
+        if self.is_running():
+            return
+        self._ready.clear()
+        self._thread = threading.Thread(target=self._run, name="serial-io-engine", daemon=True)
+        self._thread.start()
+        self._ready.wait(timeout=2.0)
+
+    def _run(self):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._ready.set()
+        try:
+            self._loop.run_forever()
+        finally:
+            self._loop.close()
+
+    def in_engine_thread(self):
+        '''True when called from the engine's own thread.'''
+        return threading.current_thread() is self._thread
+
+    def call_soon(self, callback, *args):
+        '''Runs callback on the engine thread (thread-safe).'''
+        if self.in_engine_thread():
+            callback(*args)
+        elif self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(callback, *args)
+
+    def subscribe(self, ser, on_frame, decoder=None, on_error=None, name=None, driver=None, framing=None):
+        '''Attaches an open serial.Serial and calls on_frame(bytes) for each decoded frame.
+
+        Without a decoder every chunk of received bytes is passed through unchanged.
+        on_error(exception) is called once if the port fails (e.g. unplugged).
+        driver/framing only label the port's traffic in serial captures.'''
+        sub = SerialSubscription(self, ser, on_frame, decoder=decoder, on_error=on_error, name=name,
+                                 driver=driver, framing=framing)
+        try:
+            # Non-blocking reads: the selector tells us when bytes are waiting.
+            ser.timeout = 0
+        except Exception:  # pylint: disable=broad-exception-caught
+            pass
+        with self._lock:
+            self._subscriptions.add(sub)
+            reconnect = sub.name in self._failed_ports
+            self._failed_ports.discard(sub.name)
+        if reconnect:
+            MetricsRegistry.instance().counter("serial.reconnects", port=sub.name).inc()
+        self.call_soon(self._attach, sub)
+        return sub
+
+    def open(self, port, on_frame, decoder=None, on_error=None, driver=None, framing=None, **serial_kwargs):
+        '''Opens port with serial_kwargs and subscribes it; raises serial.SerialException on failure.'''
+        serial_kwargs["timeout"] = 0
+        ser = serial.Serial(port=port, **serial_kwargs)
+        return self.subscribe(ser, on_frame, decoder=decoder, on_error=on_error, name=port, driver=driver,
+                              framing=framing)
+
+    def unsubscribe(self, sub, timeout=1.0):
+        '''Detaches and closes a subscription; waits (bounded) for the engine to release the port.'''
+        if not sub.active:
+            return
+        sub.active = False
+        if self.in_engine_thread() or not self.is_running():
+            self._detach(sub)
+            return
+        self.call_soon(self._detach, sub)
+        sub._detached.wait(timeout=timeout)
+
+    def subscriptions(self):
+        '''Returns a snapshot of the active subscriptions.'''
+        with self._lock:
+            return list(self._subscriptions)
+
+    def shutdown(self, timeout=2.0):
+        '''Closes every port and stops the loop thread.'''
+        for sub in self.subscriptions():
+            sub.active = False
+            self.call_soon(self._detach, sub)
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._loop.stop)
+        if self._thread is not None and not self.in_engine_thread():
+            self._thread.join(timeout=timeout)
+        with SerialIOEngine._instance_lock:
+            if SerialIOEngine._instance is self:
+                SerialIOEngine._instance = None
+
+    def _attach(self, sub):
+        if not sub.active:
+            self._detach(sub)
+            return
+        try:
+            fd = sub.ser.fileno()
+            self._loop.add_reader(fd, self._on_readable, sub)
+            sub._fd = fd
+        except (AttributeError, NotImplementedError, OSError, ValueError, serial.SerialException):
+            sub._poll_task = self._loop.create_task(self._poll(sub))
+
+    def _on_readable(self, sub):
+        try:
+            data = sub.ser.read(sub.ser.in_waiting or 1)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            self._fail(sub, e)
+            return
+        if data:
+            sub._deliver(data)
+
+    async def _poll(self, sub):
+        while sub.active:
+            try:
+                waiting = sub.ser.in_waiting
+                data = sub.ser.read(waiting) if waiting else b""
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                self._fail(sub, e)
+                return
+            if data:
+                sub._deliver(data)
+            else:
+                await asyncio.sleep(POLL_INTERVAL)
+
+    def _fail(self, sub, error):
+        was_active = sub.active
+        sub.active = False
+        if was_active:
+            MetricsRegistry.instance().counter("serial.failures", port=sub.name).inc()
+            with self._lock:
+                self._failed_ports.add(sub.name)
+        self._detach(sub)
+        if was_active and sub.on_error is not None:
+            try:
+                sub.on_error(error)
+            except Exception:  # pylint: disable=broad-exception-caught
+                log.exception("Error in serial error handler for %s", sub.name)
+
+    def _detach(self, sub):
+        if sub._fd is not None:
+            try:
+                self._loop.remove_reader(sub._fd)
+            except Exception:  # pylint: disable=broad-exception-caught
+                pass
+            sub._fd = None
+        if sub._poll_task is not None:
+            sub._poll_task.cancel()
+            sub._poll_task = None
+        try:
+            if sub.ser is not None and sub.ser.is_open:
+                sub.ser.close()
+        except Exception:  # pylint: disable=broad-exception-caught
+            pass
+        with self._lock:
+            self._subscriptions.discard(sub)
+        sub._detached.set()
+
+
+def shutdown_serial_engine(timeout=2.0):
+    '''Stops the shared engine if it was ever started, closing every subscribed port.'''
+    engine = SerialIOEngine._instance
+    if engine is not None:
+        engine.shutdown(timeout=timeout)
@@ -0,0 +1,163 @@
+'''Incremental framing for raw serial byte streams.
+
+FrameDecoder keeps one bytearray per port and emits each frame the moment
+its last byte arrives, instead of waiting for a readline() timeout. It
+supports terminator framing (CR, LF, CRLF or any of several), fixed-length
+frames and STX/ETX wrapped frames:
+
+    decoder = FrameDecoder.from_spec("STX/ETX")
+    for frame in decoder.feed(ser.read(ser.in_waiting or 1)):
+        ...
+
+Framing is configured per device through the optional 9th column of the
+serial settings CSV (see FRAMING_CHOICES); "Auto" uses the hints of the
+device's protocol driver.
+'''
+
+STX = b"\x02"
+ETX = b"\x03"
+
+# Values offered in the serial settings window.
+FRAMING_CHOICES = ["Auto", "CR/LF", "CR", "LF", "CRLF", "STX/ETX", "Fixed:16"]
+
+_TERMINATOR_SPECS = {
+    "CR/LF": (b"\r", b"\n"),
+    "CR": (b"\r",),
+    "LF": (b"\n",),
+    "CRLF": (b"\r\n",),
+}
+
+
+class FrameDecoder:
+    '''Splits a byte stream into frames using terminators, a fixed length or STX/ETX markers.'''
+
+    def __init__(self, terminators=(b"\r", b"\n"), frame_length=None, stx=None, etx=None,
+                 max_frame_size=4096):
+        self.terminators = tuple(t for t in (terminators or ()) if t)
+        self.frame_length = int(frame_length) if frame_length else None
+        self.stx = stx
+        self.etx = etx
+        self.max_frame_size = max_frame_size
+        self.frames = 0
+        self.overflows = 0
+        self._buffer = bytearray()
+        self._scan_from = 0
+
+    @classmethod
+    def from_spec(cls, spec=None, driver=None):
+        '''Builds a decoder from a settings value such as "CR", "STX/ETX" or "Fixed:14".
+
+        Empty/"Auto" specs fall back to the driver's framing hints, then to CR or LF lines.'''
+        text = str(spec or "").strip()
+        key = text.upper()
+        if key in _TERMINATOR_SPECS:
+            return cls(terminators=_TERMINATOR_SPECS[key])
+        if key == "STX/ETX":
+            return cls(terminators=(), stx=STX, etx=ETX)
+        if key.startswith("FIXED:"):
+            try:
+                return cls(terminators=(), frame_length=int(key.split(":", 1)[1]))
+            except ValueError:
+                pass
+        if driver is not None:
+            return cls(terminators=getattr(driver, "terminators", (b"\r", b"\n")),
+                       stx=getattr(driver, "stx", None), etx=getattr(driver, "etx", None))
+        return cls()
+
+    def reset(self):
+        '''Drops any partial frame.'''
+        self._buffer.clear()
+        self._scan_from = 0
+
+    def feed(self, data):
+        '''Appends received bytes and returns the list of frames completed by them.'''
+        if not data:
+            return []
+        self._buffer.extend(data)
+        if self.stx is not None and self.etx is not None:
+            frames = self._split_stx_etx()
+        elif self.frame_length:
+            frames = self._split_fixed()
+        else:
+            frames = self._split_terminated()
+        if len(self._buffer) > self.max_frame_size:
+            # Garbage or a wrong framing setting: never let the buffer grow without bound.
+            self.overflows += 1
+            self.reset()
+        self.frames += len(frames)
+        return frames
+
+    def _find_terminator(self, data, start):
+        '''Returns (position, length) of the first terminator in data from start, or (-1, 0).'''
+        end = -1
+        term_len = 0
+        for term in self.terminators:
+            pos = data.find(term, start)
+            if pos >= 0 and (end < 0 or pos < end):
+                end, term_len = pos, len(term)
+        return end, term_len
+
+    def _split_lines(self, data):
+        '''Complete terminated frames in data; an unterminated tail is dropped.'''
+        frames = []
+        start = 0
+        while True:
+            end, term_len = self._find_terminator(data, start)
+            if end < 0:
+                return frames
+            frame = data[start:end]
+            start = end + term_len
+            if frame.strip():
+                frames.append(frame)
+
+    def _split_terminated(self):
+        frames = []
+        buffer = self._buffer
+        while True:
+            end, term_len = self._find_terminator(buffer, self._scan_from)
+            if end < 0:
+                # Only rescan the tail that could still hold the start of a multi-byte terminator.
+                longest = max((len(t) for t in self.terminators), default=1)
+                self._scan_from = max(0, len(buffer) - longest + 1)
+                return frames
+            frame = bytes(buffer[:end])
+            del buffer[:end + term_len]
+            self._scan_from = 0
+            if frame.strip():
+                frames.append(frame)
+
+    def _split_fixed(self):
+        frames = []
+        buffer = self._buffer
+        size = self.frame_length
+        while len(buffer) >= size:
+            frames.append(bytes(buffer[:size]))
+            del buffer[:size]
+        return frames
+
+    def _split_stx_etx(self):
+        frames = []
+        buffer = self._buffer
+        while True:
+            start = buffer.find(self.stx)
+            if start < 0:
+                if self.terminators:
+                    # Mixed mode: readers that also send plain CR/LF terminated tags.
+                    return frames + self._split_terminated()
+                # Bytes outside a frame are noise (greetings, stray line endings).
+                buffer.clear()
+                self._scan_from = 0
+                return frames
+            if start:
+                if self.terminators:
+                    # Mixed mode: plain lines received ahead of the STX are frames too.
+                    frames.extend(self._split_lines(bytes(buffer[:start])))
+                del buffer[:start]
+                self._scan_from = 0
+            end = buffer.find(self.etx, max(1, self._scan_from))
+            if end < 0:
+                self._scan_from = len(buffer)
+                return frames
+            frames.append(bytes(buffer[1:end]))
+            del buffer[:end + 1]
+            self._scan_from = 0
@@ -1,76 +1,75 @@
 # pylint: skip-file
+import logging
 import time
 import threading
 from shared.serial_listener import SerialReader  # Adjust this to your actual import path
 
+log = logging.getLogger(__name__)
+
 class SerialDataHandler:
     '''Class to handle storing received data.'''
-    def __init__(self, port=None):
-        print(f"Initializing SerialDataHandler on port: {port}")
+    def __init__(self, port=None, on_data=None):
+        log.debug("Initializing SerialDataHandler on port: %s", port)
         self.reader = SerialReader(timeout=1, port=port)
         self.received_data = []
         self._running = False
         self.lock = threading.Lock()
         self.listener_thread = None
+        # Optional callback(text) run on the serial engine thread for each received frame.
+        self.on_data = on_data
+
+    def _store(self, serial_data):
+        '''Decodes one frame from the reader and stores it (engine thread).'''
+        try:
+            decoded_data = serial_data.decode('utf-8', errors='ignore').strip()
+        except Exception as e:
+            log.warning("Error decoding serial data: %s", e)
+            return
+        if not decoded_data:
+            return
+        log.debug("Serial frame: %s", decoded_data)
+        with self.lock:
+            self.received_data.append(decoded_data)
+        if self.on_data is not None:
+            self.on_data(decoded_data)
 
     def poll_serial_data(self):
-        '''Polls the serial reader and stores any received data.'''
+        '''Moves any frames queued before start() into the stored data.'''
         try:
-            serial_data = self.reader.get_data()
-            if serial_data is not None:
-                decoded_data = serial_data.decode('utf-8').strip()
-                with self.lock:
-                    self.received_data.append(decoded_data)
-                print(f"Received data: {decoded_data}")
+            serial_data = self.reader.get_data() if self.reader else None
+            while serial_data is not None:
+                self._store(serial_data)
+                serial_data = self.reader.get_data()
         except Exception as e:
-            print(f"Error polling serial data: {e}")
-            self._running = False  # Stop on error
+            log.error("Error polling serial data: %s", e)
 
     def start(self):
-        '''Starts polling for serial data in a loop.'''
+        '''Starts storing frames as the serial engine delivers them (no polling thread).'''
         if self._running:
-            print("⚠️ SerialDataHandler is already running!")
+            log.warning("SerialDataHandler is already running")
+            return
+        if not self.reader:
             return
-        
-        self._running = True
-        print("🔄 SerialDataHandler started listening...")
-
-        def listen_loop():
-            while self._running:
-                if not self.reader:  # Check if reader was closed
-                    break
-                self.poll_serial_data()
-                time.sleep(0.1)  # Shorter sleep for more responsive stopping
-            print("🛑 Listen loop ended")
 
-        self.listener_thread = threading.Thread(target=listen_loop, daemon=True)
-        self.listener_thread.start()
+        self._running = True
+        self.reader.set_frame_handler(self._store)
+        log.debug("SerialDataHandler started listening")
 
     def stop(self):
         '''Stops the serial reader and cleanup.'''
-        print("📥 Stopping SerialDataHandler...")
+        log.debug("Stopping SerialDataHandler")
         self._running = False
-        
-        # Wait for listener thread to finish
-        if self.listener_thread and self.listener_thread.is_alive():
-            try:
-                self.listener_thread.join(timeout=2)
-                if self.listener_thread.is_alive():
-                    print("⚠️ Warning: Listener thread did not stop cleanly")
-            except Exception as e:
-                print(f"Error joining listener thread: {e}")
 
         # Close the reader
         if self.reader:
             try:
                 self.reader.close()
             except Exception as e:
-                print(f"Error closing reader: {e}")
+                log.error("Error closing reader: %s", e)
             finally:
                 self.reader = None
 
-        self.listener_thread = None
-        print("✅ SerialDataHandler stopped")
+        log.debug("SerialDataHandler stopped")
 
     def close(self):
         '''Alias for stop() for compatibility.'''
@@ -1,14 +1,16 @@
 # pylint: skip-file
-import os
+import logging
 import serial
-import threading
 from queue import Queue
 from shared.serial_port_controller import SerialPortController
+from shared.serial_engine import SerialIOEngine
+
+log = logging.getLogger(__name__)
 
 class SerialReader:
     def __init__(self, timeout=1, port=None):
-        '''Initializes the serial reader, opens the connection, and starts the listening thread.'''
-        print(f"Initializing SerialReader with port: {port}")
+        '''Initializes the serial reader, opens the connection, and subscribes it to the shared I/O engine.'''
+        log.debug("Initializing SerialReader with port %s", port)
         self.timeout = timeout
         self.data_queue = Queue()
         self.running = False  # Start as False until explicitly started
@@ -16,7 +18,10 @@ class SerialReader:
         self.settings = self.port_controller.retrieve_setting(port)
         self.thread = None
         self.ser = None
-        print(f"Settings: {self.settings}")
+        self.decoder = None
+        self.subscription = None
+        self.frame_handler = None
+        log.debug("Settings: %s", self.settings)
         
         if self.settings:
             try:
@@ -29,45 +34,49 @@ class SerialReader:
                     stopbits=self.port_controller.stop_bits,
                     timeout=timeout
                 )
-                
-                # Start the listener thread
-                self.running = True  # Set to True before starting thread
-                self.thread = threading.Thread(target=self.read_from_serial)
-                self.thread.daemon = True
-                self.thread.start()
+                # Frames are emitted as soon as their delimiter arrives instead of after a readline() timeout.
+                self.decoder = self.port_controller.get_frame_decoder()
+
+                # All ports share one engine thread instead of a reader thread each.
+                self.running = True
+                self.subscription = SerialIOEngine.instance().subscribe(
+                    self.ser, self._on_frame, decoder=self.decoder, on_error=self._on_error,
+                    driver=self.port_controller.driver_name, framing=self.port_controller.framing
+                )
 
             except serial.SerialException as e:
-                print(f"Failed to initialize serial port: {e}")
+                log.warning("Failed to initialize serial port %s: %s", self.port_controller.reader_port, e)
                 self.ser = None
         else:
-            print("Error: Serial settings could not be loaded.")
+            log.warning("Serial settings for %s could not be loaded", port)
             self.ser = None
 
-    def read_from_serial(self):
-        '''Runs in a background thread to read from the serial port.'''
-        while self.running:
+    def _on_frame(self, frame):
+        '''Engine callback: hands a complete frame to the handler, or queues it for get_data().'''
+        handler = self.frame_handler
+        if handler is not None:
+            handler(frame)
+        else:
+            self.data_queue.put(frame)
+
+    def _on_error(self, error):
+        '''Engine callback when the port fails (unplugged device, closed descriptor).'''
+        if self.running:
+            log.warning("Error reading from serial port: %s", error)
+        self.running = False
+
+    def set_frame_handler(self, handler):
+        '''Delivers frames straight to handler(frame) on the engine thread, draining anything queued.'''
+        self.frame_handler = handler
+        while handler is not None and not self.data_queue.empty():
             try:
-                if self.ser and self.ser.is_open:
-                    line = self.ser.readline()
-                    if line:
-                        self.data_queue.put(line)
-                else:
-                    print("Serial port is not open, stopping reader thread")
-                    break
-            except serial.SerialException as e:
-                # Expected during shutdown when the port is intentionally closed.
-                if self.running:
-                    print(f"Error reading from serial port: {e}")
-                break  # Exit the thread on serial error
-            except OSError as e:
-                # Expected on some platforms during close() race (e.g., Bad file descriptor).
-                if self.running:
-                    print(f"Error reading from serial port: {e}")
+                handler(self.data_queue.get_nowait())
+            except Exception:
                 break
-            except Exception as e:
-                print(f"Unexpected error in read_from_serial: {e}")
-                break
-        print("Serial reader thread stopped")
+
+    def is_connected(self):
+        '''True while the port is open and attached to the engine.'''
+        return bool(self.ser is not None and self.subscription is not None and self.subscription.active)
 
     def get_data(self):
         '''Checks if there's data in the queue and returns it.'''
@@ -75,33 +84,31 @@ class SerialReader:
             if not self.data_queue.empty():
                 return self.data_queue.get_nowait()
         except Exception as e:
-            print(f"Error getting data from queue: {e}")
+            log.warning("Error getting data from queue: %s", e)
         return None
 
     def close(self):
         '''Stops the serial reader and closes the connection.'''
-        print("Closing serial reader...")
-        self.running = False  # Signal thread to stop
+        log.debug("Closing serial reader")
+        self.running = False
+        self.frame_handler = None
 
-        # Close serial port
-        if self.ser:
+        # Detaching from the engine also closes the port.
+        if self.subscription is not None:
+            try:
+                self.subscription.close()
+            except Exception:
+                log.exception("Error closing serial port")
+            finally:
+                self.subscription = None
+        elif self.ser:
             try:
                 if self.ser.is_open:
                     self.ser.close()
-            except Exception as e:
-                print(f"Error closing serial port: {e}")
-            finally:
-                self.ser = None
+            except Exception:
+                log.exception("Error closing serial port")
+        self.ser = None
 
-        # Wait for thread to finish
-        if self.thread and self.thread.is_alive():
-            try:
-                self.thread.join(timeout=2)  # Wait up to 2 seconds
-                if self.thread.is_alive():
-                    print("Warning: Serial reader thread did not stop cleanly")
-            except Exception as e:
-                print(f"Error joining thread: {e}")
-        
         # Clear any remaining data
         while not self.data_queue.empty():
             try:
@@ -109,8 +116,7 @@ class SerialReader:
             except:
                 pass
 
-        self.thread = None
-        print("Serial reader closed")
+        log.debug("Serial reader closed")
 
     def get_settings(self):
         return self.settings
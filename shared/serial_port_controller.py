@@ -7,13 +7,122 @@ Virtual testing requires two virtual port, one for reading, one for
 writing. In order to do so, you must have both port established before
 you write to a port, else reading from the reader port will return
 nothing even if you write to writer port already
+
+Port enumeration is shared: every controller reads from one cached
+inventory snapshot (see get_port_inventory) that is refreshed after
+PORT_CACHE_TTL seconds or when invalidate_port_cache() is called.
 '''
 import os
 import glob
+import logging
 import platform
+import threading
+import time
+from collections import namedtuple
 import serial
 import serial.tools.list_ports
 from shared.file_utils import get_resource_path
+from shared.device_drivers import get_driver
+
+log = logging.getLogger(__name__)
+
+# Seconds a port inventory snapshot stays valid before comports() is queried again.
+PORT_CACHE_TTL = 2.0
+
+# Single detailed record describing one enumerated serial port.
+PortInfo = namedtuple(
+    "PortInfo",
+    ["device", "description", "hwid", "vid", "pid", "manufacturer", "product", "serial_number"],
+)
+
+_port_cache_lock = threading.Lock()
+_port_cache = {}
+# In-process virtual ports (see shared.virtual_devices), keyed by device path.
+_virtual_ports = {}
+
+
+def _text_field(port_, name):
+    '''Returns a string attribute of a pyserial port object, or "" when missing.'''
+    value = getattr(port_, name, "")
+    return value if isinstance(value, str) else ""
+
+
+def _int_field(port_, name):
+    '''Returns an integer attribute of a pyserial port object, or None when missing.'''
+    value = getattr(port_, name, None)
+    return value if isinstance(value, int) else None
+
+
+def _to_port_info(port_):
+    '''Converts a pyserial ListPortInfo (or compatible object) into a PortInfo record.'''
+    return PortInfo(
+        device=_text_field(port_, "device"),
+        description=_text_field(port_, "description"),
+        hwid=_text_field(port_, "hwid"),
+        vid=_int_field(port_, "vid"),
+        pid=_int_field(port_, "pid"),
+        manufacturer=_text_field(port_, "manufacturer"),
+        product=_text_field(port_, "product"),
+        serial_number=_text_field(port_, "serial_number"),
+    )
+
+
+def _enumerate_ports(comports_fn):
+    '''Runs one full enumeration and returns a tuple of PortInfo records.
+
+    Linux-specific note: Some USB serial devices (e.g. RFID readers / balances) intermittently fail to appear in
+    pyserial.tools.list_ports results on certain distributions (udev timing or driver latency). As a fallback on
+    Linux we manually glob common device patterns if the primary enumeration returns nothing. This has no impact
+    on Windows/macOS because the fallback only runs when platform.system() == 'Linux'.'''
+    records = [_to_port_info(port_) for port_ in comports_fn()]
+    # Linux fallback if pyserial returns nothing
+    if not records and platform.system() == 'Linux':
+        for pattern in ("/dev/ttyUSB*", "/dev/ttyACM*"):
+            for dev in glob.glob(pattern):
+                if dev not in [p.device for p in records]:
+                    records.append(PortInfo(dev, "Unknown (glob fallback)", "", None, None, "", "", ""))
+    known = {p.device for p in records}
+    records.extend(info for device, info in _virtual_ports.items() if device not in known)
+    return tuple(records)
+
+
+def get_port_inventory(comports_fn=None, max_age=None):
+    '''Returns the cached PortInfo snapshot for comports_fn, re-enumerating once it is older than max_age.
+
+    The snapshot is shared by every controller using the same enumeration function, so a burst of
+    lookups (settings, device cards, classification) costs a single comports() call.'''
+    comports_fn = comports_fn or serial.tools.list_ports.comports
+    ttl = PORT_CACHE_TTL if max_age is None else max_age
+    with _port_cache_lock:
+        cached = _port_cache.get(comports_fn)
+        if cached is not None and time.monotonic() - cached[0] < ttl:
+            return cached[1]
+        snapshot = _enumerate_ports(comports_fn)
+        _port_cache[comports_fn] = (time.monotonic(), snapshot)
+        return snapshot
+
+
+def register_virtual_ports(records):
+    '''Makes in-process virtual ports (PortInfo records) discoverable like regular system ports.'''
+    with _port_cache_lock:
+        for info in records:
+            _virtual_ports[info.device] = info
+        _port_cache.clear()
+
+
+def unregister_virtual_ports(devices):
+    '''Removes virtual ports previously added with register_virtual_ports.'''
+    with _port_cache_lock:
+        for device in devices:
+            _virtual_ports.pop(device, None)
+        _port_cache.clear()
+
+
+def invalidate_port_cache():
+    '''Drops every cached port snapshot so the next lookup re-enumerates (e.g. after a device is plugged in).'''
+    with _port_cache_lock:
+        _port_cache.clear()
+
 
 class SerialPortController():
     '''Serial Port control functions.'''
@@ -26,36 +135,24 @@ class SerialPortController():
         self.flow_control = None
         self.writer_port = None
         self.reader_port = None
+        self.driver_name = None
+        self.framing = None
         self.comports_fn = comports_fn or serial.tools.list_ports.comports
-        print(f"🔍 Initializing SerialPortController with setting type: {setting_type}")
+        log.debug("Initializing SerialPortController with setting type %s", setting_type)
         self.retrieve_setting(setting_type)
 
+    def get_port_snapshot(self):
+        '''Returns the current PortInfo records, excluding ports this controller already has open.'''
+        in_use = {getattr(port_, "port", port_) for port_ in self.ports_in_used}
+        return [info for info in get_port_inventory(self.comports_fn) if info.device not in in_use]
+
+    def invalidate_ports(self):
+        '''Forces the next port lookup to re-enumerate the system ports.'''
+        invalidate_port_cache()
+
     def get_available_ports(self):
-        '''Returns a list of available system ports.
-        Linux-specific note: Some USB serial devices (e.g. RFID readers / balances) intermittently fail to appear in
-        pyserial.tools.list_ports results on certain distributions (udev timing or driver latency). As a fallback on
-        Linux we manually glob common device patterns if the primary enumeration returns nothing. This has no impact
-        on Windows/macOS because the fallback only runs when platform.system() == 'Linux'.'''
-        ports = list(self.comports_fn())
-        available_ports = []
-        # Linux fallback if pyserial returns nothing
-        if not ports and platform.system() == 'Linux':
-            # fallback addresses intermittent pyserial empty list issue
-            for pattern in ("/dev/ttyUSB*", "/dev/ttyACM*"):
-                for dev in glob.glob(pattern):
-                    # Avoid duplicates if device somehow also in ports later
-                    if dev not in [p.device for p in ports]:
-                        # Create a lightweight shim with .device and .description attributes
-                        class _Shim:  # noqa: D401 short-lived internal helper
-                            def __init__(self, device):
-                                self.device = device
-                                self.description = "Unknown (glob fallback)"
-                        ports.append(_Shim(dev))
-        for port_ in ports:
-            if port_ in self.ports_in_used:
-                continue
-            available_ports.append((port_.device, getattr(port_, 'description', '')))  # robust attribute access
-        return available_ports
+        '''Returns a list of available system ports as (device, description) tuples.'''
+        return [(info.device, info.description) for info in self.get_port_snapshot()]
 
     def get_available_ports_detailed(self):
         """Returns a list of available ports with extra metadata (best-effort).
@@ -70,55 +167,28 @@ class SerialPortController():
         This is useful for auto-detection based on USB/serial descriptors without requiring users
         to pre-configure a COM port.
         """
-        ports = list(self.comports_fn())
-        detailed = []
-        for port_ in ports:
-            if port_ in self.ports_in_used:
-                continue
-            detailed.append(
-                {
-                    "device": getattr(port_, "device", None),
-                    "description": getattr(port_, "description", "") or "",
-                    "hwid": getattr(port_, "hwid", "") or "",
-                    "vid": getattr(port_, "vid", None),
-                    "pid": getattr(port_, "pid", None),
-                    "manufacturer": getattr(port_, "manufacturer", "") or "",
-                    "product": getattr(port_, "product", "") or "",
-                    "serial_number": getattr(port_, "serial_number", "") or "",
-                }
-            )
-        return detailed
+        return [info._asdict() for info in self.get_port_snapshot()]
 
     def get_available_ports_name(self):
         '''Returns a list of available system ports.'''
-        available_ports = []
-        ports = list(serial.tools.list_ports.comports())
-        for port_ in ports:
-            if port_ in self.ports_in_used:       #prevention
-                pass
-            else:
-                available_ports.append(f'{port_.device}')
-        return available_ports
+        return [info.device for info in self.get_port_snapshot()]
 
     def get_num_ports(self):
         '''Returns the number of available ports.'''
-        return len(list(serial.tools.list_ports.comports()))
+        return len(get_port_inventory(self.comports_fn))
 
     def get_virtual_port(self):
         '''Returns a list of available virtual ports across platforms.'''
         virtual_ports = []
-        ports = list(serial.tools.list_ports.comports())
-        for port_ in ports:
-            description = getattr(port_, "description", "")
-            device = getattr(port_, "device", "")
-            words = description.split(" ")
+        for info in get_port_inventory(self.comports_fn):
+            words = info.description.split(" ")
             # Windows virtual pairs via com0com
             if "com0com" in words:
-                virtual_ports.append(port_.device)
+                virtual_ports.append(info.device)
                 continue
             # macOS/Linux pseudo terminals (commonly used with socat)
-            if device.startswith("/dev/pts/") or device.startswith("/dev/ttys"):
-                virtual_ports.append(device)
+            if info.device.startswith("/dev/pts/") or info.device.startswith("/dev/ttys"):
+                virtual_ports.append(info.device)
         return virtual_ports
 
     def _choose_fallback_port(self, available_ports):
@@ -147,14 +217,14 @@ class SerialPortController():
         if configured_port and configured_port.upper().startswith("COM") and platform.system() != "Windows":
             fallback = self._choose_fallback_port(available_ports)
             if fallback:
-                print(f"⚠️ Configured port {configured_port} unavailable on {platform.system()}, using {fallback}")
+                log.warning("Configured port %s unavailable on %s, using %s", configured_port, platform.system(), fallback)
                 return fallback
 
         # Generic fallback: pick first available when configured value is stale.
         if configured_port and configured_port not in available_names:
             fallback = self._choose_fallback_port(available_ports)
             if fallback:
-                print(f"⚠️ Configured port {configured_port} not found, using {fallback}")
+                log.warning("Configured port %s not found, using %s", configured_port, fallback)
                 return fallback
         return configured_port
 
@@ -207,9 +277,9 @@ class SerialPortController():
                 stopbits=self.stop_bits,
                 timeout=1
             )
-            print(f"Reader port {port_name} opened successfully.")
+            log.debug("Reader port %s opened", port_name)
         except serial.SerialException as e:
-            print(f"Failed to open reader port {port_name}: {e}")
+            log.warning("Failed to open reader port %s: %s", port_name, e)
 
     def get_port(self, settings_list):
         '''Returns the port from the settings list.'''
@@ -218,29 +288,37 @@ class SerialPortController():
         else:
             return None
 
-    def read_data(self):
-        '''Returns the data read from the reader port as a string.'''
-        port = self.reader_port
-        baudrate = self.baud_rate
-        bytesize = self.byte_size
-        parity = self.parity
-        stopbits = self.stop_bits
-        ser = serial.Serial(port, baudrate, bytesize, parity, stopbits)
-
-        if self.reader_port:
-            try:
-                reader_data = ser.read(19)
-                second_measurement = reader_data[10:20]
-                decoded_second_measurement = second_measurement.decode('ascii')
-                print(reader_data)
-                print(second_measurement)
-                print(decoded_second_measurement)
-                return decoded_second_measurement
-            except Exception as e:
-                print(f"Error reading from serial port: {e}")
-                return None
-            finally:
-                ser.close()
+    def get_driver(self):
+        '''Returns a fresh protocol driver for this device (see shared.device_drivers).'''
+        return get_driver(self.driver_name)
+
+    def get_frame_decoder(self):
+        '''Returns a FrameDecoder for this device from the configured framing, or the driver defaults.'''
+        return self.get_driver().make_decoder(self.framing)
+
+    def read_data(self, timeout=1.0):
+        '''Returns one value read from the reader port through the configured protocol driver.
+
+        Drivers that support a request command poll the device; streaming devices are read until
+        one complete frame parses. Returns the value as a string, or None on timeout/error.'''
+        if not self.reader_port:
+            return None
+        port_name = getattr(self.reader_port, "port", self.reader_port)
+        try:
+            ser = serial.Serial(port_name, self.baud_rate, self.byte_size, self.parity, self.stop_bits,
+                                timeout=min(timeout, 0.2))
+        except Exception as e:
+            log.warning("Error opening serial port %s: %s", port_name, e)
+            return None
+        try:
+            driver = self.get_driver()
+            reading = driver.request_reading(ser, timeout=timeout, decoder=driver.make_decoder(self.framing))
+            return None if reading is None else str(reading.value)
+        except Exception:
+            log.exception("Error reading from serial port %s", port_name)
+            return None
+        finally:
+            ser.close()
 
     def write_to(self, message: str):
         '''Writes message to the writer port as bytes.'''
@@ -275,7 +353,7 @@ class SerialPortController():
         try:
             self.set_reader_port(port)
         except Exception as e:
-            print(e)
+            log.warning("Could not reopen reader port %s: %s", port, e)
 
     def retrieve_setting(self, setting_type):
         '''Sets the setting of the serial port opened by converting the
@@ -291,17 +369,17 @@ class SerialPortController():
             setting_folder = "device"
         else:
             if setting_type is not None:
-                print("Invalid setting type. Must be 'reader' or 'device'.")
+                log.warning("Invalid setting type %r; must be 'reader' or 'device'", setting_type)
             return
 
         # Build the full path to the preference file using the already-resolved.
         # base_preference_dir to avoid double-wrapping the path with
         # get_resource_path (which would produce incorrect paths).
         preference_path = os.path.join(base_preference_dir, setting_folder, setting_file)
-        print(f"🔍 Looking for settings in: {preference_path}")
+        log.debug("Looking for settings in %s", preference_path)
 
         if not os.path.exists(preference_path):
-            print(f"Preference file {preference_path} not found.")
+            log.warning("Preference file %s not found", preference_path)
             return
 
         try:
@@ -312,15 +390,15 @@ class SerialPortController():
                 settings_path = get_resource_path(os.path.join("settings", "serial ports", settings_file_name))
 
                 if not os.path.exists(settings_path):
-                    print(f"Settings file {settings_path} not found.")
+                    log.warning("Settings file %s not found", settings_path)
                     return
 
                 with open(settings_path, "r", encoding="utf-8") as settings_file:
                     settings = settings_file.readline().strip().split(',')
-                    print("Successfully retrieved settings:", settings)
+                    log.debug("Retrieved %s settings: %s", setting_type, settings)
 
                     if len(settings) < 7:
-                        print("Error: settings must have at least 7 elements.")
+                        log.warning("Settings in %s must have at least 7 elements", settings_path)
                         return
 
                     self.baud_rate = int(settings[0])
@@ -329,10 +407,18 @@ class SerialPortController():
                     self.flow_control = 1 if settings[2] == "Xon/Xoff" else 2 if settings[2] == "Hardware" else None
                     self.stop_bits = getattr(serial, f"STOPBITS_{settings[4].replace('.', '_').upper()}", serial.STOPBITS_ONE)
                     self.reader_port = self.resolve_port_name(settings[6])
+                    # Optional 8th column: protocol driver name (older files default to generic/rfid).
+                    if len(settings) > 7 and settings[7].strip():
+                        self.driver_name = settings[7].strip()
+                    elif setting_type == "reader":
+                        self.driver_name = "rfid"
+                    # Optional 9th column: frame delimiters (see shared.serial_framing.FRAMING_CHOICES).
+                    if len(settings) > 8 and settings[8].strip():
+                        self.framing = settings[8].strip()
                     return settings
 
-        except Exception as e:
-            print(f"An error occurred while retrieving settings: {e}")
+        except Exception:
+            log.exception("An error occurred while retrieving %s settings", setting_type)
 
     def classify_ports(self):
         '''Classifies available ports into categories: rfid, balance, unknown.
@@ -10,6 +10,8 @@ from customtkinter import *
 from tkinter import messagebox
 from shared.tk_models import SettingPage
 from shared.serial_port_controller import *
+from shared.device_drivers import available_drivers
+from shared.serial_framing import FRAMING_CHOICES
 
 class SerialPortSetting(SettingPage):
     '''a class that implements methods and functions
@@ -46,6 +48,9 @@ class SerialPortSetting(SettingPage):
         self.data_bits_var = StringVar(value="")
         self.stop_bits_var = StringVar(value="")
         self.input_bype_var = StringVar(value="")
+        self.default_protocol = "rfid" if self.preference == "reader" else "generic"
+        self.protocol_var = StringVar(value=self.default_protocol)
+        self.framing_var = StringVar(value="Auto")
 
         if preference:
             if self.preference == "device":
@@ -224,12 +229,28 @@ class SerialPortSetting(SettingPage):
         self.binary_button.grid(row=10, column=1, padx=20, pady=5, sticky="ew")
         self.text_button.grid(row=10, column=2, padx=20, pady=5, sticky="ew")
 
+        # Protocol driver section
+        self.protocol_label = CTkLabel(self.edit_region, text="Protocol", height=12)
+        self.protocol_menu = CTkOptionMenu(self.edit_region, height=12,
+                                           values=available_drivers(),
+                                           variable=self.protocol_var)
+        self.protocol_label.grid(row=11, column=0, padx=20, pady=5, sticky="ew")
+        self.protocol_menu.grid(row=11, column=1, columnspan=2, padx=20, pady=5, sticky="ew")
+
+        # Frame delimiter section
+        self.framing_label = CTkLabel(self.edit_region, text="Frame End", height=12)
+        self.framing_menu = CTkOptionMenu(self.edit_region, height=12,
+                                          values=FRAMING_CHOICES,
+                                          variable=self.framing_var)
+        self.framing_label.grid(row=12, column=0, padx=20, pady=5, sticky="ew")
+        self.framing_menu.grid(row=12, column=1, columnspan=2, padx=20, pady=5, sticky="ew")
+
         # button
         self.save_button = CTkButton(self.edit_region, text="Save", command=self.save, height=14)
-        self.save_button.grid(row=11, column=2, padx=20, pady=5, sticky="ns")
+        self.save_button.grid(row=13, column=2, padx=20, pady=5, sticky="ns")
 
         self.back_to_summary_button = CTkButton(self.edit_region, text="Back to Summary", command=self.go_to_summary_page, height=14)
-        self.back_to_summary_button.grid(row=11, column=1, padx=20, pady=5, sticky="ns")
+        self.back_to_summary_button.grid(row=13, column=1, padx=20, pady=5, sticky="ns")
 
         if not isinstance(controller, SerialPortController):
             self.serial_port_controller = SerialPortController(self.preference)
@@ -275,8 +296,18 @@ class SerialPortSetting(SettingPage):
         self.input_byte_label.grid(row=6, column=0, padx=20, pady=5, sticky="ew")
         self.current_input_byte.grid(row=6, column=2, padx=20, pady=5, sticky="ew")
 
+        self.protocol_label = CTkLabel(self.summary_section, text="Protocol")
+        self.current_protocol = CTkLabel(self.summary_section, text=self.protocol_var.get())
+        self.protocol_label.grid(row=7, column=0, padx=20, pady=5, sticky="ew")
+        self.current_protocol.grid(row=7, column=2, padx=20, pady=5, sticky="ew")
+
+        self.framing_label = CTkLabel(self.summary_section, text="Frame End")
+        self.current_framing = CTkLabel(self.summary_section, text=self.framing_var.get())
+        self.framing_label.grid(row=8, column=0, padx=20, pady=5, sticky="ew")
+        self.current_framing.grid(row=8, column=2, padx=20, pady=5, sticky="ew")
+
         self.edit_button = CTkButton(self.summary_section, text="Edit", command=self.edit)
-        self.edit_button.grid(row=8, column=2, padx=20, pady=40, sticky="ns")
+        self.edit_button.grid(row=9, column=2, padx=20, pady=40, sticky="ns")
 
         #pylint: enable=line-too-long
 
@@ -295,7 +326,9 @@ class SerialPortSetting(SettingPage):
             self.data_bits_var.get(),
             self.stop_bits_var.get(),
             self.input_bype_var.get(),
-            self.serial_port.get()
+            self.serial_port.get(),
+            self.protocol_var.get(),
+            self.framing_var.get()
         ]
 
         base_path = self.get_write_path()
@@ -391,6 +424,8 @@ class SerialPortSetting(SettingPage):
                     self.stop_bits_var.set(line[4])
                     self.input_bype_var.set(line[5])
                     self.serial_port.set(line[6])
+                    self.protocol_var.set(line[7] if len(line) > 7 and line[7] else self.default_protocol)
+                    self.framing_var.set(line[8] if len(line) > 8 and line[8] else "Auto")
         except Exception as e:
             print(f"Error loading configuration: {e}")
 
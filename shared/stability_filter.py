@@ -0,0 +1,79 @@
+'''Stability gating for streaming measurement devices.
+
+A balance in continuous mode sends several readings per second while an
+animal settles on the pan. StabilityFilter lets only the settled value
+through: a value is committed once `samples` consecutive readings agree
+within `tolerance` inside `window` seconds (or immediately when the device
+itself flags the reading as stable). Everything else is coalesced, and the
+counters report how many samples were dropped.
+'''
+import time
+from collections import deque
+
+
+class StabilityFilter:
+    '''Per-device filter that turns a stream of readings into settled values.'''
+
+    def __init__(self, samples=3, tolerance=0.05, window=2.0):
+        self.samples = max(1, int(samples))
+        self.tolerance = float(tolerance)
+        self.window = float(window)
+        self.received = 0
+        self.committed = 0
+        self.coalesced_since_commit = 0
+        self._run = deque()
+        self._last_committed = None
+
+    @property
+    def coalesced(self):
+        '''Total samples dropped instead of committed.'''
+        return self.received - self.committed
+
+    def reset(self):
+        '''Starts over for a new animal; the next settled value commits even if it repeats.'''
+        self._run.clear()
+        self._last_committed = None
+        self.coalesced_since_commit = 0
+
+    def add(self, value, stable=None, now=None):
+        '''Feeds one reading. Returns the settled value to commit, or None if the sample was coalesced.
+
+        stable is the device's own flag: False never commits, True commits without waiting for
+        a run, None (no flag in the protocol) relies on the samples/tolerance/window rule.'''
+        now = time.monotonic() if now is None else now
+        self.received += 1
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            return self._drop()
+
+        if stable is False:
+            self._run.clear()
+            return self._drop()
+
+        while self._run and now - self._run[0][0] > self.window:
+            self._run.popleft()
+        if self._run and abs(value - self._run[0][1]) > self.tolerance:
+            self._run.clear()
+        self._run.append((now, value))
+
+        if stable is not True and len(self._run) < self.samples:
+            return self._drop()
+
+        self._run.clear()
+        if self._last_committed is not None and abs(value - self._last_committed) <= self.tolerance:
+            # Same plateau as the value already committed for this animal.
+            return self._drop()
+        self._last_committed = value
+        self.committed += 1
+        return value
+
+    def take_coalesced(self):
+        '''Returns the samples coalesced since the last call and clears the count.'''
+        count = self.coalesced_since_commit
+        self.coalesced_since_commit = 0
+        return count
+
+    def _drop(self):
+        self.coalesced_since_commit += 1
+        return None
@@ -0,0 +1,226 @@
+'''Owner of the application's background worker threads.
+
+Workers are started through the supervisor instead of threading.Thread so
+that a page (or the whole app) can stop all of its threads at once without
+blocking the Tk thread:
+
+    worker = ThreadSupervisor.instance().spawn("rfid-listener", listen, owner=self,
+                                               closers=[reader.stop])
+    ...
+    def listen(worker):
+        while worker.wait(timeout=5.0):       # returns False once stop is requested
+            ...                               # woken early by worker.wake()
+
+    ThreadSupervisor.instance().stop_owner(self)   # signal only, returns at once
+
+Stopping sets the worker's stop_event, wakes it, and runs its closers (which
+close ports or file descriptors so a blocking read returns). Workers never
+need to be joined from the UI; shutdown() signals every worker in parallel
+and waits for all of them against a single deadline.
+'''
+import logging
+import threading
+import time
+
+from shared.metrics import MetricsRegistry
+
+log = logging.getLogger(__name__)
+
+# Time shutdown() waits for all workers together before giving up on stragglers.
+SHUTDOWN_TIMEOUT = 0.1
+
+
+class SupervisedThread:
+    '''One worker thread; target(worker, *args) runs on it.'''
+
+    def __init__(self, supervisor, name, target, args=(), owner=None, closers=()):
+        self.supervisor = supervisor
+        self.name = name
+        self.owner = owner
+        self.stop_event = threading.Event()
+        self._wake = threading.Event()
+        self._closers = list(closers)
+        self._lock = threading.Lock()
+        self.started_at = None
+        self.stopped_at = None
+        self.finished_at = None
+        self.wakeups = 0
+        self.error = None
+        self._target = target
+        self._args = args
+        self.thread = threading.Thread(target=self._run, name=name, daemon=True)
+
+    def _run(self):
+        try:
+            self._target(self, *self._args)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            self.error = e
+            log.exception("Error in worker %s", self.name)
+        finally:
+            self.finished_at = time.monotonic()
+            self.supervisor._finished(self)
+
+    def start(self):
+        self.started_at = time.monotonic()
+        self.thread.start()
+        return self
+
+    def is_alive(self):
+        '''True while the worker's target is still running.'''
+        return self.thread.is_alive()
+
+    @property
+    def stopping(self):
+        '''True once stop() has been requested.'''
+        return self.stop_event.is_set()
+
+    def add_closer(self, closer):
+        '''Registers closer() to run on stop (e.g. closing a port the worker reads from).'''
+        with self._lock:
+            run_now = self.stopping
+            if not run_now:
+                self._closers.append(closer)
+        if run_now:
+            self._close(closer)
+
+    def wake(self):
+        '''Wakes the worker from wait() (call when new data is available; any thread).'''
+        self._wake.set()
+
+    def wait(self, timeout=None):
+        '''Sleeps until woken, stopped or timeout; returns False once stop has been requested.'''
+        if not self.stopping:
+            if self._wake.wait(timeout):
+                self.wakeups += 1
+            self._wake.clear()
+        return not self.stopping
+
+    def stop(self):
+        '''Requests the worker to stop and runs its closers; never blocks on the thread.'''
+        with self._lock:
+            if self.stopping:
+                return
+            self.stopped_at = time.monotonic()
+            self.stop_event.set()
+            closers, self._closers = self._closers, []
+        self._wake.set()
+        for closer in closers:
+            self._close(closer)
+
+    def _close(self, closer):
+        try:
+            closer()
+        except Exception:  # pylint: disable=broad-exception-caught
+            log.exception("Error closing resources of worker %s", self.name)
+
+    def join(self, timeout=None):
+        '''Waits for the thread to finish; returns True if it did.'''
+        if self.thread.ident is not None and self.thread is not threading.current_thread():
+            self.thread.join(timeout)
+        return not self.is_alive()
+
+    def metrics(self):
+        '''Snapshot of this worker's state.'''
+        now = time.monotonic()
+        end = self.finished_at or now
+        return {
+            "name": self.name,
+            "owner": type(self.owner).__name__ if self.owner is not None else None,
+            "alive": self.is_alive(),
+            "stopping": self.stopping,
+            "uptime_s": round(end - self.started_at, 3) if self.started_at else 0.0,
+            "stop_latency_ms": (round((self.finished_at - self.stopped_at) * 1000, 1)
+                                if self.finished_at and self.stopped_at else None),
+            "wakeups": self.wakeups,
+            "error": str(self.error) if self.error else None,
+        }
+
+
+class ThreadSupervisor:
+    '''Registry of live workers with parallel, bounded shutdown.'''
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._workers = set()
+        self.spawned = 0
+        self.finished = 0
+        self.abandoned = 0
+        self.last_shutdown_ms = None
+
+    @classmethod
+    def instance(cls):
+        '''Returns the process-wide supervisor.'''
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+                MetricsRegistry.instance().register_collector("threads", cls._instance.metrics)
+            return cls._instance
+
+    def spawn(self, name, target, *args, owner=None, closers=()):
+        '''Starts target(worker, *args) on a new daemon thread and returns the worker.'''
+        worker = SupervisedThread(self, name, target, args=args, owner=owner, closers=closers)
+        with self._lock:
+            self._workers.add(worker)
+            self.spawned += 1
+        return worker.start()
+
+    def _finished(self, worker):
+        with self._lock:
+            if worker in self._workers:
+                self._workers.discard(worker)
+                self.finished += 1
+
+    def workers(self, owner=None):
+        '''Live workers, optionally only those belonging to owner.'''
+        with self._lock:
+            workers = list(self._workers)
+        if owner is not None:
+            workers = [w for w in workers if w.owner is owner]
+        return workers
+
+    def stop_owner(self, owner, timeout=0):
+        '''Signals every worker of owner to stop; waits up to timeout for all of them together.'''
+        return self._stop_all(self.workers(owner), timeout)
+
+    def shutdown(self, timeout=SHUTDOWN_TIMEOUT):
+        '''Stops every worker in parallel; returns the names of workers still running at the deadline.'''
+        start = time.monotonic()
+        remaining = self._stop_all(self.workers(), timeout)
+        self.abandoned += len(remaining)
+        self.last_shutdown_ms = round((time.monotonic() - start) * 1000, 1)
+        for name in remaining:
+            log.warning("Worker %s did not stop within %ss (daemon thread left to exit)", name, timeout)
+        return remaining
+
+    @staticmethod
+    def _stop_all(workers, timeout):
+        for worker in workers:
+            worker.stop()
+        if not timeout:
+            return [w.name for w in workers if w.is_alive()]
+        deadline = time.monotonic() + timeout
+        for worker in workers:
+            worker.join(max(0.0, deadline - time.monotonic()))
+        return [w.name for w in workers if w.is_alive()]
+
+    def metrics(self):
+        '''Counters plus a snapshot of each live worker.'''
+        workers = self.workers()
+        return {
+            "live": len(workers),
+            "spawned": self.spawned,
+            "finished": self.finished,
+            "abandoned": self.abandoned,
+            "last_shutdown_ms": self.last_shutdown_ms,
+            "workers": sorted((w.metrics() for w in workers), key=lambda m: m["name"]),
+        }
+
+
+def shutdown_threads(timeout=SHUTDOWN_TIMEOUT):
+    '''Stops every supervised worker (app exit).'''
+    supervisor = ThreadSupervisor._instance
+    if supervisor is not None:
+        return supervisor.shutdown(timeout=timeout)
+    return []
@@ -135,6 +135,8 @@ class MouserPage(CTkFrame):
         self.menu_button = None
         self.next_button = None
         self.previous_button = None
+        self._size_job = None
+        self._torn_down = False
 
         if menu_page:
             self.menu_button = MenuButton(self, menu_page)
@@ -225,7 +227,28 @@ class MouserPage(CTkFrame):
         if window.winfo_width() != self.canvas.winfo_width():
             self.resize_canvas_width(window.winfo_width())
 
-        self.after(10, self.check_window_size)
+        if not self._torn_down:
+            self._size_job = self.after(10, self.check_window_size)
+
+    def refresh(self):
+        '''Reloads page data when a cached page is shown again.
+
+        Returns False when the page cannot be refreshed in place and must be rebuilt.'''
+        return True
+
+    def teardown(self):
+        '''Cancels the page's after jobs and destroys it; pages stop their threads before calling this.'''
+        self._torn_down = True
+        if self._size_job is not None:
+            try:
+                self.after_cancel(self._size_job)
+            except Exception:  # pylint: disable=broad-exception-caught
+                pass
+            self._size_job = None
+        try:
+            self.destroy()
+        except Exception:  # pylint: disable=broad-exception-caught
+            pass
 
     def resize_canvas_height(self, root_height):
         '''Resizes page height.'''
@@ -0,0 +1,162 @@
+'''Thread-safe hand-off of UI work to the Tk main thread.
+
+Background threads (serial listeners, device reads) must not touch widgets.
+Instead of each one scheduling its own after(0, ...) event, they post to the
+window's UIDispatcher, and a single periodic pump on the main thread runs the
+posted callbacks in batches:
+
+    ui = UIDispatcher.for_widget(self)          # once, on the main thread
+    ui.post(self._handle_scanned_rfid, tag)     # from any thread
+    ui.post(_update, key=(self, "status"))      # only the latest per key runs
+
+Keyed events replace any not-yet-run event with the same key, so a burst of
+status updates or table refreshes costs one redraw per tick. Unkeyed events
+run in order, at most max_batch per tick, so the UI load stays bounded under
+any input rate. Each callback's run time is recorded in the ui.callback_ms
+histogram.
+
+Every event has an owner (the callback's object for bound methods, or the
+owner= argument for closures); events whose owner widget was destroyed or
+is closing or torn down are skipped instead of raising TclError.
+'''
+import logging
+import time
+from collections import deque
+
+from shared.metrics import MetricsRegistry
+
+log = logging.getLogger(__name__)
+
+# Pump period in milliseconds (about 50 Hz).
+PUMP_INTERVAL_MS = 20
+# Unkeyed events run per tick; the rest wait for the next tick.
+MAX_BATCH = 200
+
+
+def _owner_alive(owner):
+    '''False once owner is closing (_is_closing), torn down (MouserPage._torn_down) or destroyed.'''
+    if owner is None:
+        return True
+    if getattr(owner, "_is_closing", False) or getattr(owner, "_torn_down", False):
+        return False
+    exists = getattr(owner, "winfo_exists", None)
+    if exists is None:
+        return True
+    try:
+        return bool(exists())
+    except Exception:  # pylint: disable=broad-exception-caught
+        return False
+
+
+class UIDispatcher:
+    '''Queue of callbacks posted from any thread, drained by a periodic main-thread pump.'''
+
+    def __init__(self, widget, interval_ms=PUMP_INTERVAL_MS, max_batch=MAX_BATCH):
+        self.widget = widget
+        self.interval_ms = interval_ms
+        self.max_batch = max_batch
+        # deque.append/popleft and dict item assignment/pop are atomic, so producers never block.
+        self._queue = deque()
+        self._keyed = {}
+        self._job = None
+        self.posted = 0
+        self.executed = 0
+        self.coalesced = 0
+        self.skipped = 0
+        self.ticks = 0
+        self.max_batch_seen = 0
+        self._callback_ms = MetricsRegistry.instance().histogram("ui.callback_ms")
+
+    @classmethod
+    def for_widget(cls, widget):
+        '''Returns the dispatcher of widget's top-level window, starting it on first use (main thread).'''
+        root = widget.winfo_toplevel()
+        dispatcher = getattr(root, "_ui_dispatcher", None)
+        if dispatcher is None:
+            dispatcher = cls(root)
+            setattr(root, "_ui_dispatcher", dispatcher)
+            MetricsRegistry.instance().register_collector("ui_dispatcher", dispatcher.metrics)
+            dispatcher.start()
+        return dispatcher
+
+    def post(self, callback, *args, key=None, owner=None):
+        '''Runs callback(*args) on the main thread at the next tick.
+
+        With a key, an earlier event with the same key that has not run yet is dropped.
+        The event is skipped if owner (default: the object of a bound method) is gone by then.'''
+        self.posted += 1
+        if owner is None:
+            owner = getattr(callback, "__self__", None)
+        if key is None:
+            self._queue.append((callback, args, owner))
+        else:
+            if key in self._keyed:
+                self.coalesced += 1
+            self._keyed[key] = (callback, args, owner)
+
+    def pending(self):
+        '''Number of events waiting for the pump.'''
+        return len(self._queue) + len(self._keyed)
+
+    def start(self):
+        '''Starts the periodic pump (call on the main thread).'''
+        if self._job is None:
+            self._job = self.widget.after(self.interval_ms, self._tick)
+
+    def stop(self):
+        '''Stops the pump; events still queued are discarded.'''
+        if self._job is not None:
+            try:
+                self.widget.after_cancel(self._job)
+            except Exception:  # pylint: disable=broad-exception-caught
+                pass
+            self._job = None
+        self._queue.clear()
+        self._keyed.clear()
+
+    def _tick(self):
+        self._job = None
+        self.pump()
+        try:
+            self._job = self.widget.after(self.interval_ms, self._tick)
+        except Exception:  # pylint: disable=broad-exception-caught
+            # The window was destroyed.
+            self._job = None
+
+    def pump(self):
+        '''Runs one batch of posted events; returns how many were taken off the queue.'''
+        self.ticks += 1
+        batch = []
+        while self._queue and len(batch) < self.max_batch:
+            batch.append(self._queue.popleft())
+        for key in list(self._keyed):
+            item = self._keyed.pop(key, None)
+            if item is not None:
+                batch.append(item)
+        skipped = 0
+        for callback, args, owner in batch:
+            if not _owner_alive(owner):
+                skipped += 1
+                continue
+            start = time.perf_counter()
+            try:
+                callback(*args)
+            except Exception:  # pylint: disable=broad-exception-caught
+                log.exception("Error in UI callback %s", getattr(callback, "__name__", callback))
+            self._callback_ms.observe((time.perf_counter() - start) * 1000.0)
+        self.executed += len(batch) - skipped
+        self.skipped += skipped
+        self.max_batch_seen = max(self.max_batch_seen, len(batch))
+        return len(batch)
+
+    def metrics(self):
+        '''Snapshot of the dispatcher's counters.'''
+        return {
+            "posted": self.posted,
+            "executed": self.executed,
+            "coalesced": self.coalesced,
+            "skipped": self.skipped,
+            "ticks": self.ticks,
+            "max_batch_seen": self.max_batch_seen,
+            "pending": self.pending(),
+        }
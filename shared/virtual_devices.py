@@ -0,0 +1,509 @@
+'''Pure-Python virtual serial devices built on os.openpty() (Linux/macOS).
+
+VirtualDeviceFarm emulates N RFID readers and M balances, each on its own
+pseudo-terminal, with configurable scan rates, jitter, framing styles and
+noisy settling curves. While a farm is running its ports are registered
+with SerialPortController, so the rest of the app (and the serial engine)
+sees them as regular ports:
+
+    with VirtualDeviceFarm(readers=4, balances=2, seed=1) as farm:
+        print(farm.ports())
+
+VirtualSerialPair links two pseudo-terminals back to back (a socat
+replacement used by the map RFID serial simulator).
+
+Headless throughput check:
+
+    python -m shared.virtual_devices --readers 4 --balances 2 --seconds 30
+'''
+import argparse
+import math
+import os
+import random
+import selectors
+import threading
+import time
+
+from shared.serial_framing import STX, ETX
+from shared.serial_port_controller import PortInfo, register_virtual_ports, unregister_virtual_ports
+
+# Framing styles a virtual RFID reader can emit.
+RFID_FRAMINGS = ("CR", "CRLF", "LF", "STX/ETX", "EM4100")
+# Output formats a virtual balance can speak (matching shared.device_drivers names).
+BALANCE_PROTOCOLS = ("generic", "sics", "and", "ohaus")
+
+_REQUEST_COMMANDS = {"sics": (b"SI", b"S"), "and": (b"Q",), "ohaus": (b"IP", b"P")}
+
+
+def pty_supported():
+    '''True when pseudo-terminals are available (not on Windows).'''
+    return hasattr(os, "openpty") and os.name == "posix"
+
+
+class VirtualPort:
+    '''One pseudo-terminal: the app opens .path, the emulator reads/writes the master fd.'''
+
+    def __init__(self, description):
+        import tty  # pylint: disable=import-outside-toplevel
+        self.master, self.slave = os.openpty()
+        # Raw mode: no echo and no newline translation, like a real serial line.
+        tty.setraw(self.slave)
+        os.set_blocking(self.master, False)
+        self.path = os.ttyname(self.slave)
+        self.description = description
+        self.bytes_written = 0
+        self.bytes_dropped = 0
+
+    def port_info(self):
+        '''PortInfo record used to register the port with SerialPortController.'''
+        return PortInfo(self.path, self.description, "VIRTUAL", None, None, "Mouser", self.description, "")
+
+    def write(self, data):
+        '''Writes to the app side; bytes are dropped (and counted) if nobody is draining the port.'''
+        try:
+            written = os.write(self.master, data)
+        except (BlockingIOError, OSError):
+            written = 0
+        self.bytes_written += written
+        self.bytes_dropped += len(data) - written
+
+    def read(self, size=1024):
+        '''Returns bytes the app wrote to the port, or b"" when none are waiting.'''
+        try:
+            return os.read(self.master, size)
+        except (BlockingIOError, OSError):
+            return b""
+
+    def close(self):
+        '''Closes both ends of the pseudo-terminal.'''
+        for fd in (self.master, self.slave):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+
+class VirtualInstrument:
+    '''Base class for an emulated device attached to a VirtualPort.'''
+    kind = "device"
+
+    def __init__(self, name, rng=None):
+        self.name = name
+        self.rng = rng or random.Random()
+        self.port = VirtualPort(self.describe())
+        self.frames_sent = 0
+        self.commands_received = 0
+        self._due = time.monotonic()
+        self._command_buffer = bytearray()
+
+    def describe(self):
+        '''Port description shown in port lists (used for device classification).'''
+        return f"Mouser virtual {self.kind}"
+
+    def next_due(self):
+        '''Monotonic time of the next spontaneous frame.'''
+        return self._due
+
+    def tick(self, now):
+        '''Emits any frame that is due at now.'''
+
+    def send(self, payload):
+        '''Writes one frame to the app side.'''
+        self.port.write(payload)
+        self.frames_sent += 1
+
+    def handle_input(self, data, now):
+        '''Splits bytes received from the app into CR/LF terminated commands.'''
+        self._command_buffer.extend(data)
+        while True:
+            positions = [p for p in (self._command_buffer.find(b"\r"), self._command_buffer.find(b"\n")) if p >= 0]
+            if not positions:
+                return
+            end = min(positions)
+            command = bytes(self._command_buffer[:end]).strip()
+            del self._command_buffer[:end + 1]
+            if command:
+                self.commands_received += 1
+                self.on_command(command, now)
+
+    def on_command(self, command, now):
+        '''Handles one command from the app (request/response devices).'''
+
+    def stats(self):
+        '''Counters for this device.'''
+        return {
+            "name": self.name,
+            "kind": self.kind,
+            "port": self.port.path,
+            "frames_sent": self.frames_sent,
+            "commands_received": self.commands_received,
+            "bytes_dropped": self.port.bytes_dropped,
+        }
+
+
+class VirtualRFIDReader(VirtualInstrument):
+    '''RFID reader emitting tags at scans_per_minute with +/- jitter (fraction of the interval).'''
+    kind = "RFID reader"
+
+    def __init__(self, name="RFID reader", tags=None, scans_per_minute=30.0, jitter=0.25, framing="CR",
+                 rng=None):
+        if framing not in RFID_FRAMINGS:
+            raise ValueError(f"Unknown RFID framing {framing!r}; expected one of {RFID_FRAMINGS}")
+        self.framing = framing
+        self.scans_per_minute = float(scans_per_minute)
+        self.jitter = max(0.0, min(float(jitter), 0.95))
+        super().__init__(name, rng)
+        self.tags = list(tags) if tags else [self._random_tag() for _ in range(50)]
+        self._tag_index = 0
+        self._schedule(time.monotonic())
+
+    def describe(self):
+        return f"Mouser virtual RFID reader ({self.framing})"
+
+    def _random_tag(self):
+        if self.framing == "EM4100":
+            return "".join(self.rng.choice("0123456789ABCDEF") for _ in range(10))
+        return "".join(self.rng.choice("0123456789") for _ in range(15))
+
+    def _schedule(self, now):
+        interval = 60.0 / max(self.scans_per_minute, 0.001)
+        self._due = now + interval * (1.0 + self.rng.uniform(-self.jitter, self.jitter))
+
+    def frame(self, tag):
+        '''Encodes one tag in the configured framing style.'''
+        data = tag.encode("ascii")
+        if self.framing == "CR":
+            return data + b"\r"
+        if self.framing == "CRLF":
+            return data + b"\r\n"
+        if self.framing == "LF":
+            return data + b"\n"
+        if self.framing == "EM4100":
+            checksum = 0
+            for byte in bytes.fromhex(tag[:10]):
+                checksum ^= byte
+            return STX + data + f"{checksum:02X}".encode("ascii") + b"\r\n" + ETX
+        return STX + data + b"\r\n" + ETX
+
+    def tick(self, now):
+        if now < self._due:
+            return
+        tag = self.tags[self._tag_index % len(self.tags)]
+        self._tag_index += 1
+        self.send(self.frame(tag))
+        self._schedule(now)
+
+
+class VirtualBalance(VirtualInstrument):
+    '''Balance cycling through animals: empty pan, noisy settling onto a weight, dwell, removal.
+
+    Continuous balances stream rate_hz lines; request/response protocols (sics, and, ohaus)
+    answer their request command with the current value and stability flag.'''
+    kind = "balance"
+
+    def __init__(self, name="Balance", protocol="generic", rate_hz=10.0, continuous=None,
+                 weight_range=(18.0, 35.0), settle_seconds=1.5, noise=0.01, dwell_seconds=3.0,
+                 gap_seconds=1.0, rng=None):
+        if protocol not in BALANCE_PROTOCOLS:
+            raise ValueError(f"Unknown balance protocol {protocol!r}; expected one of {BALANCE_PROTOCOLS}")
+        self.protocol = protocol
+        self.rate_hz = float(rate_hz)
+        self.continuous = (protocol == "generic") if continuous is None else bool(continuous)
+        self.weight_range = weight_range
+        self.settle_seconds = float(settle_seconds)
+        self.noise = float(noise)
+        self.dwell_seconds = float(dwell_seconds)
+        self.gap_seconds = float(gap_seconds)
+        super().__init__(name, rng)
+        self.animals_weighed = 0
+        self._cycle_start = time.monotonic()
+        self._target = self._next_weight()
+
+    def describe(self):
+        return f"Mouser virtual balance ({self.protocol})"
+
+    def _next_weight(self):
+        low, high = self.weight_range
+        return round(self.rng.uniform(low, high), 2)
+
+    def reading_at(self, now):
+        '''Returns (value, stable) following the settle curve of the current animal.'''
+        cycle = self.gap_seconds + self.settle_seconds + self.dwell_seconds
+        elapsed = now - self._cycle_start
+        while elapsed >= cycle:
+            self._cycle_start += cycle
+            elapsed -= cycle
+            self.animals_weighed += 1
+            self._target = self._next_weight()
+        jitter = self.rng.gauss(0.0, self.noise)
+        if elapsed < self.gap_seconds:
+            return round(jitter, 2), True
+        t = elapsed - self.gap_seconds
+        if t >= self.settle_seconds:
+            return round(self._target + jitter, 2), True
+        # Damped oscillation towards the target while the animal moves on the pan.
+        tau = max(self.settle_seconds / 4.0, 1e-3)
+        swing = math.exp(-t / tau) * math.cos(2.0 * math.pi * t / max(self.settle_seconds / 2.0, 1e-3))
+        return round(self._target * (1.0 - swing) + jitter * 10.0, 2), False
+
+    def format(self, value, stable):
+        '''Encodes one reading in the balance's protocol.'''
+        if self.protocol == "sics":
+            text = f"S {'S' if stable else 'D'} {value:10.2f} g"
+        elif self.protocol == "and":
+            text = f"{'ST' if stable else 'US'},{value:+09.2f}  g"
+        elif self.protocol == "ohaus":
+            text = f"{value:10.2f} g{'' if stable else '  ?'}"
+        else:
+            text = f"{value:.2f} g"
+        return text.encode("ascii") + b"\r\n"
+
+    def next_due(self):
+        return self._due if self.continuous else math.inf
+
+    def tick(self, now):
+        if not self.continuous or now < self._due:
+            return
+        self.send(self.format(*self.reading_at(now)))
+        self._due = now + 1.0 / max(self.rate_hz, 0.001)
+
+    def on_command(self, command, now):
+        if command.upper() in _REQUEST_COMMANDS.get(self.protocol, ()):
+            self.send(self.format(*self.reading_at(now)))
+
+
+class _PtyLoop:
+    '''Single background thread servicing a set of pseudo-terminals with a selector.'''
+
+    def __init__(self):
+        self._stop = threading.Event()
+        self._thread = None
+        self._selector = None
+
+    def _ports(self):
+        return []
+
+    def _on_readable(self, port, data, now):
+        pass
+
+    def _on_tick(self, now):
+        return 0.05
+
+    def start(self):
+        '''Starts the service thread.'''
+        if self._thread is not None and self._thread.is_alive():
+            return self
+        self._stop.clear()
+        self._selector = selectors.DefaultSelector()
+        for port in self._ports():
+            self._selector.register(port.master, selectors.EVENT_READ, port)
+        self._thread = threading.Thread(target=self._run, name=type(self).__name__, daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        while not self._stop.is_set():
+            now = time.monotonic()
+            timeout = max(0.0, min(self._on_tick(now), 0.05))
+            for key, _events in self._selector.select(timeout):
+                data = key.data.read()
+                if data:
+                    self._on_readable(key.data, data, time.monotonic())
+
+    def stop(self, timeout=1.0):
+        '''Stops the thread and closes every pseudo-terminal.'''
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+        if self._selector is not None:
+            self._selector.close()
+            self._selector = None
+        for port in self._ports():
+            port.close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+
+class VirtualDeviceFarm(_PtyLoop):
+    '''N virtual RFID readers and M virtual balances served by one thread.
+
+    reader_options / balance_options are passed to VirtualRFIDReader / VirtualBalance.
+    When register is True the ports are discoverable through SerialPortController.'''
+
+    def __init__(self, readers=1, balances=1, seed=None, reader_options=None, balance_options=None,
+                 register=True):
+        if not pty_supported():
+            raise OSError("Virtual serial devices require POSIX pseudo-terminals (Linux/macOS).")
+        super().__init__()
+        self.rng = random.Random(seed)
+        self.register = register
+        self.readers = [
+            VirtualRFIDReader(name=f"RFID reader {i + 1}", rng=random.Random(self.rng.random()),
+                              **(reader_options or {}))
+            for i in range(readers)
+        ]
+        self.balances = [
+            VirtualBalance(name=f"Balance {i + 1}", rng=random.Random(self.rng.random()),
+                           **(balance_options or {}))
+            for i in range(balances)
+        ]
+        self.instruments = self.readers + self.balances
+
+    def _ports(self):
+        return [inst.port for inst in self.instruments]
+
+    def _on_readable(self, port, data, now):
+        for inst in self.instruments:
+            if inst.port is port:
+                inst.handle_input(data, now)
+                return
+
+    def _on_tick(self, now):
+        for inst in self.instruments:
+            inst.tick(now)
+        next_due = min((inst.next_due() for inst in self.instruments), default=math.inf)
+        return next_due - time.monotonic()
+
+    def start(self):
+        if self.register:
+            register_virtual_ports([port.port_info() for port in self._ports()])
+        return super().start()
+
+    def stop(self, timeout=1.0):
+        if self.register:
+            unregister_virtual_ports([port.path for port in self._ports()])
+        super().stop(timeout)
+
+    def ports(self):
+        '''(device path, description) for every emulated device.'''
+        return [(port.path, port.description) for port in self._ports()]
+
+    def stats(self):
+        '''Per-device counters.'''
+        return [inst.stats() for inst in self.instruments]
+
+
+class VirtualSerialPair(_PtyLoop):
+    '''Two linked pseudo-terminals: bytes written to one port are read from the other.'''
+
+    def __init__(self, register=True):
+        if not pty_supported():
+            raise OSError("Virtual serial ports require POSIX pseudo-terminals (Linux/macOS).")
+        super().__init__()
+        self.register = register
+        self.a = VirtualPort("Mouser virtual serial pair (A)")
+        self.b = VirtualPort("Mouser virtual serial pair (B)")
+
+    def _ports(self):
+        return [self.a, self.b]
+
+    def _on_readable(self, port, data, now):
+        (self.b if port is self.a else self.a).write(data)
+
+    def start(self):
+        if self.register:
+            register_virtual_ports([self.a.port_info(), self.b.port_info()])
+        return super().start()
+
+    def stop(self, timeout=1.0):
+        if self.register:
+            unregister_virtual_ports([self.a.path, self.b.path])
+        super().stop(timeout)
+
+    def ports(self):
+        '''The two device paths.'''
+        return [self.a.path, self.b.path]
+
+
+def run_throughput_benchmark(readers=4, balances=2, seconds=10.0, scans_per_minute=120.0, seed=None,
+                             reader_framing="CR", balance_protocol="generic"):
+    '''Drives a farm through the real collection pipeline and reports throughput.
+
+    Every port is opened with pyserial and subscribed to a private SerialIOEngine; frames go through
+    the protocol drivers' decoders and parsers, balance readings through StabilityFilter.'''
+    # pylint: disable=import-outside-toplevel
+    import serial
+    from shared.device_drivers import get_driver
+    from shared.serial_engine import SerialIOEngine
+    from shared.stability_filter import StabilityFilter
+
+    counts = {"scans": 0, "settled": 0, "frames": 0, "parse_failures": 0}
+    lock = threading.Lock()
+    reader_options = {"scans_per_minute": scans_per_minute, "framing": reader_framing}
+    balance_options = {"protocol": balance_protocol, "continuous": True}
+    engine = SerialIOEngine()
+    engine.start()
+    farm = VirtualDeviceFarm(readers, balances, seed=seed, reader_options=reader_options,
+                             balance_options=balance_options, register=False)
+    try:
+        farm.start()
+        subs = []
+        for inst in farm.instruments:
+            is_reader = isinstance(inst, VirtualRFIDReader)
+            driver = get_driver("rfid" if is_reader else inst.protocol)
+            stability = StabilityFilter()
+
+            def on_frame(frame, drv=driver, filt=stability, reader=is_reader):
+                reading = drv.decode(frame)
+                with lock:
+                    counts["frames"] += 1
+                    if reading is None:
+                        counts["parse_failures"] += 1
+                    elif reader:
+                        counts["scans"] += 1
+                    elif filt.add(reading.value, reading.stable) is not None:
+                        counts["settled"] += 1
+
+            ser = serial.Serial(inst.port.path, 9600, timeout=0)
+            subs.append(engine.subscribe(ser, on_frame, decoder=driver.make_decoder(), driver=driver.name))
+        start = time.monotonic()
+        time.sleep(seconds)
+        elapsed = time.monotonic() - start
+        for sub in subs:
+            sub.close()
+    finally:
+        engine.shutdown()
+        farm.stop()
+    minutes = elapsed / 60.0
+    return {
+        "seconds": round(elapsed, 3),
+        "scans": counts["scans"],
+        "scans_per_minute": round(counts["scans"] / minutes, 1),
+        "settled_weights": counts["settled"],
+        "weights_per_minute": round(counts["settled"] / minutes, 1),
+        "frames": counts["frames"],
+        "parse_failures": counts["parse_failures"],
+        "devices": farm.stats(),
+    }
+
+
+def main(argv=None):
+    '''Command line entry point for the headless throughput benchmark.'''
+    parser = argparse.ArgumentParser(description="Stress-test serial collection with virtual devices.")
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--balances", type=int, default=2)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--scans-per-minute", type=float, default=120.0, help="per reader")
+    parser.add_argument("--framing", choices=RFID_FRAMINGS, default="CR")
+    parser.add_argument("--protocol", choices=BALANCE_PROTOCOLS, default="generic")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+    result = run_throughput_benchmark(args.readers, args.balances, args.seconds, args.scans_per_minute,
+                                      seed=args.seed, reader_framing=args.framing,
+                                      balance_protocol=args.protocol)
+    print(f"{result['scans']} scans in {result['seconds']} s -> {result['scans_per_minute']} scans/min")
+    print(f"{result['settled_weights']} settled weights -> {result['weights_per_minute']} weights/min")
+    print(f"{result['frames']} frames, {result['parse_failures']} parse failures")
+    for device in result["devices"]:
+        print(f"  {device['name']:<14} {device['port']:<14} sent={device['frames_sent']} "
+              f"dropped_bytes={device['bytes_dropped']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Tests for the incremental activity log."""
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from shared.activity_log import ActivityLog, session_log_path
+from shared.ui_dispatcher import UIDispatcher
+
+
+class FakeTextbox:
+    """Line-based stand-in for CTkTextbox recording how much text each call touches."""
+
+    def __init__(self):
+        self.text = ""
+        self.inserted_chars = 0
+        self.deletes = 0
+
+    def winfo_exists(self):
+        return True
+
+    def configure(self, **_kwargs):
+        pass
+
+    def see(self, _index):
+        pass
+
+    def insert(self, index, text):
+        assert index == "end"
+        self.text += text
+        self.inserted_chars += len(text)
+
+    def delete(self, start, end):
+        assert start == "1.0"
+        lines = int(end.split(".")[0]) - 1
+        self.deletes += 1
+        self.text = "\n".join(self.text.split("\n")[lines:])
+
+    def lines(self):
+        return self.text.split("\n") if self.text else []
+
+
+class FakeRoot:
+    def after(self, _ms, _callback):
+        return "after#1"
+
+    def after_cancel(self, _job):
+        pass
+
+
+class TestActivityLog:
+    """Append-only rendering, trimming and file persistence."""
+
+    def test_burst_renders_once_per_tick(self):
+        textbox = FakeTextbox()
+        dispatcher = UIDispatcher(FakeRoot())
+        log = ActivityLog(textbox, dispatcher)
+        for i in range(20):
+            log.append(f"line {i}")
+        dispatcher.pump()
+        assert log.renders == 1
+        assert [line.split("  ", 1)[1] for line in textbox.lines()] == [f"line {i}" for i in range(20)]
+
+    def test_appends_only_new_text_and_trims_head(self):
+        textbox = FakeTextbox()
+        dispatcher = UIDispatcher(FakeRoot())
+        log = ActivityLog(textbox, dispatcher, max_lines=50)
+        for i in range(500):
+            log.append(f"scan {i}")
+            dispatcher.pump()
+        lines = textbox.lines()
+        assert len(lines) == 50
+        assert lines[0].endswith("scan 450")
+        assert lines[-1].endswith("scan 499")
+        # Each render inserts one line, never the whole history.
+        assert textbox.inserted_chars < 500 * 20
+        assert len(log.entries) == 50
+
+    def test_lines_logged_before_attach_are_shown(self):
+        dispatcher = UIDispatcher(FakeRoot())
+        log = ActivityLog()
+        log.append("Device connected")
+        textbox = FakeTextbox()
+        log.attach(textbox, dispatcher)
+        log.append("Ready.")
+        dispatcher.pump()
+        assert [line.split("  ", 1)[1] for line in textbox.lines()] == ["Device connected", "Ready."]
+
+    def test_blank_messages_ignored(self):
+        log = ActivityLog()
+        assert log.append("   ") is None
+        assert not log.entries
+
+    def test_rotating_session_file(self, tmp_path):
+        path = session_log_path("My Experiment.mouser", directory=str(tmp_path))
+        assert os.path.basename(path).startswith("activity_My_Experiment.mouser_")
+        log = ActivityLog(file_path=path, max_lines=10, max_bytes=2000, backup_count=2)
+        for i in range(300):
+            log.append(f"Animal {i}: Weight = 21.5")
+        log.close()
+        files = sorted(os.listdir(tmp_path))
+        assert len(files) == 3
+        assert all(os.path.getsize(tmp_path / name) <= 2000 for name in files)
+        with open(path, encoding="utf-8") as f:
+            assert f.read().rstrip().endswith("Animal 299: Weight = 21.5")
+
+    def test_no_directory_means_no_file(self, monkeypatch):
+        monkeypatch.delenv("MOUSER_ACTIVITY_LOG_DIR", raising=False)
+        assert session_log_path("exp") is None
@@ -0,0 +1,75 @@
+"""Tests for the queue-based logging setup."""
+import logging
+import logging.handlers
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from shared.app_logging import configure_logging, shutdown_logging, parse_levels
+
+
+class CountingArg:
+    """Counts how often a log argument is formatted."""
+
+    def __init__(self):
+        self.formatted = 0
+
+    def __str__(self):
+        self.formatted += 1
+        return "tag"
+
+
+class TestAppLogging:
+    """Levels, queueing and the rotating file sink."""
+
+    def setup_method(self):
+        self.root_level = logging.getLogger().level
+
+    def teardown_method(self):
+        shutdown_logging()
+        logging.getLogger().setLevel(self.root_level)
+        for name in ("mouser.test.hot", "mouser.test.verbose"):
+            logging.getLogger(name).setLevel(logging.NOTSET)
+
+    def test_parse_levels(self):
+        assert parse_levels("a=DEBUG, b.c=warning,bad,d=NOPE") == {"a": logging.DEBUG,
+                                                                   "b.c": logging.WARNING}
+
+    def test_records_reach_file_through_listener_thread(self, tmp_path):
+        listener = configure_logging(level="INFO", log_dir=str(tmp_path), console=False,
+                                     levels={"mouser.test.verbose": "DEBUG"})
+        writers = []
+
+        class RecordingHandler(logging.Handler):
+            def emit(self, record):
+                writers.append(threading.current_thread())
+
+        listener.handlers = listener.handlers + (RecordingHandler(),)
+        logging.getLogger("mouser.test.hot").debug("hidden")
+        logging.getLogger("mouser.test.hot").info("saved %s", 1)
+        logging.getLogger("mouser.test.verbose").debug("detail")
+        shutdown_logging()
+        text = (tmp_path / "mouser.log").read_text(encoding="utf-8")
+        assert "saved 1" in text and "detail" in text and "hidden" not in text
+        assert writers and all(t is not threading.current_thread() for t in writers)
+
+    def test_disabled_debug_costs_no_formatting(self):
+        configure_logging(console=False)
+        log = logging.getLogger("mouser.test.hot")
+        arg = CountingArg()
+        for _ in range(1000):
+            log.debug("RFID scanned: %s", arg)
+        assert arg.formatted == 0
+        assert any(isinstance(h, logging.handlers.QueueHandler) for h in logging.getLogger().handlers)
+
+    def test_shutdown_removes_queue_handler(self):
+        configure_logging(console=False)
+        configure_logging(console=False)
+        queue_handlers = [h for h in logging.getLogger().handlers
+                          if isinstance(h, logging.handlers.QueueHandler)]
+        assert len(queue_handlers) == 1
+        shutdown_logging()
+        assert not any(isinstance(h, logging.handlers.QueueHandler)
+                       for h in logging.getLogger().handlers)
@@ -0,0 +1,125 @@
+"""Tests for the preloaded-PCM audio engine."""
+import os
+import sys
+import threading
+import time
+import wave
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from shared.audio import OUTPUT_CHANNELS, OUTPUT_RATE, QUEUE_LIMIT, AudioEngine, decode_clip
+from shared.file_utils import ERROR_SOUND, SUCCESS_SOUND
+
+
+class RecordingStream:
+    """Output stream stand-in that takes real time per write, like a blocking audio device."""
+
+    def __init__(self, seconds_per_write=0.001):
+        self.writes = []
+        self.opened = 0
+        self.closed = 0
+        self.first_write = threading.Event()
+        self.seconds_per_write = seconds_per_write
+
+    def open(self):
+        self.opened += 1
+        return self, self.close
+
+    def write(self, data):
+        self.writes.append(bytes(data))
+        self.first_write.set()
+        time.sleep(self.seconds_per_write)
+
+    def close(self):
+        self.closed += 1
+
+
+def write_wav(path, rate, channels, frames):
+    with wave.open(str(path), "wb") as f:
+        f.setnchannels(channels)
+        f.setsampwidth(2)
+        f.setframerate(rate)
+        f.writeframes(b"\x10\x00" * frames * channels)
+    return str(path)
+
+
+class TestDecoding:
+    """Clips are converted to one output format."""
+
+    def test_app_sounds_share_output_format(self):
+        for path in (SUCCESS_SOUND, ERROR_SOUND):
+            clip = decode_clip(path)
+            with wave.open(path, "rb") as f:
+                seconds = f.getnframes() / f.getframerate()
+            assert len(clip.pcm) == clip.frames * OUTPUT_CHANNELS * 2
+            assert abs(clip.frames / OUTPUT_RATE - seconds) < 0.01
+
+    def test_mono_is_duplicated(self, tmp_path):
+        clip = decode_clip(write_wav(tmp_path / "mono.wav", OUTPUT_RATE, 1, 100))
+        assert clip.frames == 100
+        assert clip.pcm[:4] == b"\x10\x00\x10\x00"
+
+
+class TestAudioEngine:
+    """Persistent stream, queueing and preemption."""
+
+    def test_stream_opened_once_for_many_sounds(self, tmp_path):
+        stream = RecordingStream(0)
+        engine = AudioEngine(open_stream=stream.open)
+        short = write_wav(tmp_path / "short.wav", OUTPUT_RATE, 2, 300)
+        try:
+            for _ in range(5):
+                engine.play(short)
+                assert engine.wait_idle(2.0)
+            assert stream.opened == 1
+            assert engine.played == 5
+        finally:
+            engine.shutdown()
+        assert stream.closed == 1
+
+    def test_queue_is_bounded(self, tmp_path):
+        stream = RecordingStream()
+        engine = AudioEngine(open_stream=stream.open)
+        clip = write_wav(tmp_path / "clip.wav", OUTPUT_RATE, 2, 2560)
+        try:
+            engine.play(clip)
+            assert stream.first_write.wait(2.0)
+            for _ in range(QUEUE_LIMIT + 3):
+                engine.play(clip)
+            assert engine.dropped == 3
+            assert engine.wait_idle(5.0)
+            assert engine.played == QUEUE_LIMIT + 1
+        finally:
+            engine.shutdown()
+
+    def test_preempt_cuts_current_sound(self, tmp_path):
+        stream = RecordingStream(0.005)
+        engine = AudioEngine(open_stream=stream.open)
+        long_clip = write_wav(tmp_path / "long.wav", OUTPUT_RATE, 2, OUTPUT_RATE)
+        engine.clip(ERROR_SOUND)
+        engine.clip(SUCCESS_SOUND)
+        try:
+            engine.play(long_clip)
+            assert stream.first_write.wait(2.0)
+            engine.play(SUCCESS_SOUND)
+            start = time.monotonic()
+            engine.play(ERROR_SOUND, preempt=True)
+            while engine.current is None or engine.current.path != ERROR_SOUND:
+                assert time.monotonic() - start < 1.0
+                time.sleep(0.001)
+            assert time.monotonic() - start < 0.05
+            assert engine.preempted == 1
+            assert engine.dropped == 1
+        finally:
+            engine.shutdown()
+
+    def test_unavailable_output_disables_engine(self, tmp_path):
+        def broken():
+            raise OSError("no audio device")
+
+        engine = AudioEngine(open_stream=broken)
+        clip = write_wav(tmp_path / "clip.wav", OUTPUT_RATE, 2, 10)
+        engine.play(clip)
+        assert engine.wait_idle(2.0)
+        assert not engine.available
+        assert engine.play(clip) is False
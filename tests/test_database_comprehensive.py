@@ -15,6 +15,7 @@ Test Categories:
 import gc
 import os
 import shutil
+import sqlite3
 import sys
 import tempfile
 import time
@@ -26,6 +27,8 @@ import pytest
 
 from databases.experiment_database import ExperimentDatabase
 from databases.database_controller import DatabaseController
+from databases.mapping_session import RFIDMappingSession, MappingError, flush_all_sessions, read_rfid_manifest
+from shared.file_utils import save_temp_to_file
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -1211,6 +1214,508 @@ class TestDataCollectionTracking:
         is_complete = db.is_data_collected_for_date("2025-01-17")
         assert is_complete is False
 
+    @staticmethod
+    def _scan_is_complete(db, date):
+        """Reference answer computed by scanning the day's measurements."""
+        slots = db.get_measurement_slot_count()
+        rows = db._c.execute('''
+            SELECT a.animal_id, COUNT(DISTINCT m.measurement_id)
+            FROM animals a
+            LEFT JOIN animal_measurements m
+                ON a.animal_id = m.animal_id AND m.timestamp = ?
+                AND m.value IS NOT NULL AND m.measurement_id BETWEEN 1 AND ?
+            WHERE a.active = 1
+            GROUP BY a.animal_id''', (date, slots)).fetchall()
+        return sum(1 for _aid, cnt in rows if cnt >= slots), len(rows)
+
+    def test_progress_index_tracks_slots_and_active_animals(self, temp_db):
+        """Completion follows slot edits, deactivation and measurement-name changes."""
+        db = ExperimentDatabase(temp_db)
+        db.setup_experiment("Progress", "Mouse", False, 3, 1, 3, 0,
+                            "EXP-074", ["Dr. Test"], "Weight, Length")
+        db.setup_groups(["G1"], cage_capacity=3)
+        for i in range(1, 4):
+            db.add_animal(animal_id=i, rfid=f"R{i}", group_id=1)
+        day = "2025-02-01"
+
+        db.change_data_entry(day, 1, (20.0, 5.0))
+        db.change_data_entry(day, 2, (21.0, None))
+        assert db.get_daily_progress(day) == (1, 3)
+        db.change_data_entry(day, 2, 6.0, measurement_id=2)
+        db.change_data_entry(day, 3, (22.0, 7.0))
+        assert db.is_data_collected_for_date(day) is True
+
+        db.change_data_entry(day, 3, None, measurement_id=1)
+        assert db.get_daily_progress(day) == (2, 3)
+        db.set_animal_active_status(3, 0)
+        assert db.get_daily_progress(day) == (2, 2)
+        assert db.is_data_collected_for_date(day) is True
+
+        db.update_measurement_name("Weight, Length, Temp")
+        assert db.get_daily_progress(day) == (0, 2)
+        db.update_measurement_name("Weight")
+        assert db.get_daily_progress(day) == (2, 2)
+        db.set_animal_active_status(3, 1)
+        assert db.get_daily_progress(day) == (2, 3)
+
+    def test_progress_index_matches_scan(self, temp_db):
+        """Random edits keep the index equal to a full scan of the measurements."""
+        import random
+        rng = random.Random(7)
+        db = ExperimentDatabase(temp_db)
+        db.setup_experiment("Progress", "Mouse", False, 12, 2, 6, 0,
+                            "EXP-075", ["Dr. Test"], "Weight, Length")
+        db.setup_groups(["G1", "G2"], cage_capacity=6)
+        for i in range(1, 13):
+            db.add_animal(animal_id=i, rfid=f"R{i}", group_id=1 + i % 2)
+        days = ["2025-03-01", "2025-03-02"]
+        for _ in range(400):
+            action = rng.random()
+            day = rng.choice(days)
+            animal = rng.randint(1, 12)
+            if action < 0.7:
+                value = None if rng.random() < 0.2 else rng.uniform(10, 30)
+                db.change_data_entry(day, animal, value, measurement_id=rng.randint(1, 3))
+            elif action < 0.85:
+                db.set_animal_active_status(animal, rng.randint(0, 1))
+            elif action < 0.95:
+                db.delete_measurement_column(rng.randint(1, 2))
+            else:
+                db.update_measurement_name(rng.choice(["Weight", "Weight, Length"]))
+            for check_day in days:
+                assert db.get_daily_progress(check_day) == self._scan_is_complete(db, check_day)
+
+    def test_progress_index_built_for_older_files(self, temp_db):
+        """Files saved without the index get it on open."""
+        db = ExperimentDatabase(temp_db)
+        db.setup_experiment("Legacy", "Mouse", False, 2, 1, 2, 0,
+                            "EXP-076", ["Dr. Test"], "Weight")
+        db.setup_groups(["G1"], cage_capacity=2)
+        for i in range(1, 3):
+            db.add_animal(animal_id=i, rfid=f"R{i}", group_id=1)
+            db.add_data_entry("2025-04-01", i, [25.0])
+        for table in ("progress_config", "daily_progress", "daily_progress_summary"):
+            db._c.execute(f"DROP TABLE {table}")
+        db._conn.commit()
+        db.close()
+        ExperimentDatabase._instances.clear()
+
+        reopened = ExperimentDatabase(temp_db)
+        assert reopened.get_daily_progress("2025-04-01") == (2, 2)
+        assert reopened.is_data_collected_for_date("2025-04-01") is True
+
+
+class TestLatestMeasurement:
+    """Test the latest_measurement view and its users."""
+
+    @staticmethod
+    def _setup(temp_db):
+        db = ExperimentDatabase(temp_db)
+        db.setup_experiment("Latest", "Mouse", False, 4, 2, 2, 0,
+                            "EXP-077", ["Dr. Test"], "Weight, Length")
+        db.setup_groups(["G1", "G2"], cage_capacity=2)
+        for i in range(1, 5):
+            db.add_animal(animal_id=i, rfid=f"R{i}", group_id=1 + (i - 1) // 2)
+        return db
+
+    def test_latest_value_per_animal_and_slot(self, temp_db):
+        """Newest non-null value wins; slots and inactive animals are filtered."""
+        db = self._setup(temp_db)
+        db.change_data_entry("2025-05-01", 1, (20.0, 4.0))
+        db.change_data_entry("2025-05-02", 1, (22.0, None))
+        db.change_data_entry("2025-05-01", 2, (30.0, 5.0))
+        db.change_data_entry("2025-05-02", 3, (None, 6.0))
+        db.set_animal_active_status(2, 0)
+
+        assert db.get_latest_measurements(measurement_id=1) == {1: ("2025-05-02", 22.0)}
+        assert db.get_latest_measurements(measurement_id=2) == {
+            1: ("2025-05-01", 4.0), 3: ("2025-05-02", 6.0)}
+        assert db.get_latest_measurements() == {1: ("2025-05-02", 22.0), 3: ("2025-05-02", 6.0)}
+        assert 2 in db.get_latest_measurements(active_only=False)
+
+    def test_controller_weights_use_latest_values(self, temp_db):
+        """DatabaseController reads every animal's latest value in one pass."""
+        db = self._setup(temp_db)
+        db.change_data_entry("2025-05-01", 1, (20.0, 4.0))
+        db.change_data_entry("2025-05-03", 1, 21.5, measurement_id=1)
+        db.change_data_entry("2025-05-02", 4, (40.0, 8.0))
+
+        controller = DatabaseController(temp_db)
+        assert controller.get_animal_measurements(1) == 21.5
+        assert controller.get_animal_measurements(4) == 40.0
+        assert controller.get_animal_measurements(2) == 0
+
+    def test_autosort_uses_latest_values(self, temp_db):
+        """Autosort spreads the heaviest and lightest animals by their latest weights."""
+        db = self._setup(temp_db)
+        for animal_id, weight in ((1, 10.0), (2, 40.0), (3, 20.0), (4, 30.0)):
+            db.change_data_entry("2025-05-01", animal_id, weight, measurement_id=1)
+        db.change_data_entry("2025-05-02", 1, 50.0, measurement_id=1)
+
+        assert db.autosort() is True
+        groups = {aid: db.get_animal_current_cage(aid) for aid in range(1, 5)}
+        # Heaviest (1: 50) and lightest (3: 20) go first, alternating across groups.
+        assert groups[1] == 1 and groups[2] == 2
+        assert groups[3] == 1 and groups[4] == 2
+
+
+class TestReadModels:
+    """Test the single-query roster and experiment summary."""
+
+    @staticmethod
+    def _setup(temp_db, num_animals):
+        db = ExperimentDatabase(temp_db)
+        db.setup_experiment("Roster", "Mouse", True, num_animals, 2, num_animals, 1,
+                            "EXP-045", ["Dr. A", "Dr. B"], "Weight")
+        db.setup_groups(["Control", "Treated"], cage_capacity=num_animals)
+        for i in range(1, num_animals + 1):
+            db.add_animal(animal_id=i, rfid=f"R{i}", group_id=1 + i % 2, commit=False)
+        db._conn.commit()
+        return db
+
+    @staticmethod
+    def _count_queries(db, action):
+        statements = []
+        db._conn.set_trace_callback(statements.append)
+        try:
+            action()
+        finally:
+            db._conn.set_trace_callback(None)
+        return len([s for s in statements if s.lstrip().upper().startswith("SELECT")])
+
+    def test_roster_joins_group_and_latest_value(self, temp_db):
+        """Each row carries rfid, group, active flag and latest measurement."""
+        db = self._setup(temp_db, 4)
+        db.add_data_entry("2024-01-01", 1, 20.0)
+        db.add_data_entry("2024-01-02", 1, 21.5)
+        db.set_animal_active_status(4, 0)
+        roster = db.get_animal_roster()
+        assert roster[0] == (1, "R1", 2, "Treated", 1, "2024-01-02", 21.5)
+        assert roster[1] == (2, "R2", 1, "Control", 1, None, None)
+        assert roster[3][4] == 0
+        assert [row[0] for row in db.get_animal_roster(active_only=True)] == [1, 2, 3]
+
+    def test_experiment_summary(self, temp_db):
+        """The summary reads every setting shown on the review page."""
+        db = self._setup(temp_db, 4)
+        summary = db.get_experiment_summary()
+        assert summary["name"] == "Roster" and summary["species"] == "Mouse"
+        assert summary["investigators"] == ["Dr. A", "Dr. B"]
+        assert summary["groups"] == ["Control", "Treated"]
+        assert summary["cage_capacity"] == 4 and summary["measurement_type"] == 1
+
+    def test_page_reads_stay_flat_as_cohort_grows(self, temp_db):
+        """Loading the cage controller costs the same number of queries for 10 or 500 animals."""
+        counts = []
+        for size in (10, 500):
+            path = os.path.join(os.path.dirname(temp_db), f"roster_{size}.db")
+            db = self._setup(path, size)
+            controller = DatabaseController(path)
+            counts.append(self._count_queries(db, controller.reset_attributes))
+            assert len(controller.valid_ids) == size
+        assert counts[0] == counts[1]
+
+
+class TestSettingsCache:
+    """Test the read-through cache of experiment settings."""
+
+    @staticmethod
+    def _setup(temp_db):
+        db = ExperimentDatabase(temp_db)
+        db.setup_experiment("Cache", "Mouse", True, 8, 2, 4, 0,
+                            "EXP-047", ["Dr. Test"], "Weight")
+        db.setup_groups(["A", "B"], cage_capacity=4)
+        return db
+
+    def test_repeated_reads_run_no_sql(self, temp_db):
+        """After the first read, settings getters do not touch the database."""
+        db = self._setup(temp_db)
+        db.get_measurement_type()
+        statements = []
+        db._conn.set_trace_callback(statements.append)
+        for _ in range(100):
+            db.get_measurement_type()
+            db.experiment_uses_rfid()
+            db.get_total_number_animals()
+            db.get_cage_max()
+            db.get_cage_capacity(2)
+            db.get_cage_number("B")
+            db.get_groups()
+        db._conn.set_trace_callback(None)
+        assert statements == []
+
+    def test_setters_invalidate(self, temp_db):
+        """Every settings write is visible to the next read."""
+        db = self._setup(temp_db)
+        assert db.get_measurement_type() == 0 and db.get_total_number_animals() == 8
+        db.update_measurement_type(1)
+        db.set_number_animals(7)
+        db.update_investigators(["Dr. A", "Dr. B"])
+        db.update_group_names(["Control", "Treated"])
+        db.update_measurement_name("Weight, Length")
+        assert db.get_measurement_type() == 1
+        assert db.get_total_number_animals() == 7
+        assert db.get_investigators() == ["Dr. A", "Dr. B"]
+        assert db.get_groups() == ["Control", "Treated"] and db.get_cage_number("Treated") == 2
+        assert db.get_measurement_items() == ("Weight, Length",)
+        db._c.execute("UPDATE experiment SET cage_max = 9")
+        db.invalidate_settings()
+        assert db.get_cage_max() == 9
+
+    def test_empty_database_defaults(self, temp_db):
+        """Getters keep their defaults before the experiment is set up."""
+        db = ExperimentDatabase(temp_db)
+        assert db.get_total_number_animals() == 0 and db.get_measurement_type() == 0
+        assert db.experiment_uses_rfid() == 0 and db.get_experiment_name() is None
+        assert db.get_measurement_items() is None and db.get_groups() == []
+        db.setup_experiment("Late", "Rat", False, 2, 1, 2, 1, "EXP-1", [], "Weight")
+        assert db.get_experiment_name() == "Late" and db.get_measurement_type() == 1
+
+
+class TestGroupAssignments:
+    """Test the single-query group assignment read."""
+
+    def test_group_assignments_include_empty_groups(self, temp_db):
+        """Every group is listed in order with its active animals."""
+        db = ExperimentDatabase(temp_db)
+        db.setup_experiment("Groups", "Mouse", False, 4, 3, 2, 0,
+                            "EXP-078", ["Dr. Test"], "Weight")
+        db.setup_groups(["A", "B", "C"], cage_capacity=2)
+        db.add_animal(animal_id=1, rfid="R1", group_id=1)
+        db.add_animal(animal_id=3, rfid="R3", group_id=3)
+        db.add_animal(animal_id=2, rfid="R2", group_id=1)
+        db.add_animal(animal_id=4, rfid="R4", group_id=3)
+        db.set_animal_active_status(4, 0)
+
+        assert db.get_group_assignments() == [(1, "A", [1, 2]), (2, "B", []), (3, "C", [3])]
+
+
+class TestMoveAnimals:
+    """Test the transactional bulk move."""
+
+    @staticmethod
+    def _setup(temp_db):
+        db = ExperimentDatabase(temp_db)
+        db.setup_experiment("Move", "Mouse", False, 6, 3, 3, 0,
+                            "EXP-079", ["Dr. Test"], "Weight")
+        db.setup_groups(["A", "B", "C"], cage_capacity=3)
+        for i in range(1, 7):
+            db.add_animal(animal_id=i, rfid=f"R{i}", group_id=1 if i <= 2 else 2)
+        return db
+
+    @staticmethod
+    def _counts(db):
+        return dict(db._c.execute("SELECT group_id, num_animals FROM groups").fetchall())
+
+    def test_move_returns_delta_and_updates_counts(self, temp_db):
+        """Animals move together; ones already in the target are skipped."""
+        db = self._setup(temp_db)
+        delta = db.move_animals(["1", 3, 4], 3)
+        assert delta == {"target": 3, "moved": {1: 1, 3: 2, 4: 2}, "skipped": []}
+        assert db.get_group_assignments() == [(1, "A", [2]), (2, "B", [5, 6]), (3, "C", [1, 3, 4])]
+        assert self._counts(db) == {1: 1, 2: 2, 3: 3}
+
+        delta = db.move_animals([3, 2], 3, capacity=4)
+        assert delta["moved"] == {2: 1} and delta["skipped"] == [3]
+
+    def test_capacity_violation_changes_nothing(self, temp_db):
+        """A move that would overflow the target is rejected as a whole."""
+        db = self._setup(temp_db)
+        with pytest.raises(ValueError):
+            db.move_animals([3, 4], 1)
+        assert db.get_group_assignments() == [(1, "A", [1, 2]), (2, "B", [3, 4, 5, 6]), (3, "C", [])]
+        assert self._counts(db) == {1: 2, 2: 4, 3: 0}
+
+    def test_cage_assignments_number_cages_per_group(self, temp_db):
+        """Cage numbers restart per group and advance every cage_capacity animals."""
+        db = ExperimentDatabase(temp_db)
+        db.setup_experiment("Cages", "Mouse", False, 7, 2, 3, 0,
+                            "EXP-046", ["Dr. Test"], "Weight")
+        db.setup_groups(["A", "B"], cage_capacity=3)
+        for i in range(1, 8):
+            db.add_animal(animal_id=i, rfid=f"R{i}", group_id=1 if i <= 5 else 2)
+        db.set_animal_active_status(2, 0)
+        assert db.get_cage_assignments() == {1: (1, 1), 3: (1, 1), 4: (1, 1), 5: (1, 2),
+                                             6: (2, 1), 7: (2, 1)}
+
+    def test_controller_caches_cages_until_a_move(self, temp_db):
+        """Cage lookups hit the cache; moves invalidate it."""
+        self._setup(temp_db)
+        controller = DatabaseController(temp_db)
+        statements = []
+        controller.db._conn.set_trace_callback(statements.append)
+        assert [controller.get_animal_current_cage(i) for i in range(1, 7)] == [1, 1, 2, 2, 2, 2]
+        assert controller.get_animal_current_cage(99) is None
+        assert not statements
+        controller.move_animals([3], 3)
+        assert controller.get_animal_current_cage(3) == 3
+        controller.db._conn.set_trace_callback(None)
+
+    def test_controller_uses_experiment_cage_max(self, temp_db):
+        """DatabaseController applies the experiment's cage maximum."""
+        db = self._setup(temp_db)
+        controller = DatabaseController(temp_db)
+        assert controller.get_cage_max() == 3
+        assert controller.move_animals([3], 1)["moved"] == {3: 2}
+        with pytest.raises(ValueError):
+            controller.move_animals([4], 1)
+
+    def test_failed_swap_is_rolled_back(self, temp_db):
+        """A swap whose second move fails leaves both animals where they were."""
+        self._setup(temp_db)
+        controller = DatabaseController(temp_db)
+        assert controller.update_animal_cage(1, 2, commit=False)
+        assert not controller.update_animal_cage(99, 1, commit=False)
+        controller.rollback()
+        assert controller.get_animal_current_cage(1) == 1
+        assert self._counts(controller.db) == {1: 2, 2: 4, 3: 0}
+
+
+class TestRFIDMappingSession:
+    """Test the in-memory allocator used while mapping tags."""
+
+    @staticmethod
+    def _setup(temp_db, num_animals=500, num_groups=5, cage_max=100):
+        db = ExperimentDatabase(temp_db)
+        db.setup_experiment("Map", "Mouse", True, num_animals, num_groups, cage_max, 0,
+                            "EXP-043", ["Dr. Test"], "Weight")
+        db.setup_groups([f"G{i}" for i in range(1, num_groups + 1)], cage_capacity=cage_max)
+        return db
+
+    def test_maps_all_tags_with_batched_flushes(self, temp_db):
+        """500 tags fill groups in order and persist every flush_every tags."""
+        db = self._setup(temp_db)
+        saves = []
+        session = RFIDMappingSession(db, on_flush=lambda: saves.append(session.mapped),
+                                     flush_every=25)
+        for i in range(500):
+            session.add(f"TAG{i:04d}")
+            if session.flush_due():
+                session.flush()
+        session.flush()
+        assert session.is_full() and session.remaining() == 0
+        assert len(saves) == 20 and saves[-1] == 500
+        counts = dict(db._c.execute("SELECT group_id, num_animals FROM groups").fetchall())
+        assert counts == {1: 100, 2: 100, 3: 100, 4: 100, 5: 100}
+        assert db.get_animal_rfid(250) == "TAG0249"
+        with pytest.raises(MappingError):
+            session.add("TAG9999")
+
+    def test_rejects_used_tags_and_full_groups(self, temp_db):
+        """Duplicate tags and exhausted group capacity raise MappingError."""
+        db = self._setup(temp_db, num_animals=4, num_groups=1, cage_max=2)
+        session = RFIDMappingSession(db)
+        assert session.add("A") == (1, 1)
+        with pytest.raises(MappingError):
+            session.add("A")
+        session.add("B")
+        with pytest.raises(MappingError):
+            session.add("C")
+        assert session.pending == 2
+
+    def test_reload_fills_gaps_left_by_removals(self, temp_db):
+        """After removals the lowest free ids are reused."""
+        db = self._setup(temp_db, num_animals=10, num_groups=2, cage_max=5)
+        session = RFIDMappingSession(db)
+        for i in range(10):
+            session.add(f"T{i}")
+        session.flush()
+        db.remove_animal(3)
+        db.remove_animal(7)
+        db._conn.commit()
+        session.reload()
+        assert session.remaining() == 2 and not session.is_used("T2")
+        assert session.next_animal_id() == 3
+        assert session.add("N1") == (3, 1)
+        assert session.add("N2") == (7, 2)
+
+    def test_pending_mappings_survive_other_rollbacks(self, temp_db):
+        """Mappings are not written until flush(), so a rollback on the shared connection keeps them."""
+        db = self._setup(temp_db, num_animals=3, num_groups=1, cage_max=3)
+        session = RFIDMappingSession(db)
+        session.add("X")
+        assert db.get_all_animals_rfid() == []
+        db._conn.rollback()
+        assert session.flush() == 1
+        assert db.get_all_animals_rfid() == ["X"] and session.pending == 0
+
+    def test_failed_flush_reloads_from_database(self, temp_db):
+        """If the batch insert fails the session matches the database again."""
+        db = self._setup(temp_db, num_animals=3, num_groups=1, cage_max=3)
+        session = RFIDMappingSession(db)
+        session.add("X")
+        db.add_animal(1, "OTHER", 1)
+        with pytest.raises(MappingError):
+            session.flush()
+        assert db.get_all_animals_rfid() == ["OTHER"]
+        assert session.mapped == 1 and session.is_used("OTHER") and not session.is_used("X")
+        assert session.pending == 0 and session.next_animal_id() == 2
+
+    def test_exit_flushes_pending_mappings_to_file(self, temp_db):
+        """Mappings still pending when the app exits are inserted and saved to the experiment file."""
+        db = self._setup(temp_db, num_animals=30, num_groups=1, cage_max=30)
+        saved = os.path.join(os.path.dirname(temp_db), "saved.mouser")
+
+        def save():
+            db._conn.commit()
+            save_temp_to_file(temp_db, saved)
+
+        gc.collect()  # drop sessions left over from earlier tests
+        session = RFIDMappingSession(db, on_flush=save, flush_every=25)
+        for i in range(24):
+            session.add(f"EXIT{i:02d}")
+        assert not os.path.exists(saved)
+        assert flush_all_sessions() == 24
+        assert session.pending == 0 and flush_all_sessions() == 0
+        conn = sqlite3.connect(saved)
+        try:
+            tags = [row[0] for row in conn.execute("SELECT rfid FROM animals ORDER BY animal_id")]
+        finally:
+            conn.close()
+        assert tags == [f"EXIT{i:02d}" for i in range(24)]
+
+    def test_add_many_maps_batch_in_one_transaction(self, temp_db):
+        """A batch of tags and manifest pairs is validated and inserted together."""
+        db = self._setup(temp_db, num_animals=1000, num_groups=10, cage_max=100)
+        session = RFIDMappingSession(db)
+        mapped = session.add_many([(5, "M5"), (2, "M2")] + [f"S{i}" for i in range(998)])
+        assert len(mapped) == 1000 and session.is_full()
+        assert db.get_animal_rfid(5) == "M5" and db.get_animal_rfid(1) == "S0"
+        assert db.get_animal_rfid(3) == "S1" and db.get_animal_rfid(1000) == "S997"
+        rows = db.get_rfid_mappings()
+        assert len(rows) == 1000 and rows[0] == (1, "S0")
+        counts = db._c.execute("SELECT SUM(num_animals), MAX(num_animals) FROM groups").fetchone()
+        assert counts == (1000, 100)
+
+    def test_add_many_rejects_whole_batch(self, temp_db):
+        """A duplicate anywhere in the batch leaves the database untouched."""
+        db = self._setup(temp_db, num_animals=10, num_groups=2, cage_max=5)
+        session = RFIDMappingSession(db)
+        session.add("OLD")
+        with pytest.raises(MappingError) as error:
+            session.add_many(["A", "B", "OLD", (1, "C"), "A"])
+        assert "3 entries" in str(error.value)
+        assert db.get_all_animals_rfid() == ["OLD"]
+        assert session.mapped == 1 and session.next_animal_id() == 2
+
+    def test_read_rfid_manifest(self, temp_db):
+        """Manifests with and without animal ids and headers are parsed."""
+        manifest = os.path.join(os.path.dirname(temp_db), "tags.csv")
+        with open(manifest, "w", encoding="utf-8") as f:
+            f.write("animal_id,rfid\n1, 900001\n\n3,900003\n")
+        assert read_rfid_manifest(manifest) == [(1, "900001"), (3, "900003")]
+        with open(manifest, "w", encoding="utf-8") as f:
+            f.write("rfid\n900001\n900002\n")
+        assert read_rfid_manifest(manifest) == ["900001", "900002"]
+        with open(manifest, "w", encoding="utf-8") as f:
+            f.write("1,900001\nx,900002\n")
+        with pytest.raises(MappingError):
+            read_rfid_manifest(manifest)
+        with open(manifest, "w", encoding="utf-8") as f:
+            f.write("animal_id,rfid\n1,900001\n5,\n")
+        with pytest.raises(MappingError, match="Line 3: missing tag"):
+            read_rfid_manifest(manifest)
+
 
 class TestFileExportAndReporting:
     """Test file export and reporting functionality."""
@@ -0,0 +1,131 @@
+"""Tests for the serial device protocol drivers."""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from shared.device_drivers import (
+    available_drivers,
+    get_driver,
+    guess_driver_name,
+)
+
+
+class FakeSerial:
+    """Minimal serial stand-in answering each write with the next scripted response."""
+
+    def __init__(self, responses=(), stream=b""):
+        self.responses = list(responses)
+        self.pending = bytearray(stream)
+        self.writes = []
+
+    @property
+    def in_waiting(self):
+        return len(self.pending)
+
+    def reset_input_buffer(self):
+        self.pending.clear()
+
+    def write(self, data):
+        self.writes.append(data)
+        if self.responses:
+            self.pending.extend(self.responses.pop(0))
+
+    def read(self, size=1):
+        chunk = bytes(self.pending[:size])
+        del self.pending[:size]
+        return chunk
+
+
+class TestRegistry:
+    """Driver lookup and selection."""
+
+    def test_all_drivers_registered(self):
+        for name in ("generic", "sics", "ohaus", "and", "caliper", "rfid"):
+            assert name in available_drivers()
+
+    def test_unknown_name_falls_back_to_generic(self):
+        assert get_driver("nope").name == "generic"
+        assert get_driver(None).name == "generic"
+
+    def test_guess_driver_name(self):
+        assert guess_driver_name("RFID reader") == "rfid"
+        assert guess_driver_name("Balancer", "Mettler Toledo USB") == "sics"
+        assert guess_driver_name("Caliper") == "caliper"
+        assert guess_driver_name("Balancer", "USB Serial") == "generic"
+
+
+class TestParsing:
+    """Frame parsing for each protocol."""
+
+    def test_generic_line(self):
+        reading = get_driver("generic").parse(b"Weight: 23.45 g\r\n")
+        assert reading.value == pytest.approx(23.45)
+        assert reading.unit == "g"
+        assert reading.stable is None
+
+    def test_sics_stable_and_dynamic(self):
+        driver = get_driver("sics")
+        stable = driver.parse(b"S S      100.25 g")
+        dynamic = driver.parse(b"S D      -12.50 g")
+        assert (stable.value, stable.unit, stable.stable) == (pytest.approx(100.25), "g", True)
+        assert (dynamic.value, dynamic.stable) == (pytest.approx(-12.5), False)
+        assert driver.parse(b"S I") is None
+        assert driver.parse(b"ES") is None
+
+    def test_ohaus_unstable_marker(self):
+        driver = get_driver("ohaus")
+        assert driver.parse(b"     25.10 g   ").stable is True
+        assert driver.parse(b"     25.10 g  ?").stable is False
+
+    def test_and_headers(self):
+        driver = get_driver("and")
+        reading = driver.parse(b"ST,+00012.34  g")
+        assert (reading.value, reading.unit, reading.stable) == (pytest.approx(12.34), "g", True)
+        assert driver.parse(b"US,+00012.30  g").stable is False
+        assert driver.parse(b"OL,+9999999 g") is None
+
+    def test_caliper_formats(self):
+        driver = get_driver("caliper")
+        assert driver.parse(b"+012.34").value == pytest.approx(12.34)
+        reading = driver.parse(b"01A+00012.34")
+        assert reading.value == pytest.approx(12.34)
+        assert reading.unit == "mm"
+
+    def test_rfid_stx_etx_checksum_stripped(self):
+        driver = get_driver("rfid")
+        frames = driver.make_decoder().feed(b"\x020102030405" + b"01" + b"\r\n\x03")
+        assert len(frames) == 1
+        assert driver.parse(frames[0]).value == "0102030405"
+
+    def test_rfid_plain_lines(self):
+        driver = get_driver("rfid")
+        frames = driver.make_decoder().feed(b"982000123456789\r")
+        assert driver.parse(frames[0]).value == "982000123456789"
+
+
+class TestRequestReading:
+    """Command/response polling and frame rate reporting."""
+
+    def test_sics_polls_until_stable(self):
+        ser = FakeSerial(responses=[b"S D 10.1 g\r\n", b"S S 10.2 g\r\n"])
+        reading = get_driver("sics").request_reading(ser, timeout=1.0)
+        assert reading.value == pytest.approx(10.2)
+        assert ser.writes == [b"SI\r\n", b"SI\r\n"]
+
+    def test_streaming_device_reads_first_frame(self):
+        ser = FakeSerial(stream=b"garbage\r\n 5.5 g\r\n")
+        reading = get_driver("generic").request_reading(ser, timeout=1.0)
+        assert reading.value == pytest.approx(5.5)
+        assert not ser.writes
+
+    def test_timeout_returns_none(self):
+        assert get_driver("and").request_reading(FakeSerial(), timeout=0.05) is None
+
+    def test_frame_rate(self):
+        driver = get_driver("generic")
+        assert driver.frame_rate() == 0.0
+        driver._frame_times.extend([0.0, 0.1, 0.2, 0.3])
+        assert driver.frame_rate() == pytest.approx(10.0)
@@ -0,0 +1,98 @@
+"""Tests for the serial link measurement used by the Test Screen."""
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+serial = pytest.importorskip("serial")
+
+from shared.link_test import format_link_report, measure_link, summarize_arrivals
+from shared.serial_engine import SerialIOEngine
+from shared.virtual_devices import VirtualDeviceFarm, VirtualSerialPair, pty_supported
+
+
+@pytest.fixture
+def engine():
+    """A private engine instance, shut down after the test."""
+    eng = SerialIOEngine()
+    eng.start()
+    yield eng
+    eng.shutdown()
+
+
+class TestSummarizeArrivals:
+    """Interval statistics and drop estimates from arrival times."""
+
+    def test_regular_stream_has_no_jitter_or_drops(self):
+        summary = summarize_arrivals([i * 0.1 for i in range(11)])
+        assert summary["interval_ms"] == pytest.approx(100.0)
+        assert summary["jitter_ms"] == pytest.approx(0.0, abs=1e-6)
+        assert summary["dropped_frames"] == 0
+
+    def test_gaps_count_missing_frames(self):
+        times = [0.0, 0.1, 0.2, 0.5, 0.6, 0.7]
+        summary = summarize_arrivals(times)
+        assert summary["dropped_frames"] == 2
+        assert summary["max_gap_ms"] == pytest.approx(300.0)
+        assert summarize_arrivals(times, periodic=False)["dropped_frames"] == 0
+        assert summarize_arrivals(times, expected_rate=10, elapsed=1.0)["dropped_frames"] == 4
+
+
+@pytest.mark.skipif(not pty_supported(), reason="requires POSIX pseudo-terminals")
+class TestMeasureLink:
+    """Measurements against pseudo-terminal stand-ins."""
+
+    def test_streaming_balance(self, engine):
+        options = {"rate_hz": 50, "noise": 0.0}
+        with VirtualDeviceFarm(readers=0, balances=1, seed=1, balance_options=options, register=False) as farm:
+            result = measure_link(farm.balances[0].port.path, driver="generic", seconds=1.0, engine=engine)
+        assert result["mode"] == "stream" and result["error"] is None
+        assert 25 <= result["frames_per_second"] <= 60
+        assert result["parse_failure_rate"] == 0.0
+        assert result["jitter_ms"] is not None and result["rtt_ms"] is None
+        assert "frames/s" in format_link_report(result)
+
+    def test_request_response_round_trips(self, engine):
+        options = {"protocol": "sics", "noise": 0.0}
+        with VirtualDeviceFarm(readers=0, balances=1, seed=1, balance_options=options, register=False) as farm:
+            result = measure_link(farm.balances[0].port.path, driver="sics", seconds=0.5, engine=engine)
+            commands = farm.balances[0].commands_received
+        assert result["mode"] == "request"
+        assert result["requests"] >= 5 and commands >= result["requests"]
+        assert result["dropped_frames"] == 0
+        assert result["rtt_ms"]["count"] == result["frames"]
+        assert "RTT" in format_link_report(result)
+
+    def test_parse_failures_are_counted(self, engine):
+        with VirtualSerialPair(register=False) as pair:
+            stop = threading.Event()
+
+            def device():
+                with serial.Serial(pair.b.path, 9600, timeout=0) as ser:
+                    while not stop.wait(0.05):
+                        ser.write(b"12.5 g\r\nnoise\r\n")
+
+            thread = threading.Thread(target=device, daemon=True)
+            thread.start()
+            time.sleep(0.1)
+            streamed = measure_link(pair.a.path, driver="generic", seconds=0.5, periodic=False, engine=engine)
+            polled = measure_link(pair.a.path, driver="sics", seconds=0.5, response_timeout=0.1, poll=True,
+                                  engine=engine)
+            stop.set()
+            thread.join(timeout=1.0)
+        assert streamed["frames"] > 0
+        assert streamed["parse_failure_rate"] == pytest.approx(0.5, abs=0.1)
+        assert polled["parse_failures"] == polled["frames"]
+
+    def test_stop_event_ends_run(self, engine):
+        with VirtualSerialPair(register=False) as pair:
+            stop = threading.Event()
+            stop.set()
+            start = time.monotonic()
+            result = measure_link(pair.a.path, driver="sics", seconds=5.0, stop_event=stop, engine=engine)
+        assert time.monotonic() - start < 1.0
+        assert result["requests"] == 0 and result["frames"] == 0
@@ -0,0 +1,81 @@
+"""Tests for the in-process metrics registry and its producers."""
+import json
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from shared.metrics import MetricsRegistry, Histogram, metric_key
+from shared.thread_supervisor import ThreadSupervisor
+from ui.diagnostics import format_snapshot
+
+
+class TestMetricsRegistry:
+    """Counters, gauges, histograms, collectors and export."""
+
+    def test_metrics_are_keyed_by_name_and_labels(self):
+        registry = MetricsRegistry()
+        registry.counter("serial.frames", port="COM3").inc()
+        registry.counter("serial.frames", port="COM3").inc(2)
+        registry.counter("serial.frames", port="COM4").inc()
+        registry.gauge("ports.open").set(2)
+        snapshot = registry.snapshot()
+        assert snapshot["counters"] == {"serial.frames{port=COM3}": 3, "serial.frames{port=COM4}": 1}
+        assert snapshot["gauges"] == {"ports.open": 2}
+        assert metric_key("x", {"b": 1, "a": 2}) == "x{a=2,b=1}"
+        with pytest.raises(TypeError):
+            registry.gauge("serial.frames", port="COM3")
+
+    def test_counter_is_thread_safe(self):
+        registry = MetricsRegistry()
+        counter = registry.counter("rfid.scans")
+
+        def work():
+            for _ in range(10000):
+                counter.inc()
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert counter.value == 40000
+
+    def test_histogram_percentiles(self):
+        histogram = Histogram()
+        for value in range(1, 101):
+            histogram.observe(float(value))
+        snapshot = histogram.snapshot()
+        assert snapshot["count"] == 100 and snapshot["mean"] == 50.5
+        assert snapshot["min"] == 1 and snapshot["max"] == 100
+        assert snapshot["p50"] == 51 and snapshot["p95"] == 96 and snapshot["p99"] == 100
+        with histogram.time():
+            pass
+        assert histogram.snapshot()["count"] == 101
+
+    def test_collectors_and_json_export(self, tmp_path):
+        registry = MetricsRegistry()
+        registry.register_collector("threads", ThreadSupervisor().metrics)
+        registry.register_collector("broken", lambda: 1 / 0)
+        registry.histogram("db.commit_ms").observe(1.5)
+        path = tmp_path / "diagnostics.json"
+        registry.export_json(str(path))
+        data = json.loads(path.read_text(encoding="utf-8"))
+        assert data["collectors"]["threads"]["live"] == 0
+        assert "error" in data["collectors"]["broken"]
+        assert data["histograms"]["db.commit_ms"]["count"] == 1
+        text = format_snapshot(data)
+        assert "db.commit_ms" in text and "Threads" in text
+
+    def test_database_commits_are_timed(self, tmp_path):
+        from databases.experiment_database import ExperimentDatabase
+        histogram = MetricsRegistry.instance().histogram("db.commit_ms")
+        before = histogram.count
+        db = ExperimentDatabase(str(tmp_path / "metrics.db"))
+        db.setup_experiment("M", "Mouse", False, 1, 1, 1, 0, "EXP-049", [], "Weight")
+        assert histogram.count > before
+        db.close()
+        ExperimentDatabase._instances.pop(str(tmp_path / "metrics.db"), None)
@@ -57,3 +57,56 @@ def test_real_port_enumeration_shape():
     for dev, desc in ports:
         assert isinstance(dev, str) and dev
         assert isinstance(desc, str)
+
+def test_port_inventory_is_shared_and_cached():
+    """Several lookups on several controllers reuse a single comports() enumeration."""
+    calls = []
+    fake = [MagicMock(device="COM3", description="RFID Reader", vid=0x0403, pid=0x6001)]
+
+    def comports():
+        calls.append(1)
+        return fake
+
+    spc.invalidate_port_cache()
+    first = SerialPortController(setting_type=None, comports_fn=comports)
+    second = SerialPortController(setting_type=None, comports_fn=comports)
+    assert first.get_available_ports() == [("COM3", "RFID Reader")]
+    assert second.get_available_ports_name() == ["COM3"]
+    assert first.get_num_ports() == 1
+    assert first.classify_ports()["rfid"] == [("COM3", "RFID Reader")]
+    detailed = second.get_available_ports_detailed()
+    assert detailed[0]["device"] == "COM3"
+    assert detailed[0]["vid"] == 0x0403
+    assert detailed[0]["hwid"] == ""
+    assert len(calls) == 1
+
+def test_port_inventory_invalidation_and_ttl(monkeypatch):
+    """Explicit invalidation and TTL expiry both trigger a fresh enumeration."""
+    devices = [MagicMock(device="COM1", description="USB Serial Port")]
+    calls = []
+
+    def comports():
+        calls.append(1)
+        return list(devices)
+
+    spc.invalidate_port_cache()
+    c = SerialPortController(setting_type=None, comports_fn=comports)
+    assert c.get_available_ports_name() == ["COM1"]
+
+    devices.append(MagicMock(device="COM2", description="Balance"))
+    assert c.get_available_ports_name() == ["COM1"]
+    c.invalidate_ports()
+    assert c.get_available_ports_name() == ["COM1", "COM2"]
+    assert len(calls) == 2
+
+    monkeypatch.setattr(spc, "PORT_CACHE_TTL", 0.0)
+    c.get_available_ports()
+    assert len(calls) == 3
+
+def test_resolve_port_name_uses_snapshot():
+    """A stale configured port falls back to a detected port from the same snapshot."""
+    fake = [MagicMock(device="/dev/ttyUSB0", description="FTDI USB Serial")]
+    spc.invalidate_port_cache()
+    c = SerialPortController(setting_type=None, comports_fn=lambda: fake)
+    assert c.resolve_port_name("/dev/ttyUSB0") == "/dev/ttyUSB0"
+    assert c.resolve_port_name("/dev/ttyUSB9") == "/dev/ttyUSB0"
@@ -0,0 +1,199 @@
+"""Tests for serial session capture and replay."""
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from shared.serial_capture import (
+    KIND_RX,
+    KIND_TX,
+    SessionRecorder,
+    SessionReplayer,
+    benchmark_session,
+    read_session,
+    start_capture,
+    stop_capture,
+)
+
+TAGS = ["982000123456789", "982000123456790", "982000123456791"]
+
+
+def write_morning_session(path):
+    """Synthetic session: an RFID reader (tags split across reads) and a streaming balance settling per animal."""
+    recorder = SessionRecorder(path)
+    for i, tag in enumerate(TAGS):
+        frame = tag.encode() + b"\r"
+        recorder.record("/dev/ttyUSB0", frame[:5], driver="rfid", framing="CR")
+        recorder.record("/dev/ttyUSB0", frame[5:], driver="rfid", framing="CR")
+        target = 20.0 + i
+        for value in (target * 0.5, target * 1.2, target * 0.9, target, target, target):
+            recorder.record("/dev/ttyUSB1", f"{value:.2f} g\r\n".encode(), driver="generic")
+        recorder.record("/dev/ttyUSB1", b"SI\r\n", kind=KIND_TX, driver="generic")
+        time.sleep(0.01)
+    recorder.close()
+    return recorder
+
+
+class TestSessionLog:
+    """Binary log round trip."""
+
+    def test_round_trip(self, tmp_path):
+        path = str(tmp_path / "session.msr")
+        recorder = write_morning_session(path)
+        channels, chunks = read_session(path)
+        assert sorted(meta["name"] for meta in channels.values()) == ["/dev/ttyUSB0", "/dev/ttyUSB1"]
+        assert len(chunks) == recorder.records
+        assert [c.t for c in chunks] == sorted(c.t for c in chunks)
+        assert sum(1 for c in chunks if c.kind == KIND_TX) == len(TAGS)
+
+    def test_truncated_tail_is_ignored(self, tmp_path):
+        path = str(tmp_path / "session.msr")
+        recorder = write_morning_session(path)
+        with open(path, "ab") as f:
+            f.write(b"\x01\x00\x00")
+        _channels, chunks = read_session(path)
+        assert len(chunks) == recorder.records
+
+    def test_rejects_other_files(self, tmp_path):
+        path = tmp_path / "other.msr"
+        path.write_bytes(b"not a session log")
+        with pytest.raises(ValueError):
+            read_session(str(path))
+
+
+class TestReplay:
+    """Replaying through the pipeline at max and scaled speed."""
+
+    def test_max_speed_replay_regression(self, tmp_path):
+        path = str(tmp_path / "session.msr")
+        write_morning_session(path)
+        result = benchmark_session(path)
+        assert result["scanned_tags"] == TAGS
+        assert result["settled_values"] == [pytest.approx(20.0), pytest.approx(21.0), pytest.approx(22.0)]
+        assert result["parse_failures"] == 0
+        assert result["frames"] == len(TAGS) * 7
+
+    def test_scaled_speed_follows_recorded_timing(self, tmp_path):
+        path = str(tmp_path / "session.msr")
+        write_morning_session(path)
+        replayer = SessionReplayer(path, speed=0.5)
+        received = []
+        start = time.monotonic()
+        replayer.play(received.append)
+        elapsed = time.monotonic() - start
+        assert elapsed >= replayer.duration / 0.5 * 0.9
+        assert all(chunk.kind == KIND_RX for chunk in received)
+
+    def test_stop_event_interrupts_playback(self, tmp_path):
+        path = str(tmp_path / "session.msr")
+        write_morning_session(path)
+        stop = threading.Event()
+        stop.set()
+        received = []
+        SessionReplayer(path, speed=1.0).play(received.append, stop_event=stop)
+        assert received == []
+
+
+class TestCaptureFlushing:
+    """Records reach the disk without waiting for stop_capture()."""
+
+    def test_flushes_every_n_records(self, tmp_path):
+        path = str(tmp_path / "batch.msr")
+        recorder = SessionRecorder(path, flush_every=4, flush_interval=60)
+        try:
+            for _ in range(4):
+                recorder.record("COM3", b"TAG\r", driver="rfid")
+            _channels, chunks = read_session(path)
+            assert len(chunks) == 4
+        finally:
+            recorder.close()
+
+    def test_flushes_quiet_tail_on_timer(self, tmp_path):
+        path = str(tmp_path / "tail.msr")
+        recorder = SessionRecorder(path, flush_every=1000, flush_interval=0.05)
+        try:
+            recorder.record("COM3", b"TAG\r", driver="rfid")
+            deadline = time.monotonic() + 2.0
+            while not read_session(path)[1] and time.monotonic() < deadline:
+                time.sleep(0.02)
+            assert [c.data for c in read_session(path)[1]] == [b"TAG\r"]
+        finally:
+            recorder.close()
+
+
+@pytest.mark.skipif(not hasattr(os, "openpty"), reason="requires POSIX pseudo-terminals")
+class TestEngineCapture:
+    """Capture hook in the serial engine."""
+
+    def test_engine_traffic_is_recorded(self, tmp_path):
+        pytest.importorskip("serial")
+        from shared.serial_engine import SerialIOEngine
+        from shared.serial_framing import FrameDecoder
+
+        path = str(tmp_path / "capture.msr")
+        master, slave = os.openpty()
+        engine = SerialIOEngine()
+        engine.start()
+        done = threading.Event()
+        try:
+            start_capture(path)
+            sub = engine.open(os.ttyname(slave), lambda frame: done.set(), decoder=FrameDecoder.from_spec("CR"),
+                              driver="rfid", framing="CR")
+            os.write(master, b"TAG1\r")
+            assert done.wait(2.0)
+            sub.write(b"PING\r")
+            sub.close()
+        finally:
+            stop_capture()
+            engine.shutdown()
+            os.close(master)
+            os.close(slave)
+        channels, chunks = read_session(path)
+        assert list(channels.values())[0]["driver"] == "rfid"
+        assert b"".join(c.data for c in chunks if c.kind == KIND_RX) == b"TAG1\r"
+        assert b"".join(c.data for c in chunks if c.kind == KIND_TX) == b"PING\r"
+        assert benchmark_session(path)["scanned_tags"] == ["TAG1"]
+
+    def test_request_reading_via_engine_is_recorded(self, tmp_path):
+        pytest.importorskip("serial")
+        from shared.device_drivers import get_driver
+        from shared.serial_engine import SerialIOEngine
+        from shared.virtual_devices import VirtualDeviceFarm
+
+        path = str(tmp_path / "manual.msr")
+        options = {"protocol": "sics", "settle_seconds": 0.0, "gap_seconds": 0.0, "noise": 0.0,
+                   "weight_range": (25.5, 25.5)}
+        engine = SerialIOEngine()
+        engine.start()
+        try:
+            with VirtualDeviceFarm(readers=0, balances=1, seed=1, balance_options=options, register=False) as farm:
+                start_capture(path)
+                try:
+                    reading = get_driver("sics").request_reading_via_engine(
+                        farm.balances[0].port.path, timeout=2.0, engine=engine, baudrate=9600)
+                finally:
+                    stop_capture()
+        finally:
+            engine.shutdown()
+        assert reading.value == 25.5 and reading.stable is True
+        _channels, chunks = read_session(path)
+        assert b"SI" in b"".join(c.data for c in chunks if c.kind == KIND_TX)
+        assert b"25.50" in b"".join(c.data for c in chunks if c.kind == KIND_RX)
+
+    def test_virtual_farm_capture_replays_same_scans(self, tmp_path):
+        pytest.importorskip("serial")
+        from shared.virtual_devices import run_throughput_benchmark
+
+        path = str(tmp_path / "farm.msr")
+        start_capture(path)
+        try:
+            live = run_throughput_benchmark(readers=2, balances=1, seconds=0.5, scans_per_minute=900, seed=4)
+        finally:
+            stop_capture()
+        replayed = benchmark_session(path)
+        assert replayed["scans"] == live["scans"]
+        assert replayed["frames"] == live["frames"]
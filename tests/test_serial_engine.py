@@ -0,0 +1,144 @@
+"""Tests for the shared asyncio serial I/O engine, using a local pseudo-terminal as the port."""
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+serial = pytest.importorskip("serial")
+
+from shared.serial_engine import SerialIOEngine
+from shared.serial_framing import FrameDecoder
+from shared.metrics import MetricsRegistry
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "openpty"), reason="requires POSIX pseudo-terminals")
+
+
+@pytest.fixture
+def engine():
+    """A private engine instance, shut down after the test."""
+    eng = SerialIOEngine()
+    eng.start()
+    yield eng
+    eng.shutdown()
+
+
+@pytest.fixture
+def pty_port():
+    """(master_fd, slave_path) pair acting as a device and its serial port."""
+    master, slave = os.openpty()
+    path = os.ttyname(slave)
+    yield master, path
+    for fd in (master, slave):
+        try:
+            os.close(fd)
+        except OSError:
+            pass
+
+
+def collect_frames(count):
+    """Returns (callback, frames, done_event) that signals after count frames."""
+    frames = []
+    done = threading.Event()
+
+    def on_frame(frame):
+        frames.append(frame)
+        if len(frames) >= count:
+            done.set()
+
+    return on_frame, frames, done
+
+
+class TestSerialIOEngine:
+    """Subscription, framing, writes and shutdown."""
+
+    def test_frames_delivered_from_one_thread(self, engine, pty_port):
+        master, path = pty_port
+        on_frame, frames, done = collect_frames(2)
+        sub = engine.open(path, on_frame, decoder=FrameDecoder.from_spec("CR"))
+        os.write(master, b"TAG1\rTA")
+        os.write(master, b"G2\r")
+        assert done.wait(2.0)
+        assert frames == [b"TAG1", b"TAG2"]
+        assert sub.frames_received == 2
+        sub.close()
+        assert not sub.ser.is_open
+        assert engine.subscriptions() == []
+
+    def test_multiple_ports_share_engine(self, engine):
+        ports = [os.openpty() for _ in range(3)]
+        try:
+            on_frame, frames, done = collect_frames(3)
+            subs = [engine.open(os.ttyname(slave), on_frame, decoder=FrameDecoder.from_spec("LF"))
+                    for _master, slave in ports]
+            for i, (master, _slave) in enumerate(ports):
+                os.write(master, f"{i}\n".encode())
+            assert done.wait(2.0)
+            assert sorted(frames) == [b"0", b"1", b"2"]
+            assert len(engine.subscriptions()) == 3
+            for sub in subs:
+                sub.close()
+        finally:
+            for master, slave in ports:
+                os.close(master)
+                os.close(slave)
+
+    def test_write_reaches_device(self, engine, pty_port):
+        master, path = pty_port
+        sub = engine.open(path, lambda frame: None)
+        sub.write(b"SI\r\n")
+        received = b""
+        for _ in range(20):
+            received += os.read(master, 16)
+            if received.endswith(b"\n"):
+                break
+        assert b"SI" in received
+        sub.close()
+
+    def test_port_traffic_is_counted_and_clean_reopen_is_not_a_reconnect(self, engine, pty_port):
+        master, path = pty_port
+        registry = MetricsRegistry.instance()
+        frames_metric = registry.counter("serial.frames", port=path)
+        bytes_metric = registry.counter("serial.bytes", port=path)
+        reconnects = registry.counter("serial.reconnects", port=path)
+        frames_before, bytes_before, reconnects_before = (
+            frames_metric.value, bytes_metric.value, reconnects.value)
+        on_frame, _frames, done = collect_frames(2)
+        sub = engine.open(path, on_frame, decoder=FrameDecoder.from_spec("CR"))
+        os.write(master, b"AB\rCD\r")
+        assert done.wait(2.0)
+        assert frames_metric.value - frames_before == 2
+        assert bytes_metric.value - bytes_before == 6
+        sub.close()
+        # A clean close and reopen (start/stop scanning, link tests) is not a reconnect.
+        engine.open(path, lambda frame: None).close()
+        assert reconnects.value == reconnects_before
+
+    def test_reopen_after_failure_counts_reconnect(self, engine):
+        master, slave = os.openpty()
+        path = os.ttyname(slave)
+        os.close(slave)
+        reconnects = MetricsRegistry.instance().counter("serial.reconnects", port=path)
+        before = reconnects.value
+        failed = threading.Event()
+        sub = engine.open(path, lambda frame: None, on_error=lambda error: failed.set())
+        # Closing the device side makes the port unreadable, as when a USB adapter is unplugged.
+        os.close(master)
+        assert failed.wait(2.0)
+        assert not sub.active
+        master, slave = os.openpty()
+        try:
+            engine.subscribe(serial.Serial(os.ttyname(slave), timeout=0), lambda frame: None, name=path).close()
+        finally:
+            os.close(master)
+            os.close(slave)
+        assert reconnects.value - before == 1
+
+    def test_shutdown_closes_ports(self, engine, pty_port):
+        _master, path = pty_port
+        sub = engine.open(path, lambda frame: None)
+        engine.shutdown()
+        assert not engine.is_running()
+        assert not sub.ser.is_open
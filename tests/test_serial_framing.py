@@ -0,0 +1,66 @@
+"""Tests for the incremental serial frame decoder."""
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from shared.serial_framing import ETX, STX, FrameDecoder
+from shared.device_drivers import get_driver
+
+
+class TestTerminatedFrames:
+    """CR / LF / CRLF framing."""
+
+    def test_cr_terminated_tag_is_emitted_immediately(self):
+        decoder = FrameDecoder.from_spec("CR")
+        assert decoder.feed(b"98200012") == []
+        assert decoder.feed(b"3456\r") == [b"982000123456"]
+
+    def test_either_terminator_skips_empty_frames(self):
+        decoder = FrameDecoder.from_spec("CR/LF")
+        assert decoder.feed(b"12.5 g\r\n13.0 g\r\n") == [b"12.5 g", b"13.0 g"]
+
+    def test_crlf_split_across_reads(self):
+        decoder = FrameDecoder.from_spec("CRLF")
+        assert decoder.feed(b"S S 10.0 g\r") == []
+        assert decoder.feed(b"\nS S 10.1") == [b"S S 10.0 g"]
+        assert decoder.feed(b" g\r\n") == [b"S S 10.1 g"]
+
+    def test_byte_at_a_time(self):
+        decoder = FrameDecoder.from_spec("LF")
+        frames = []
+        for byte in b"a\nbb\nccc\n":
+            frames.extend(decoder.feed(bytes([byte])))
+        assert frames == [b"a", b"bb", b"ccc"]
+        assert decoder.frames == 3
+
+
+class TestOtherFraming:
+    """Fixed-length and STX/ETX framing."""
+
+    def test_fixed_length(self):
+        decoder = FrameDecoder.from_spec("Fixed:4")
+        assert decoder.feed(b"abcdef") == [b"abcd"]
+        assert decoder.feed(b"gh") == [b"efgh"]
+
+    def test_stx_etx_drops_noise(self):
+        decoder = FrameDecoder.from_spec("STX/ETX")
+        assert decoder.feed(b"hello\r\n\x02TAG1") == []
+        assert decoder.feed(b"\x03junk\x02TAG2\x03") == [b"TAG1", b"TAG2"]
+
+    def test_driver_defaults_for_auto(self):
+        decoder = FrameDecoder.from_spec("Auto", get_driver("rfid"))
+        assert decoder.feed(b"\x02ABC\x03") == [b"ABC"]
+        assert decoder.feed(b"DEF\r") == [b"DEF"]
+
+    def test_mixed_mode_keeps_lines_before_stx(self):
+        decoder = FrameDecoder(stx=STX, etx=ETX)
+        assert decoder.feed(b"TAG1\r\n\x02TAG2\x03") == [b"TAG1", b"TAG2"]
+        assert decoder.feed(b"TAG3\rTAG4\n\x02TAG5") == [b"TAG3", b"TAG4"]
+        assert decoder.feed(b"\x03") == [b"TAG5"]
+
+    def test_overflow_resets_buffer(self):
+        decoder = FrameDecoder(terminators=(b"\n",), max_frame_size=8)
+        assert decoder.feed(b"0123456789") == []
+        assert decoder.overflows == 1
+        assert decoder.feed(b"ok\n") == [b"ok"]
@@ -0,0 +1,61 @@
+"""Tests for the streaming balance stability filter."""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from shared.stability_filter import StabilityFilter
+
+
+def feed(filt, values, step=0.1, stable=None):
+    """Feed values at a fixed interval and return the committed ones."""
+    committed = []
+    for i, value in enumerate(values):
+        result = filt.add(value, stable, now=i * step)
+        if result is not None:
+            committed.append(result)
+    return committed
+
+
+class TestStabilityFilter:
+    """Settling, coalescing and reset behavior."""
+
+    def test_commits_once_when_settled(self):
+        filt = StabilityFilter(samples=3, tolerance=0.05)
+        stream = [5.0, 12.4, 20.1, 22.8, 23.40, 23.42, 23.41, 23.41, 23.40, 23.42]
+        assert feed(filt, stream) == [pytest.approx(23.41)]
+        assert filt.received == 10
+        assert filt.committed == 1
+        assert filt.coalesced == 9
+
+    def test_window_expires_slow_samples(self):
+        filt = StabilityFilter(samples=3, tolerance=0.05, window=0.5)
+        assert feed(filt, [10.0, 10.0, 10.0], step=1.0) == []
+
+    def test_device_flags(self):
+        filt = StabilityFilter(samples=3)
+        assert filt.add(18.0, stable=False, now=0.0) is None
+        assert filt.add(18.2, stable=True, now=0.1) == pytest.approx(18.2)
+
+    def test_new_plateau_commits_again(self):
+        filt = StabilityFilter(samples=2, tolerance=0.05)
+        assert feed(filt, [20.0, 20.0, 20.0, 25.0, 25.0]) == [20.0, 25.0]
+
+    def test_reset_allows_same_value_for_next_animal(self):
+        filt = StabilityFilter(samples=2)
+        assert feed(filt, [21.0, 21.0]) == [21.0]
+        filt.reset()
+        assert feed(filt, [21.0, 21.0]) == [21.0]
+
+    def test_take_coalesced(self):
+        filt = StabilityFilter(samples=3)
+        feed(filt, [1.0, 30.0, 30.0, 30.0])
+        assert filt.take_coalesced() == 3
+        assert filt.take_coalesced() == 0
+
+    def test_non_numeric_values_are_dropped(self):
+        filt = StabilityFilter(samples=1)
+        assert filt.add("abc", now=0.0) is None
+        assert filt.coalesced == 1
@@ -0,0 +1,127 @@
+"""Tests for the background-thread supervisor."""
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from shared.thread_supervisor import ThreadSupervisor
+
+
+def idle(worker):
+    while worker.wait(timeout=5.0):
+        pass
+
+
+class TestSupervisedThread:
+    """Waking, stopping and closers."""
+
+    def test_wake_runs_loop_without_polling(self):
+        supervisor = ThreadSupervisor()
+        seen = []
+        ready = threading.Event()
+
+        def loop(worker):
+            ready.set()
+            while worker.wait(timeout=5.0):
+                seen.append(time.monotonic())
+
+        worker = supervisor.spawn("waker", loop)
+        assert ready.wait(1.0)
+        start = time.monotonic()
+        worker.wake()
+        while not seen:
+            assert time.monotonic() - start < 1.0
+            time.sleep(0.001)
+        assert seen[0] - start < 0.05
+        worker.stop()
+        assert worker.join(1.0)
+        assert supervisor.metrics()["live"] == 0
+
+    def test_closer_interrupts_blocking_read(self):
+        supervisor = ThreadSupervisor()
+        read_fd, write_fd = os.pipe()
+        result = []
+
+        def reader(worker):
+            result.append(os.read(read_fd, 10))
+
+        worker = supervisor.spawn("pipe-reader", reader, closers=[lambda: os.close(write_fd)])
+        time.sleep(0.02)
+        assert worker.is_alive()
+        start = time.monotonic()
+        worker.stop()
+        assert worker.join(1.0)
+        assert time.monotonic() - start < 0.1
+        assert result == [b""]
+        os.close(read_fd)
+
+    def test_closer_added_after_stop_runs_immediately(self):
+        supervisor = ThreadSupervisor()
+        worker = supervisor.spawn("late", idle)
+        worker.stop()
+        closed = []
+        worker.add_closer(lambda: closed.append(True))
+        assert closed == [True]
+        assert worker.join(1.0)
+
+
+class TestThreadSupervisor:
+    """Owners, parallel shutdown and metrics."""
+
+    def test_stop_owner_leaves_other_workers_running(self):
+        supervisor = ThreadSupervisor()
+        page_a, page_b = object(), object()
+        a = [supervisor.spawn(f"a{i}", idle, owner=page_a) for i in range(3)]
+        b = supervisor.spawn("b", idle, owner=page_b)
+        start = time.monotonic()
+        assert supervisor.stop_owner(page_a, timeout=1.0) == []
+        assert time.monotonic() - start < 0.1
+        assert all(not w.is_alive() for w in a)
+        assert b.is_alive()
+        supervisor.shutdown()
+
+    def test_shutdown_is_parallel_and_bounded(self):
+        supervisor = ThreadSupervisor()
+
+        def slow_exit(worker):
+            idle(worker)
+            time.sleep(0.03)
+
+        for i in range(20):
+            supervisor.spawn(f"worker-{i}", slow_exit)
+        start = time.monotonic()
+        remaining = supervisor.shutdown(timeout=0.5)
+        elapsed = time.monotonic() - start
+        assert remaining == []
+        # Twenty 30 ms exits overlap instead of adding up.
+        assert elapsed < 0.1
+        metrics = supervisor.metrics()
+        assert metrics["live"] == 0
+        assert metrics["spawned"] == metrics["finished"] == 20
+
+    def test_shutdown_gives_up_on_stuck_worker(self):
+        supervisor = ThreadSupervisor()
+        release = threading.Event()
+        supervisor.spawn("stuck", lambda worker: release.wait(5.0))
+        start = time.monotonic()
+        assert supervisor.shutdown(timeout=0.05) == ["stuck"]
+        assert time.monotonic() - start < 0.1
+        assert supervisor.abandoned == 1
+        release.set()
+
+    def test_metrics_describe_live_workers(self):
+        supervisor = ThreadSupervisor()
+        owner = object()
+        worker = supervisor.spawn("metrics", idle, owner=owner)
+        worker.wake()
+        time.sleep(0.01)
+        snapshot = supervisor.metrics()
+        assert snapshot["live"] == 1
+        info = snapshot["workers"][0]
+        assert info["name"] == "metrics" and info["owner"] == "object" and info["alive"]
+        assert info["wakeups"] == 1
+        worker.stop()
+        assert worker.join(1.0)
+        assert worker.metrics()["stop_latency_ms"] < 100
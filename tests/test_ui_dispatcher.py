@@ -0,0 +1,116 @@
+"""Tests for the main-thread UI dispatch queue."""
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from shared.ui_dispatcher import UIDispatcher
+
+
+class FakeRoot:
+    """Records after() scheduling instead of running a Tk event loop."""
+
+    def __init__(self):
+        self.scheduled = []
+        self.cancelled = []
+
+    def after(self, ms, callback):
+        self.scheduled.append((ms, callback))
+        return f"after#{len(self.scheduled)}"
+
+    def after_cancel(self, job):
+        self.cancelled.append(job)
+
+    def winfo_toplevel(self):
+        return self
+
+
+class TestUIDispatcher:
+    """Batching, coalescing and thread safety."""
+
+    def test_unkeyed_events_run_in_order_in_bounded_batches(self):
+        dispatcher = UIDispatcher(FakeRoot(), max_batch=10)
+        ran = []
+        for i in range(25):
+            dispatcher.post(ran.append, i)
+        assert dispatcher.pump() == 10
+        assert dispatcher.pump() == 10
+        assert dispatcher.pump() == 5
+        assert ran == list(range(25))
+        assert dispatcher.pending() == 0
+
+    def test_keyed_events_keep_only_latest(self):
+        dispatcher = UIDispatcher(FakeRoot())
+        shown = []
+        for i in range(100):
+            dispatcher.post(shown.append, f"status {i}", key="status")
+        dispatcher.post(shown.append, "table", key="table")
+        assert dispatcher.pending() == 2
+        assert dispatcher.pump() == 2
+        assert shown == ["status 99", "table"]
+        assert dispatcher.coalesced == 99
+
+    def test_bursts_from_threads_stay_bounded(self):
+        dispatcher = UIDispatcher(FakeRoot())
+        renders = []
+
+        def producer(n):
+            for i in range(2000):
+                dispatcher.post(renders.append, (n, i), key="activity")
+
+        threads = [threading.Thread(target=producer, args=(n,)) for n in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert dispatcher.pending() == 1
+        assert dispatcher.pump() == 1
+        assert renders[0][1] == 1999
+
+    def test_failing_callback_does_not_stop_batch(self):
+        dispatcher = UIDispatcher(FakeRoot())
+        ran = []
+        dispatcher.post(lambda: 1 / 0)
+        dispatcher.post(ran.append, "after error")
+        assert dispatcher.pump() == 2
+        assert ran == ["after error"]
+
+    def test_single_periodic_pump_per_window(self):
+        root = FakeRoot()
+        dispatcher = UIDispatcher.for_widget(root)
+        assert UIDispatcher.for_widget(root) is dispatcher
+        assert len(root.scheduled) == 1
+        ran = []
+        dispatcher.post(ran.append, 1)
+        _ms, tick = root.scheduled[-1]
+        tick()
+        assert ran == [1]
+        assert len(root.scheduled) == 2
+        dispatcher.stop()
+        assert root.cancelled == ["after#2"]
+
+    def test_events_for_destroyed_owner_are_skipped(self):
+        class Page:
+            def __init__(self):
+                self.alive = True
+                self._is_closing = False
+                self.shown = []
+
+            def winfo_exists(self):
+                return self.alive
+
+            def show(self, text):
+                self.shown.append(text)
+
+        dispatcher = UIDispatcher(FakeRoot())
+        destroyed, closing, live = Page(), Page(), Page()
+        destroyed.alive = False
+        closing._is_closing = True
+        dispatcher.post(destroyed.show, "gone")
+        dispatcher.post(closing.show, "closing")
+        dispatcher.post(lambda: live.show("closure"), owner=destroyed, key="status")
+        dispatcher.post(live.show, "ok")
+        assert dispatcher.pump() == 4
+        assert live.shown == ["ok"] and destroyed.shown == [] and closing.shown == []
+        assert dispatcher.skipped == 3 and dispatcher.executed == 1
@@ -323,6 +323,242 @@ class TestUIScaling:
             f"With {num_animals} animals: {elapsed_ms:.2f}ms (max: {expected_max_ms}ms)"
 
 
+class TestFlashOverlayManager:
+    """Overlay reuse and cross-thread coalescing."""
+
+    @pytest.fixture(scope="class")
+    def tk_root(self):
+        """Hidden Tk root; skipped when no display is available."""
+        import tkinter
+        from customtkinter import CTk
+
+        try:
+            root = CTk()
+        except tkinter.TclError as e:
+            pytest.skip(f"No display available: {e}")
+        root.withdraw()
+        yield root
+        try:
+            root.destroy()
+        except Exception:
+            pass
+
+    @staticmethod
+    def pump(root, seconds):
+        deadline = time.monotonic() + seconds
+        while time.monotonic() < deadline:
+            root.update()
+            time.sleep(0.005)
+
+    def test_messages_reuse_one_overlay(self, tk_root):
+        from customtkinter import CTkFrame
+        from shared.flash_overlay import FlashOverlay, FlashOverlayManager
+
+        page = CTkFrame(tk_root)
+        manager = FlashOverlayManager.for_page(page)
+        for i in range(20):
+            FlashOverlay(parent=page, message=f"Scan {i}", duration=200)
+        assert FlashOverlayManager.for_page(page) is manager
+        assert len(page.winfo_children()) == 1
+        assert manager.label.cget("text") == "Scan 19"
+        assert page._nav_lift_suspended
+        self.pump(tk_root, 0.4)
+        assert not manager.is_visible()
+        assert page._active_flash_overlays == 0
+        page.destroy()
+
+    def test_background_thread_messages_are_coalesced(self, tk_root):
+        import threading
+        from customtkinter import CTkFrame
+        from shared.flash_overlay import FlashOverlayManager
+
+        page = CTkFrame(tk_root)
+        manager = FlashOverlayManager.for_page(page)
+        worker = threading.Thread(
+            target=lambda: [manager.show(f"Animal {i}", duration=100) for i in range(50)]
+        )
+        worker.start()
+        worker.join()
+        self.pump(tk_root, 0.1)
+        assert manager.shown < 50
+        assert manager.shown + manager.coalesced == 50
+        assert manager.label.cget("text") == "Animal 49"
+        manager.hide()
+        page.destroy()
+
+    def test_queued_message_follows_current(self, tk_root):
+        from customtkinter import CTkFrame
+        from shared.flash_overlay import FlashOverlayManager
+
+        page = CTkFrame(tk_root)
+        manager = FlashOverlayManager.for_page(page)
+        manager.show("Data Collected", duration=100)
+        manager.show("All Animals Measured for Today!", duration=100, queue=True)
+        assert manager.label.cget("text") == "Data Collected"
+        self.pump(tk_root, 0.15)
+        assert manager.label.cget("text") == "All Animals Measured for Today!"
+        assert manager.is_visible()
+        self.pump(tk_root, 0.15)
+        assert not manager.is_visible()
+        page.destroy()
+
+
+class TestIncrementalCageBoard:
+    """Cage board updates re-pack existing tiles instead of rebuilding the board."""
+
+    @pytest.fixture(scope="class")
+    def tk_root(self):
+        """Hidden Tk root; skipped when no display is available."""
+        import tkinter
+        from customtkinter import CTk
+
+        try:
+            root = CTk()
+        except tkinter.TclError as e:
+            pytest.skip(f"No display available: {e}")
+        root.withdraw()
+        yield root
+        try:
+            root.destroy()
+        except Exception:
+            pass
+
+    @pytest.fixture
+    def large_db(self, tmp_path):
+        from databases.experiment_database import ExperimentDatabase
+
+        db_file = tmp_path / "cage_board.db"
+        db = ExperimentDatabase(str(db_file))
+        db.setup_experiment(
+            "Cage Board", "Mouse", False, 200, 40, 6, 0,
+            "cage-board", ["Researcher"], "Weight"
+        )
+        db.setup_groups([f"G{i}" for i in range(1, 41)], cage_capacity=5)
+        for i in range(1, 201):
+            db.add_animal(i, str(3000 + i), ((i - 1) // 5) + 1)
+        yield str(db_file)
+        if str(db_file) in ExperimentDatabase._instances:
+            ExperimentDatabase._instances[str(db_file)].close()
+
+    def test_move_repacks_only_affected_tiles(self, tk_root, large_db):
+        from experiment_pages.experiment.cage_config_ui import CageConfigurationUI
+
+        page = CageConfigurationUI(database=large_db, parent=tk_root, prev_page=None, file_path=large_db)
+        page.save = lambda: None
+        page.update_idletasks()
+        assert page.board_stats["created"] == 200
+        tile = page.animal_buttons["1"]
+        packed_before = page.board_stats["packed"]
+
+        page.toggle_animal_selection("1")
+        page.select_cage("G40")
+        start = time.perf_counter()
+        page.move_animal()
+        page.update_idletasks()
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        assert page.animal_buttons["1"] is tile
+        assert tile.pack_info()["in"] is page._cage_frames["G40"][0]
+        assert page.board_stats["created"] == 200
+        # Only G1 (4 tiles) and G40 (6 tiles) were re-packed.
+        assert page.board_stats["packed"] - packed_before == 10
+        assert not page.selected_animals and page.selected_cage is None
+        assert elapsed_ms < 100, f"move took {elapsed_ms:.1f}ms"
+        page.destroy()
+
+
+class TestPageRegistrySoak:
+    """Cached experiment pages: flat widget count and memory over many navigations."""
+
+    NAVIGATIONS = 500
+
+    @pytest.fixture(scope="class")
+    def tk_root(self):
+        """Hidden Tk root; skipped when no display is available."""
+        import tkinter
+        from customtkinter import CTk
+
+        try:
+            root = CTk()
+        except tkinter.TclError as e:
+            pytest.skip(f"No display available: {e}")
+        root.withdraw()
+        yield root
+        try:
+            root.destroy()
+        except Exception:
+            pass
+
+    @pytest.fixture
+    def test_db(self, tmp_path):
+        from databases.experiment_database import ExperimentDatabase
+
+        db_file = tmp_path / "soak_test.db"
+        db = ExperimentDatabase(str(db_file))
+        db.setup_experiment(
+            "Soak Test", "Mouse", False, 8, 2, 4, 0,
+            "soak-test", ["Researcher"], "Weight"
+        )
+        db.setup_groups(["Control", "Group1"], cage_capacity=4)
+        for i in range(1, 9):
+            db.add_animal(i, str(2000 + i), ((i - 1) % 2) + 1)
+        yield str(db_file)
+        if str(db_file) in ExperimentDatabase._instances:
+            ExperimentDatabase._instances[str(db_file)].close()
+
+    @staticmethod
+    def count_widgets(widget):
+        return 1 + sum(TestPageRegistrySoak.count_widgets(child) for child in widget.winfo_children())
+
+    def test_navigation_is_flat(self, tk_root, test_db):
+        import tracemalloc
+        from experiment_pages.experiment.experiment_menu_ui import ExperimentMenuUI
+        from shared.serial_engine import SerialIOEngine
+        from shared.thread_supervisor import ThreadSupervisor
+
+        menu = ExperimentMenuUI(parent=tk_root, name=test_db, prev_page=None, full_path=test_db)
+        openers = [menu.open_cage_config, menu.open_data_analysis, menu.open_data_collection, menu.open_map_rfid]
+
+        def navigate(i):
+            openers[i % len(openers)]()
+            tk_root.update()
+            menu.raise_frame()
+            tk_root.update()
+
+        for i in range(20):
+            navigate(i)
+        pages = dict(menu._pages)
+        assert set(pages) == {"cage_config", "data_analysis", "data_collection", "map_rfid"}
+        widgets = self.count_widgets(tk_root)
+
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        for i in range(self.NAVIGATIONS):
+            navigate(i)
+        after = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+        growth = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+
+        assert menu._pages == pages, "pages should be built once and reused"
+        assert self.count_widgets(tk_root) == widgets
+        assert growth < 2 * 1024 * 1024, f"memory grew {growth / 1024:.0f} KiB over {self.NAVIGATIONS} navigations"
+
+        cached = list(pages.values())
+        menu.close_pages()
+        tk_root.update()
+        assert not menu._pages
+        for page in cached:
+            assert page._torn_down and page._size_job is None
+            assert not page.winfo_exists()
+        supervisor = ThreadSupervisor.instance()
+        deadline = time.monotonic() + 2.0
+        while supervisor.workers() and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert not [w.name for w in supervisor.workers()], "page workers should stop on close_pages()"
+        assert SerialIOEngine.instance().subscriptions() == []
+        menu.close_experiment()
+
+
 class TestUIResponsivenessSummary:
     """Summary of UI performance requirements and test results."""
 
@@ -0,0 +1,116 @@
+"""Tests for the pseudo-terminal virtual device farm."""
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+serial = pytest.importorskip("serial")
+
+from shared.device_drivers import get_driver
+from shared.serial_port_controller import SerialPortController
+from shared.virtual_devices import (
+    VirtualBalance,
+    VirtualDeviceFarm,
+    VirtualRFIDReader,
+    VirtualSerialPair,
+    pty_supported,
+    run_throughput_benchmark,
+)
+
+pytestmark = pytest.mark.skipif(not pty_supported(), reason="requires POSIX pseudo-terminals")
+
+
+def read_frames(ser, driver, count, timeout=3.0):
+    """Reads until count frames were decoded by the driver's decoder."""
+    decoder = driver.make_decoder()
+    frames = []
+    deadline = time.monotonic() + timeout
+    while len(frames) < count and time.monotonic() < deadline:
+        frames.extend(decoder.feed(ser.read(ser.in_waiting or 1)))
+    return frames
+
+
+class TestVirtualDeviceFarm:
+    """Discovery and frame output of emulated devices."""
+
+    def test_ports_discoverable_and_classified(self):
+        controller = SerialPortController(comports_fn=lambda: [])
+        with VirtualDeviceFarm(readers=2, balances=1, seed=3) as farm:
+            devices = [path for path, _desc in farm.ports()]
+            assert set(devices) <= set(controller.get_available_ports_name())
+            categories = controller.classify_ports()
+            assert len(categories["rfid"]) == 2
+            assert len(categories["balance"]) == 1
+        assert controller.get_available_ports() == []
+
+    def test_rfid_frames_parse(self):
+        options = {"scans_per_minute": 600, "framing": "EM4100", "tags": ["0102030405"]}
+        with VirtualDeviceFarm(readers=1, balances=0, seed=1, reader_options=options, register=False) as farm:
+            with serial.Serial(farm.readers[0].port.path, 9600, timeout=0.1) as ser:
+                driver = get_driver("rfid")
+                frames = read_frames(ser, driver, 2)
+        assert len(frames) >= 2
+        assert driver.parse(frames[0]).value == "0102030405"
+
+    def test_streaming_balance_settles_on_target(self):
+        options = {"rate_hz": 50, "settle_seconds": 0.2, "gap_seconds": 0.0, "dwell_seconds": 10,
+                   "noise": 0.0, "weight_range": (20.0, 20.0)}
+        with VirtualDeviceFarm(readers=0, balances=1, seed=1, balance_options=options, register=False) as farm:
+            time.sleep(0.3)
+            with serial.Serial(farm.balances[0].port.path, 9600, timeout=0.1) as ser:
+                ser.reset_input_buffer()
+                driver = get_driver("generic")
+                frames = read_frames(ser, driver, 3)
+        assert frames
+        assert driver.parse(frames[-1]).value == pytest.approx(20.0)
+
+    def test_sics_request_response(self):
+        options = {"protocol": "sics", "settle_seconds": 0.0, "gap_seconds": 0.0, "noise": 0.0,
+                   "weight_range": (25.5, 25.5)}
+        with VirtualDeviceFarm(readers=0, balances=1, seed=1, balance_options=options, register=False) as farm:
+            with serial.Serial(farm.balances[0].port.path, 9600, timeout=0.1) as ser:
+                reading = get_driver("sics").request_reading(ser, timeout=2.0)
+            assert farm.balances[0].commands_received >= 1
+        assert reading.value == pytest.approx(25.5)
+        assert reading.stable is True
+
+
+class TestVirtualInstruments:
+    """Formatting without a running farm."""
+
+    def test_balance_protocol_formats_parse(self):
+        for protocol in ("generic", "sics", "and", "ohaus"):
+            balance = VirtualBalance(protocol=protocol)
+            try:
+                reading = get_driver(protocol).decode(balance.format(12.5, protocol == "generic"))
+            finally:
+                balance.port.close()
+            assert reading.value == pytest.approx(12.5)
+
+    def test_unknown_framing_rejected(self):
+        with pytest.raises(ValueError):
+            VirtualRFIDReader(framing="nope")
+
+
+class TestVirtualSerialPair:
+    """Linked PTY pair used by the serial simulator."""
+
+    def test_bytes_cross_between_ports(self):
+        with VirtualSerialPair(register=False) as pair:
+            port_a, port_b = pair.ports()
+            with serial.Serial(port_a, 9600, timeout=0.5) as a, serial.Serial(port_b, 9600, timeout=0.5) as b:
+                a.write(b"hello\r")
+                assert b.read(6) == b"hello\r"
+
+
+class TestThroughputBenchmark:
+    """Headless end-to-end run through the serial engine."""
+
+    def test_short_benchmark_counts_scans(self):
+        result = run_throughput_benchmark(readers=3, balances=1, seconds=1.0, scans_per_minute=600, seed=2)
+        assert result["scans"] >= 10
+        assert result["parse_failures"] == 0
+        assert result["scans_per_minute"] > 0
@@ -0,0 +1,133 @@
+"""
+Diagnostics window: live view of the in-process metrics (shared.metrics).
+
+Shows scan counters, serial traffic per port, latency histograms and the
+collector snapshots (threads, UI dispatcher, audio), refreshed once a
+second, and exports the snapshot as JSON for comparing stations.
+"""
+
+import json
+import time
+from tkinter.filedialog import asksaveasfilename
+
+from customtkinter import CTkButton, CTkFrame, CTkLabel, CTkTextbox, CTkToplevel
+from CTkMessagebox import CTkMessagebox
+
+from shared.metrics import MetricsRegistry
+
+# Refresh period of the open window in milliseconds.
+REFRESH_MS = 1000
+
+
+def format_snapshot(snapshot):
+    """Render a metrics snapshot as aligned plain-text sections."""
+    lines = [
+        f"Station: {snapshot.get('station')}    {snapshot.get('timestamp')}    "
+        f"uptime {snapshot.get('uptime_s')} s",
+        "",
+    ]
+    for title, section in (("Counters", "counters"), ("Gauges", "gauges")):
+        values = snapshot.get(section) or {}
+        if values:
+            lines.append(title)
+            width = max(len(key) for key in values)
+            lines.extend(f"  {key.ljust(width)}  {value}" for key, value in values.items())
+            lines.append("")
+    histograms = snapshot.get("histograms") or {}
+    if histograms:
+        lines.append("Latency (ms)")
+        width = max(len(key) for key in histograms)
+        lines.append(f"  {'name'.ljust(width)}  {'count':>7} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9}")
+        for key, value in histograms.items():
+            cells = [value.get(name) for name in ("p50", "p95", "p99", "max")]
+            cells = ["-" if cell is None else f"{cell:.2f}" for cell in cells]
+            lines.append(f"  {key.ljust(width)}  {value.get('count', 0):>7} "
+                         + " ".join(f"{cell:>9}" for cell in cells))
+        lines.append("")
+    for name, value in (snapshot.get("collectors") or {}).items():
+        lines.append(name.replace("_", " ").title())
+        lines.append("  " + json.dumps(value, indent=2, default=str).replace("\n", "\n  "))
+        lines.append("")
+    return "\n".join(lines)
+
+
+class DiagnosticsWindow:
+    """Single top-level window showing the metrics registry."""
+
+    _open = None
+
+    def __init__(self, root, registry=None):
+        self.registry = registry or MetricsRegistry.instance()
+        self.window = CTkToplevel(root)
+        self.window.title("Diagnostics")
+        self.window.geometry("760x620")
+        self._job = None
+
+        toolbar = CTkFrame(self.window, fg_color="transparent")
+        toolbar.pack(fill="x", padx=12, pady=(12, 6))
+        CTkLabel(toolbar, text="Operational metrics", font=("Segoe UI Semibold", 16)).pack(side="left")
+        CTkButton(toolbar, text="Export JSON", width=120, command=self.export).pack(side="right")
+        CTkButton(toolbar, text="Refresh", width=90, command=self.refresh).pack(side="right", padx=8)
+
+        self.text = CTkTextbox(self.window, font=("Consolas", 12), wrap="none")
+        self.text.pack(fill="both", expand=True, padx=12, pady=(0, 12))
+
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+        self.refresh()
+
+    @classmethod
+    def open(cls, root):
+        """Show the diagnostics window, reusing it if it is already open."""
+        existing = cls._open
+        if existing is not None and existing.window.winfo_exists():
+            existing.window.lift()
+            existing.window.focus_force()
+            return existing
+        cls._open = cls(root)
+        return cls._open
+
+    def refresh(self):
+        """Redraw the snapshot and schedule the next refresh."""
+        if self._job is not None:
+            self.window.after_cancel(self._job)
+            self._job = None
+        if not self.window.winfo_exists():
+            return
+        position = self.text.yview()[0]
+        self.text.configure(state="normal")
+        self.text.delete("1.0", "end")
+        self.text.insert("1.0", format_snapshot(self.registry.snapshot()))
+        self.text.configure(state="disabled")
+        self.text.yview_moveto(position)
+        self._job = self.window.after(REFRESH_MS, self.refresh)
+
+    def export(self):
+        """Write the current snapshot to a JSON file chosen by the user."""
+        path = asksaveasfilename(
+            parent=self.window,
+            defaultextension=".json",
+            initialfile=f"mouser_diagnostics_{time.strftime('%Y%m%d_%H%M%S')}.json",
+            filetypes=[("JSON files", "*.json")],
+        )
+        if not path:
+            return
+        try:
+            self.registry.export_json(path)
+        except OSError as e:
+            CTkMessagebox(title="Export Failed", message=str(e), icon="warning")
+
+    def close(self):
+        """Stop refreshing and close the window."""
+        if self._job is not None:
+            try:
+                self.window.after_cancel(self._job)
+            except Exception:  # pylint: disable=broad-exception-caught
+                pass
+            self._job = None
+        DiagnosticsWindow._open = None
+        self.window.destroy()
+
+
+def open_diagnostics(root):
+    """Menu callback: open the diagnostics window."""
+    return DiagnosticsWindow.open(root)
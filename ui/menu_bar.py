@@ -3,12 +3,13 @@ Builds the application menu bar using CTkMenuBar.
 
 Required structure (applied across all UI pages):
 - File: New Experiment, Open Experiment
-- Info: User Manual (opens local HTML manual)
+- Info: User Manual (opens local HTML manual), Diagnostics (live metrics, JSON export)
 """
 
 from CTkMenuBar import CTkMenuBar, CustomDropdownMenu
 
 from ui.commands import create_file, open_file, open_documentation_popup
+from ui.diagnostics import open_diagnostics
 
 
 def _get_widget_bg(widget):
@@ -139,6 +140,7 @@ def build_menu(root, experiments_frame):
         hover_color=("#e2e8f0", "#1f2937"),
     )
     info_dropdown.add_option("User Manual", lambda: open_documentation_popup(root))
+    info_dropdown.add_option("Diagnostics", lambda: open_diagnostics(root))
 
     root._mouser_menu_bar = menu_bar
     sync_menu_background(root, experiments_frame)